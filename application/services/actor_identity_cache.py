@@ -0,0 +1,68 @@
+import logging
+import threading
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+from domain.models.actor import Actor
+from shared.config import config
+
+logger = logging.getLogger(__name__)
+
+
+class ActorIdentityCache:
+    """
+    Caché acotada (LRU) y thread-safe de nombre de actor → ID.
+
+    Los casos de uso la consultan antes de llamar al repositorio: un mismo actor
+    aparece en muchas películas del Top 250 y solo la primera vez debería tocar
+    el disco o la base de datos. Los IDs dependen del backend, así que cada
+    persistencia (CSV, PostgreSQL) usa su propia instancia.
+    """
+
+    def __init__(self, name: str, max_size: int = config.ACTOR_CACHE_MAX_SIZE):
+        self.name = name
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._ids: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, actor_name: str) -> Optional[int]:
+        """Devuelve el ID del actor si está en caché y lo marca como usado recientemente."""
+        with self._lock:
+            actor_id = self._ids.get(actor_name)
+            if actor_id is None:
+                self.misses += 1
+                return None
+            self._ids.move_to_end(actor_name)
+            self.hits += 1
+            return actor_id
+
+    def put(self, actor_name: str, actor_id: int) -> None:
+        """Registra (o refresca) un actor; si se supera el tamaño, expulsa el menos usado."""
+        with self._lock:
+            self._ids[actor_name] = actor_id
+            self._ids.move_to_end(actor_name)
+            if len(self._ids) > self.max_size:
+                self._ids.popitem(last=False)
+
+    def preload(self, actors: Iterable[Actor]) -> None:
+        """Carga inicial de actores ya persistidos (hasta `max_size`)."""
+        loaded = 0
+        for actor in actors:
+            if loaded >= self.max_size:
+                break
+            if actor.id:
+                self.put(actor.name, actor.id)
+                loaded += 1
+        logger.info(f"[ActorCache:{self.name}] Precargados {loaded} actores.")
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._ids),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0
+            }
@@ -1,6 +1,7 @@
 
+import threading
 from concurrent.futures import ThreadPoolExecutor
-from typing import List
+from typing import List, Optional, Set
 from domain.models.movie import Movie
 from domain.interfaces.use_case_interface import UseCaseInterface
 
@@ -19,17 +20,62 @@ class CompositeSaveMovieWithActorsUseCase(UseCaseInterface):
                                                 la UseCaseInterface.
         """
         self.use_cases = use_cases
-        # Limita el número de hilos para no saturar recursos. 2 en este caso.
+        # Un hilo por caso de uso (2 en este caso). El pool se crea en el primer uso
+        # y se reutiliza en cada llamada, en lugar de crear uno por película.
         self.max_workers = len(use_cases)
+        self._executor = None
+        self._executor_lock = threading.Lock()
 
-    def execute(self, movie: Movie) -> None:
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="composite")
+            return self._executor
+
+    def execute(self, movie: Movie) -> bool:
         """
-        Ejecuta todos los casos de uso de la lista en paralelo usando un pool de hilos.
+        Ejecuta todos los casos de uso de la lista en paralelo usando el pool de hilos.
 
         Args:
             movie (Movie): Objeto Movie que contiene la información a persistir.
+
+        Returns:
+            bool: True solo si todos los casos de uso la persistieron.
+        """
+        # executor.map aplica la función execute a cada caso de uso en la lista
+        # de forma concurrente, pasando el mismo objeto 'movie' a cada uno.
+        return all(list(self._get_executor().map(lambda uc: uc.execute(movie), self.use_cases)))
+
+    def execute_many(self, movies: List[Movie]) -> List[Movie]:
+        """
+        Entrega el lote completo a cada caso de uso en paralelo.
+
+        Args:
+            movies (List[Movie]): Lote de películas a persistir.
+
+        Returns:
+            List[Movie]: Las películas que persistieron todos los casos de uso.
+        """
+        results = list(self._get_executor().map(lambda uc: uc.execute_many(movies), self.use_cases))
+        saved_everywhere = set.intersection(*({id(movie) for movie in saved} for saved in results)) if results else set()
+        return [movie for movie in movies if id(movie) in saved_everywhere]
+
+    def known_imdb_ids(self) -> Optional[Set[str]]:
+        """
+        Intersección de lo que ya tiene cada caso de uso: un título solo puede
+        omitirse si todas las persistencias lo tienen.
         """
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # executor.map aplica la función execute a cada caso de uso en la lista
-            # de forma concurrente, pasando el mismo objeto 'movie' a cada uno.
-            list(executor.map(lambda uc: uc.execute(movie), self.use_cases))
\ No newline at end of file
+        known = None
+        for use_case in self.use_cases:
+            ids = use_case.known_imdb_ids()
+            if ids is None:
+                return None
+            known = ids if known is None else known & ids
+        return known
+
+    def close(self) -> None:
+        """Libera el pool de hilos (si llegó a crearse)."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
@@ -0,0 +1,40 @@
+import logging
+from typing import List, Optional, Set
+from domain.models.movie import Movie
+from domain.interfaces.use_case_interface import UseCaseInterface
+from domain.interfaces.bulk_loader_interface import BulkLoaderInterface
+
+logger = logging.getLogger(__name__)
+
+
+class LoadMoviesWithCopyPostgresUseCase(UseCaseInterface):
+    """
+    Caso de uso que persiste en PostgreSQL mediante un cargador masivo (COPY),
+    pensado para recibir lotes completos del pipeline en lugar de película a película.
+    """
+    def __init__(self, loader: BulkLoaderInterface):
+        self.loader = loader
+
+    def execute(self, movie: Movie) -> bool:
+        """Carga una sola película (lote de uno)."""
+        return bool(self.execute_many([movie]))
+
+    def execute_many(self, movies: List[Movie]) -> List[Movie]:
+        """
+        Carga el lote completo en una transacción. Las películas ya existentes se actualizan.
+        Devuelve el lote entero si la transacción se confirmó, o una lista vacía si falló.
+        """
+        try:
+            self.loader.load_movies(movies)
+        except Exception as e:
+            logger.error(f"Error en la carga masiva de un lote de {len(movies)} películas: {e}")
+            return []
+        return list(movies)
+
+    def known_imdb_ids(self) -> Optional[Set[str]]:
+        """IDs ya presentes en la BD, o None si no hay conexión."""
+        try:
+            return self.loader.known_imdb_ids()
+        except Exception as e:
+            logger.warning(f"No se pudieron consultar las películas existentes en la BD: {e}")
+            return None
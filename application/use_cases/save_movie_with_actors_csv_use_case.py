@@ -1,4 +1,5 @@
 import logging
+from typing import Optional, Set
 from domain.models.movie import Movie
 from domain.models.actor import Actor
 from domain.models.movie_actor import MovieActor
@@ -6,6 +7,7 @@ from domain.interfaces.use_case_interface import UseCaseInterface
 from domain.repositories.movie_repository import MovieRepository
 from domain.repositories.actor_repository import ActorRepository
 from domain.repositories.movie_actor_repository import MovieActorRepository
+from application.services.actor_identity_cache import ActorIdentityCache
 
 logger = logging.getLogger(__name__)
 
@@ -19,47 +21,63 @@ class SaveMovieWithActorsCsvUseCase(UseCaseInterface):
         self,
         movie_repository: MovieRepository,
         actor_repository: ActorRepository,
-        movie_actor_repository: MovieActorRepository
+        movie_actor_repository: MovieActorRepository,
+        actor_cache: Optional[ActorIdentityCache] = None
     ):
         self.movie_repo = movie_repository
         self.actor_repo = actor_repository
         self.movie_actor_repo = movie_actor_repository
+        self.actor_cache = actor_cache or ActorIdentityCache("csv")
 
-    def execute(self, movie: Movie) -> None:
+    def execute(self, movie: Movie) -> bool:
         """
-        Ejecuta el guardado de una película y sus actores en CSV, manejando duplicados.
+        Ejecuta el guardado de una película y sus actores en CSV. Si la película ya
+        existía (refresco de un título caducado), se actualizan su fila y su reparto.
+        Devuelve False si la escritura falló.
         """
         try:
-            # Manejo de duplicados: comprueba si la película ya existe por su ID de IMDb.
-            # Nota: para CSV, find_by_imdb_id puede ser una operación costosa si el archivo es grande.
-            # Se asume una implementación optimizada o se acepta el costo.
+            # El repositorio CSV responde desde un índice en memoria, sin leer el archivo.
             existing_movie = self.movie_repo.find_by_imdb_id(movie.imdb_id)
-            if existing_movie:
-                logger.info(f"La película '{movie.title}' ya existe en el CSV. Saltando.")
-                return
 
-            # Guarda la película. En CSV, el 'id' puede no generarse automáticamente,
-            # por lo que asumimos que el modelo Movie ya tiene un ID o se maneja internamente.
+            # Guarda la película: una nueva recibe el siguiente ID; una existente conserva el suyo.
             saved_movie = self.movie_repo.save(movie)
 
             relations_to_save = []
             for actor in movie.actors:
-                # Manejo de duplicados de actores.
-                existing_actor = self.actor_repo.find_by_name(actor.name)
-                if existing_actor:
-                    saved_actor = existing_actor
-                else:
-                    saved_actor = self.actor_repo.save(actor)
+                actor_id = self._resolve_actor_id(actor)
                 
                 # Asegurarse de que ambos IDs existen antes de crear la relación.
-                if saved_movie.id and saved_actor.id:
+                if saved_movie.id and actor_id:
                     relations_to_save.append(
-                        MovieActor(movie_id=saved_movie.id, actor_id=saved_actor.id)
+                        MovieActor(movie_id=saved_movie.id, actor_id=actor_id)
                     )
 
-            if relations_to_save:
+            if existing_movie:
+                self.movie_actor_repo.replace_for_movies([saved_movie.id], relations_to_save)
+                logger.info(f"Actualizada película '{saved_movie.title}' en CSV con {len(relations_to_save)} actores.")
+            elif relations_to_save:
                 self.movie_actor_repo.save_many(relations_to_save)
                 logger.info(f"Guardada película '{saved_movie.title}' en CSV con {len(relations_to_save)} actores.")
+            return True
 
         except Exception as e:
-            logger.error(f"Error al escribir en CSV para la película '{movie.title}': {e}")
\ No newline at end of file
+            logger.error(f"Error al escribir en CSV para la película '{movie.title}': {e}")
+            return False
+
+    def known_imdb_ids(self) -> Optional[Set[str]]:
+        """IDs ya presentes en el CSV."""
+        return self.movie_repo.find_all_imdb_ids()
+
+    def _resolve_actor_id(self, actor: Actor) -> Optional[int]:
+        """
+        ID del actor: primero la caché; si no está, el repositorio (buscar o crear).
+        """
+        actor_id = self.actor_cache.get(actor.name)
+        if actor_id is not None:
+            return actor_id
+
+        # Manejo de duplicados de actores.
+        saved_actor = self.actor_repo.find_by_name(actor.name) or self.actor_repo.save(actor)
+        if saved_actor.id:
+            self.actor_cache.put(actor.name, saved_actor.id)
+        return saved_actor.id
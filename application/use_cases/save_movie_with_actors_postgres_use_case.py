@@ -1,69 +1,130 @@
 
 
 import logging
+from typing import Callable, Dict, List, Optional, Set
 from domain.models.movie import Movie
 from domain.models.actor import Actor
 from domain.models.movie_actor import MovieActor
 from domain.interfaces.use_case_interface import UseCaseInterface
-from domain.repositories.movie_repository import MovieRepository
-from domain.repositories.actor_repository import ActorRepository
-from domain.repositories.movie_actor_repository import MovieActorRepository
+from domain.interfaces.unit_of_work_interface import UnitOfWorkInterface
+from application.services.actor_identity_cache import ActorIdentityCache
 
 logger = logging.getLogger(__name__)
 
 
 class SaveMovieWithActorsPostgresUseCase(UseCaseInterface):
     """
-    Caso de uso para guardar una película y sus actores en PostgreSQL,
-    manejando duplicados y orquestando los repositorios.
+    Caso de uso para guardar una película y sus actores en PostgreSQL, orquestando los
+    repositorios. Una película ya guardada se actualiza (datos y reparto): así el
+    refresco de títulos caducados llega a la base de datos.
+
+    En modo bulk, películas, actores y relaciones de un lote van en la transacción de
+    la unidad de trabajo: si una sentencia falla, no queda ninguna parte del lote.
+
+    Cada película (o lote) es una unidad de trabajo con su propia conexión del pool,
+    así varios hilos pueden escribir en paralelo sin compartir transacción.
     """
     def __init__(
         self,
-        movie_repository: MovieRepository,
-        actor_repository: ActorRepository,
-        movie_actor_repository: MovieActorRepository
+        unit_of_work_factory: Callable[[], UnitOfWorkInterface],
+        bulk: bool = False,
+        actor_cache: Optional[ActorIdentityCache] = None
     ):
-        self.movie_repo = movie_repository
-        self.actor_repo = actor_repository
-        self.movie_actor_repo = movie_actor_repository
+        """
+        Args:
+            unit_of_work_factory: Crea una unidad de trabajo nueva (conexión + repositorios).
+            bulk (bool): Si es True, `execute_many` guarda cada lote con sentencias por
+                         conjunto (películas, actores y relaciones de todo el lote a la vez)
+                         en lugar de procesar película por película.
+            actor_cache (ActorIdentityCache): IDs de actores ya conocidos; en modo bulk
+                         solo se envían a la BD los nombres que no estén en caché.
+        """
+        self.unit_of_work_factory = unit_of_work_factory
+        self.bulk = bulk
+        self.actor_cache = actor_cache or ActorIdentityCache("postgres")
 
-    def execute(self, movie: Movie) -> None:
+    def execute(self, movie: Movie) -> bool:
         """
-        Ejecuta el manejo de duplicados y guardado.
+        Guarda (o actualiza, si ya existía) la película.
         Confía en que el objeto 'movie' ya es válido.
+
+        La película, sus actores y relaciones se guardan en una sola transacción:
+        o queda todo persistido o nada. Devuelve False si la transacción falló.
         """
         try:
-            
-
-            # Manejo de duplicados de películas
-            existing_movie = self.movie_repo.find_by_imdb_id(movie.imdb_id)
-            if existing_movie:
-                logger.info(f"La película '{movie.title}' ya existe en la BD. Saltando.")
-                return
-
-            # Uso correcto del valor de retorno
-            saved_movie = self.movie_repo.save(movie)
-            if not saved_movie or not saved_movie.id:
-                logger.error(f"Error al guardar la película '{movie.title}' o al obtener su ID.")
-                return
-
-            relations_to_save = []
-            for actor in movie.actors:
-                # Manejo de duplicados de actores
-                existing_actor = self.actor_repo.find_by_name(actor.name)
-                if existing_actor:
-                    saved_actor = existing_actor
-                else:
-                    saved_actor = self.actor_repo.save(actor)
-                
-                if saved_actor and saved_actor.id:
-                    relations_to_save.append(
-                        MovieActor(movie_id=saved_movie.id, actor_id=saved_actor.id)
-                    )
-
-            if relations_to_save:
-                self.movie_actor_repo.save_many(relations_to_save)
-                logger.info(f"Guardada película '{saved_movie.title}' con {len(relations_to_save)} actores.")
+            with self.unit_of_work_factory() as uow:
+                saved_movie = uow.save_movie_with_actors(movie)
+
+            logger.info(f"Guardada película '{saved_movie.title}' con {len(movie.actors)} actores.")
+            return True
 
         except Exception as e: 
-            logger.error(f"Error en la base de datos al procesar '{movie.title}': {e}")
\ No newline at end of file
+            logger.error(f"Error en la base de datos al procesar '{movie.title}': {e}")
+            return False
+
+    def known_imdb_ids(self) -> Optional[Set[str]]:
+        """IDs ya presentes en la BD, o None si no hay conexión."""
+        try:
+            with self.unit_of_work_factory() as uow:
+                return uow.movie_repository.find_all_imdb_ids()
+        except Exception as e:
+            logger.warning(f"No se pudieron consultar las películas existentes en la BD: {e}")
+            return None
+
+    def execute_many(self, movies: List[Movie]) -> List[Movie]:
+        """
+        Guarda un lote de películas. En modo bulk son pocas llamadas a la BD por lote
+        (películas, actores y reparto); si no, se delega en `execute` por película.
+        Las películas que ya existían se actualizan y su reparto se reemplaza, igual que en `execute`.
+
+        Returns:
+            List[Movie]: Las películas persistidas; en modo bulk, todo el lote o nada.
+        """
+        if not self.bulk:
+            return super().execute_many(movies)
+
+        try:
+            with self.unit_of_work_factory() as uow:
+                saved_movies = uow.movie_repository.save_many(movies)
+                if not saved_movies:
+                    return []
+
+                # Los actores vienen en los objetos originales; las copias guardadas traen el ID.
+                actors_by_imdb_id = {movie.imdb_id: movie.actors for movie in movies}
+                names = list(dict.fromkeys(
+                    actor.name
+                    for saved_movie in saved_movies
+                    for actor in actors_by_imdb_id[saved_movie.imdb_id]
+                ))
+                actor_ids: Dict[str, int] = {}
+                missing_names = []
+                for name in names:
+                    cached_id = self.actor_cache.get(name)
+                    if cached_id is None:
+                        missing_names.append(name)
+                    else:
+                        actor_ids[name] = cached_id
+                saved_actors = uow.actor_repository.save_many([Actor(id=None, name=name) for name in missing_names])
+                new_actor_ids = {actor.name: actor.id for actor in saved_actors if actor.id}
+                actor_ids.update(new_actor_ids)
+
+                relations_to_save = list({
+                    (saved_movie.id, actor_ids[actor.name]): MovieActor(movie_id=saved_movie.id, actor_id=actor_ids[actor.name])
+                    for saved_movie in saved_movies
+                    for actor in actors_by_imdb_id[saved_movie.imdb_id]
+                    if actor.name in actor_ids
+                }.values())
+
+                # Las películas ya existentes pierden el reparto anterior (refresco).
+                uow.movie_actor_repository.replace_for_movies([m.id for m in saved_movies], relations_to_save)
+                logger.info(f"Guardado lote de {len(saved_movies)} películas con {len(relations_to_save)} relaciones de actores.")
+
+            # Solo tras confirmar la transacción (al salir de la unidad de trabajo; los
+            # repositorios no confirman por su cuenta): un ID revertido no debe quedar en caché.
+            for name, actor_id in new_actor_ids.items():
+                self.actor_cache.put(name, actor_id)
+            return list(movies)
+
+        except Exception as e:
+            logger.error(f"Error en la base de datos al procesar un lote de {len(movies)} películas: {e}")
+            return []
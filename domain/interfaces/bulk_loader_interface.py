@@ -0,0 +1,30 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional, Set
+from domain.models.movie import Movie
+
+class BulkLoaderInterface(ABC):
+    """
+    Interfaz para cargadores masivos de películas con sus actores.
+
+    A diferencia de los repositorios, un cargador recibe lotes completos y resuelve
+    por su cuenta la deduplicación y la asignación de IDs en el destino.
+    """
+
+    @abstractmethod
+    def load_movies(self, movies: List[Movie]) -> int:
+        """
+        Carga un lote de películas, sus actores y las relaciones entre ambos.
+
+        Args:
+            movies (List[Movie]): Películas a cargar.
+
+        Returns:
+            int: Número de películas insertadas o actualizadas (las existentes se actualizan).
+        """
+        pass
+
+    def known_imdb_ids(self) -> Optional[Set[str]]:
+        """
+        IDs de IMDb ya presentes en el destino, o None si no puede saberse.
+        """
+        return None
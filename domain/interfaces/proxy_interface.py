@@ -33,3 +33,20 @@ class ProxyProviderInterface(ABC):
             tuple[str, str, str]: Una tupla con (IP pública, ciudad, país).
         """
         pass
+
+    def report_result(
+        self,
+        proxy: Optional[Dict[str, str]],
+        status_code: Optional[int] = None,
+        latency: Optional[float] = None
+    ) -> None:
+        """
+        Informa del resultado de una petición hecha con `proxy`, para que el proveedor
+        ajuste su selección. Por defecto no hace nada.
+
+        Args:
+            proxy (Optional[Dict[str, str]]): Proxy usado en la petición.
+            status_code (Optional[int]): Código HTTP recibido, o None si hubo error de red.
+            latency (Optional[float]): Segundos que tardó la respuesta.
+        """
+        pass
@@ -18,6 +18,37 @@ class TorInterface(ABC):
         """
         pass
 
+    @abstractmethod
+    def register_request(self) -> bool:
+        """
+        Registra una petición realizada por el circuito actual.
+
+        Returns:
+            bool: True si se agotó el presupuesto de peticiones del circuito y debe rotarse.
+        """
+        pass
+
+    @abstractmethod
+    def get_proxies(self) -> dict:
+        """
+        Devuelve los proxies SOCKS que debe usar la próxima petición por TOR.
+
+        Returns:
+            dict: Diccionario de proxies para `requests` (claves 'http' y 'https').
+        """
+        pass
+
+    @abstractmethod
+    def report_block(self, proxies: dict) -> None:
+        """
+        Notifica que una petición hecha con `proxies` recibió un código de bloqueo,
+        para que la implementación renueve ese circuito.
+
+        Args:
+            proxies (dict): Proxies usados en la petición bloqueada.
+        """
+        pass
+
     @abstractmethod
     def get_current_ip(self) -> str:
         """
@@ -27,3 +58,10 @@ class TorInterface(ABC):
             str: IP pública actual de TOR.
         """
         pass
+
+    def close(self) -> None:
+        """
+        Libera los recursos de la implementación (ej. la conexión al puerto de control).
+        Por defecto no hace nada.
+        """
+        pass
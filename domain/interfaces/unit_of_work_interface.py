@@ -0,0 +1,72 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+from domain.models.movie import Movie
+from domain.models.movie_actor import MovieActor
+from domain.repositories.movie_repository import MovieRepository
+from domain.repositories.actor_repository import ActorRepository
+from domain.repositories.movie_actor_repository import MovieActorRepository
+
+class UnitOfWorkInterface(ABC):
+    """
+    Unidad de trabajo: agrupa los repositorios que comparten una misma conexión
+    y transacción durante una operación (ej. guardar una película o un lote).
+
+    Se usa como context manager: al salir sin errores confirma, y ante una
+    excepción revierte. En ambos casos libera los recursos con `close`.
+    Para que la unidad sea atómica, sus repositorios no deben confirmar ni revertir
+    por su cuenta, y deben propagar los errores en lugar de ocultarlos.
+    """
+    movie_repository: MovieRepository
+    actor_repository: ActorRepository
+    movie_actor_repository: MovieActorRepository
+
+    def __enter__(self) -> "UnitOfWorkInterface":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            if exc_type is None:
+                self.commit()
+            else:
+                self.rollback()
+        finally:
+            self.close()
+
+    @abstractmethod
+    def commit(self) -> None:
+        """Confirma los cambios de la unidad de trabajo."""
+        pass
+
+    @abstractmethod
+    def rollback(self) -> None:
+        """Descarta los cambios pendientes de la unidad de trabajo."""
+        pass
+
+    def close(self) -> None:
+        """Libera los recursos tomados por la unidad de trabajo."""
+        pass
+
+    def save_movie_with_actors(self, movie: Movie) -> Optional[Movie]:
+        """
+        Guarda una película con sus actores y relaciones dentro de esta unidad de trabajo.
+        Si la película ya existía, actualiza sus datos y reemplaza su reparto.
+
+        La implementación por defecto orquesta los tres repositorios (alta o
+        actualización de la película, alta de actores y relaciones); los backends que
+        puedan hacerlo en una sola operación la sobrescriben.
+
+        Returns:
+            Optional[Movie]: La película guardada con su ID.
+        """
+        saved_movie = self.movie_repository.save(movie)
+        if not saved_movie or not saved_movie.id:
+            raise ValueError(f"No se obtuvo el ID de la película '{movie.title}'.")
+
+        relations_to_save = []
+        for actor in movie.actors:
+            saved_actor = self.actor_repository.find_by_name(actor.name) or self.actor_repository.save(actor)
+            if saved_actor and saved_actor.id:
+                relations_to_save.append(MovieActor(movie_id=saved_movie.id, actor_id=saved_actor.id))
+
+        self.movie_actor_repository.replace_for_movies([saved_movie.id], relations_to_save)
+        return saved_movie
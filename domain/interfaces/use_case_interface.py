@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, List, Optional, Set
 
 class UseCaseInterface(ABC):
     """
@@ -11,7 +11,7 @@ class UseCaseInterface(ABC):
     """
 
     @abstractmethod
-    def execute(self, data: Any) -> None:
+    def execute(self, data: Any) -> bool:
         """
         Ejecuta la lógica principal del caso de uso.
 
@@ -20,6 +20,33 @@ class UseCaseInterface(ABC):
                         Puede ser un objeto, diccionario u otro tipo dependiendo del contexto.
 
         Returns:
-            None
+            bool: True si los datos quedaron persistidos; False si falló (el error ya se registró).
         """
         pass
+
+    def execute_many(self, data: List[Any]) -> List[Any]:
+        """
+        Ejecuta el caso de uso para un lote de elementos.
+
+        La implementación por defecto procesa uno a uno con `execute`; los casos de uso
+        que puedan agrupar escrituras (ej. una sola transacción) la sobrescriben.
+
+        Args:
+            data (List[Any]): Lote de datos a procesar.
+
+        Returns:
+            List[Any]: Los elementos del lote (los mismos objetos recibidos) que quedaron
+                       persistidos; los que fallaron no aparecen.
+        """
+        return [item for item in data if self.execute(item)]
+
+    def known_imdb_ids(self) -> Optional[Set[str]]:
+        """
+        IDs de IMDb que este caso de uso ya tiene persistidos, para que el scraper
+        no vuelva a descargarlos.
+
+        Returns:
+            Optional[Set[str]]: El conjunto de IDs, o None si no puede saberse
+                                (en ese caso el scraper no salta ningún título).
+        """
+        return None
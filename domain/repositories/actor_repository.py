@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import List, Optional
 from domain.models.actor import Actor
 
 class ActorRepository(ABC):
@@ -25,4 +25,27 @@ class ActorRepository(ABC):
         Returns:
             Optional[Actor]: El objeto Actor si se encuentra, de lo contrario None.
         """
-        pass
\ No newline at end of file
+        pass
+
+    def save_many(self, actors: List[Actor]) -> List[Actor]:
+        """
+        Guarda un lote de actores y devuelve todos con su ID, existieran o no.
+
+        La implementación por defecto busca y guarda uno a uno.
+
+        Args:
+            actors (List[Actor]): Actores a guardar.
+
+        Returns:
+            List[Actor]: Actores del lote con su ID.
+        """
+        return [self.find_by_name(actor.name) or self.save(actor) for actor in actors]
+
+    def find_all(self) -> List[Actor]:
+        """
+        Devuelve todos los actores persistidos (usado para precargar cachés).
+
+        La implementación por defecto no devuelve nada; los repositorios que puedan
+        listar sus actores de forma barata la sobrescriben.
+        """
+        return []
@@ -30,4 +30,16 @@ class MovieActorRepository(ABC):
         Args:
             relations (List[MovieActor]): Lista de relaciones MovieActor a persistir.
         """
+        pass
+
+    @abstractmethod
+    def replace_for_movies(self, movie_ids: List[int], relations: List[MovieActor]) -> None:
+        """
+        Sustituye el reparto de las películas indicadas: sus relaciones pasan a ser
+        exactamente las de `relations` (se usa al refrescar títulos ya guardados).
+
+        Args:
+            movie_ids (List[int]): Películas cuyo reparto se reemplaza (aunque queden sin actores).
+            relations (List[MovieActor]): Relaciones nuevas de esas películas.
+        """
         pass
\ No newline at end of file
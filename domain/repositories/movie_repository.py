@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import List, Optional, Set
 from domain.models.movie import Movie
 
 class MovieRepository(ABC):
@@ -14,6 +14,7 @@ class MovieRepository(ABC):
     def save(self, movie: Movie) -> Movie:
         """
         Guarda una película y retorna la entidad guardada (potencialmente con el ID asignado).
+        Si ya existe una con el mismo imdb_id, actualiza sus datos y conserva su ID.
 
         Args:
             movie (Movie): Objeto Movie que contiene la información a guardar.
@@ -35,4 +36,30 @@ class MovieRepository(ABC):
         Returns:
             Optional[Movie]: El objeto Movie si se encuentra, de lo contrario None.
         """
-        pass
\ No newline at end of file
+        pass
+
+    def save_many(self, movies: List[Movie]) -> List[Movie]:
+        """
+        Guarda un lote de películas: inserta las nuevas y actualiza las existentes.
+
+        La implementación por defecto guarda una a una; los repositorios que puedan
+        resolver el lote en pocas sentencias (ej. PostgreSQL) la sobrescriben.
+
+        Args:
+            movies (List[Movie]): Películas a guardar.
+
+        Returns:
+            List[Movie]: Las películas del lote (sin repetir imdb_id), con su ID asignado.
+        """
+        saved = {}
+        for movie in movies:
+            saved[movie.imdb_id] = self.save(movie)
+        return list(saved.values())
+
+    def find_all_imdb_ids(self) -> Set[str]:
+        """
+        Devuelve los IDs de IMDb de todas las películas guardadas.
+
+        La implementación por defecto devuelve un conjunto vacío (no se omite nada).
+        """
+        return set()
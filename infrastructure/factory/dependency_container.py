@@ -1,3 +1,6 @@
+import logging
+import os
+from typing import Optional, Tuple
 
 from domain.interfaces.use_case_interface import UseCaseInterface
 from domain.interfaces.scraper_interface import ScraperInterface
@@ -7,72 +10,195 @@ from domain.interfaces.tor_interface import TorInterface
 from application.use_cases.save_movie_with_actors_csv_use_case import SaveMovieWithActorsCsvUseCase
 from application.use_cases.save_movie_with_actors_postgres_use_case import SaveMovieWithActorsPostgresUseCase
 from application.use_cases.composite_save_movie_with_actors_use_case import CompositeSaveMovieWithActorsUseCase
-from infrastructure.persistence.csv.repositories.movie_csv_repository import MovieCsvRepository
-from infrastructure.persistence.csv.repositories.actor_csv_repository import ActorCsvRepository
-from infrastructure.persistence.csv.repositories.movie_actor_csv_repository import MovieActorCsvRepository
-from infrastructure.persistence.postgres.repositories.movie_postgres_repository import MoviePostgresRepository
-from infrastructure.persistence.postgres.repositories.actor_postgres_repository import ActorPostgresRepository
-from infrastructure.persistence.postgres.repositories.movie_actor_postgres_repository import MovieActorPostgresRepository
+from application.use_cases.load_movies_with_copy_postgres_use_case import LoadMoviesWithCopyPostgresUseCase
+from application.services.actor_identity_cache import ActorIdentityCache
+from infrastructure.persistence.csv.repositories.movie_csv_repository import MovieCsvRepository, MOVIES_CSV, MOVIE_HEADERS
+from infrastructure.persistence.csv.repositories.actor_csv_repository import ActorCsvRepository, ACTORS_CSV, ACTOR_HEADERS
+from infrastructure.persistence.csv.repositories.movie_actor_csv_repository import MovieActorCsvRepository, MOVIE_ACTOR_CSV, MOVIE_ACTOR_HEADERS
+from infrastructure.persistence.csv.buffered_csv_writer import CsvSink
+from infrastructure.persistence.csv.shard_merger import shard_dir, shard_csv_paths
+from infrastructure.persistence.postgres.unit_of_work import PostgresUnitOfWork
 from infrastructure.scraper.imdb_scraper import ImdbScraper
-from infrastructure.persistence.postgres.postgres_connection import connection_pool 
+from infrastructure.scraper.async_imdb_scraper import AsyncImdbScraper
+from infrastructure.scraper.graphql_title_fetcher import GraphqlTitleFetcher
+from infrastructure.scraper.scrape_checkpoint import ScrapeCheckpoint
+from infrastructure.persistence.postgres.postgres_connection import close_pool
+from infrastructure.persistence.postgres.copy_loader import PostgresCopyLoader
 from infrastructure.network.proxy_provider import ProxyProvider
 from infrastructure.network.tor_rotator import TorRotator
+from infrastructure.network.tor_circuit_pool import TorCircuitPool
+from infrastructure.network.session_manager import session_manager
+from infrastructure.network.http_cache import http_cache
+
+logger = logging.getLogger(__name__)
 
 class DependencyContainer:
     """
     Un contenedor centralizado para la inyección de dependencias.
     Gestiona la creación y el ciclo de vida de los servicios de la aplicación.
     """
-    def __init__(self, config):
+    def __init__(self, config, shard: Optional[Tuple[int, int]] = None):
+        """
+        Args:
+            shard: (índice, total) en modo --workers. El proceso del shard escribe sus CSV,
+                   checkpoint y puntuaciones de proxies en su propio directorio, usa su parte
+                   de PROXY_LIST y credenciales TOR propias (circuitos distintos).
+        """
         self.config = config
-        self._db_connection = None
-        self.proxy_provider = ProxyProvider()
-        self.tor_rotator = TorRotator()
+        self.shard = shard
+        if shard is None:
+            self.csv_paths = {"movies": MOVIES_CSV, "actors": ACTORS_CSV, "movie_actor": MOVIE_ACTOR_CSV}
+            self.checkpoint_path = config.SCRAPE_CHECKPOINT_PATH
+            self.proxy_scores_path = config.PROXY_SCORES_PATH
+            proxy_list = None
+            self.tor_namespace = ""
+        else:
+            index, count = shard
+            self.csv_paths = shard_csv_paths(index)
+            self.checkpoint_path = self.shard_checkpoint_path(index)
+            self.proxy_scores_path = os.path.join(shard_dir(index), os.path.basename(config.PROXY_SCORES_PATH))
+            # Con menos proxies que procesos, los shards comparten la lista completa.
+            proxy_list = (config.PROXY_LIST or [])[index::count] or None
+            self.tor_namespace = f"shard{index}-"
+        self._csv_sink = None
+        self._composite_use_case = None
+        # Una caché de actores por persistencia: los IDs de CSV y PostgreSQL no coinciden.
+        self.actor_caches = {}
+        self.proxy_provider = ProxyProvider(proxy_list=proxy_list)
+        self.tor_rotator = None
+
+    @staticmethod
+    def shard_checkpoint_path(index: int) -> str:
+        """Checkpoint propio del shard `index`; el proceso padre lo fusiona al terminar."""
+        return os.path.join(shard_dir(index), "scrape_checkpoint.json")
 
-    def get_db_connection(self):
-        """Gestiona la conexión a la BD para que se cree una sola vez."""
-        if self._db_connection is None and connection_pool:
-            self._db_connection = connection_pool.getconn()
-        return self._db_connection
+    def shutdown(self):
+        """Cierre ordenado al terminar una ejecución: estadísticas, CSV, base de datos y red."""
+        self.log_cache_stats()
+        self.export_proxy_scores()
+        self.close_use_cases()
+        self.close_csv_sink()
+        self.close_db_connection()
+        self.close_http_sessions()
 
     def close_db_connection(self):
-        """Cierra la conexión y la devuelve al pool."""
-        if self._db_connection and connection_pool:
-            connection_pool.putconn(self._db_connection)
-            self._db_connection = None
-            print("Conexión a la base de datos cerrada y devuelta al pool.")
+        """Cierra las conexiones del pool de PostgreSQL."""
+        close_pool()
+        print("Conexiones a la base de datos cerradas.")
+
+    def close_http_sessions(self):
+        """Cierra los pools de conexiones HTTP keep-alive de todas las rutas y el control de TOR."""
+        session_manager.close_all()
+        if self.tor_rotator is not None:
+            self.tor_rotator.close()
+
+    def get_csv_sink(self) -> CsvSink:
+        """Escritores con buffer de los tres CSV; se abren una sola vez por ejecución."""
+        if self._csv_sink is None:
+            self._csv_sink = CsvSink(
+                movies_path=self.csv_paths["movies"],
+                actors_path=self.csv_paths["actors"],
+                movie_actor_path=self.csv_paths["movie_actor"],
+                movie_headers=MOVIE_HEADERS,
+                actor_headers=ACTOR_HEADERS,
+                movie_actor_headers=MOVIE_ACTOR_HEADERS,
+                flush_rows=self.config.CSV_FLUSH_ROWS,
+                flush_bytes=self.config.CSV_FLUSH_BYTES,
+                flush_interval=self.config.CSV_FLUSH_INTERVAL
+            )
+        return self._csv_sink
+
+    def close_csv_sink(self):
+        """Vuelca los buffers pendientes y cierra los archivos CSV."""
+        if self._csv_sink:
+            self._csv_sink.close()
+            self._csv_sink = None
 
     def get_csv_use_case(self) -> UseCaseInterface:
         """Construye y devuelve el caso de uso para CSV."""
+        sink = self.get_csv_sink()
+        actor_repository = ActorCsvRepository(self.csv_paths["actors"], writer=sink.actors)
+        actor_cache = self._get_actor_cache("csv", actor_repository.find_all)
         return SaveMovieWithActorsCsvUseCase(
-            movie_repository=MovieCsvRepository(),
-            actor_repository=ActorCsvRepository(),
-            movie_actor_repository=MovieActorCsvRepository()
+            movie_repository=MovieCsvRepository(self.csv_paths["movies"], writer=sink.movies),
+            actor_repository=actor_repository,
+            movie_actor_repository=MovieActorCsvRepository(self.csv_paths["movie_actor"], writer=sink.movie_actors),
+            actor_cache=actor_cache
         )
 
     def get_postgres_use_case(self) -> UseCaseInterface:
         """Construye y devuelve el caso de uso para PostgreSQL."""
-        conn = self.get_db_connection()
+        write_mode = self.config.POSTGRES_WRITE_MODE.lower()
+        if write_mode == "copy":
+            return LoadMoviesWithCopyPostgresUseCase(loader=PostgresCopyLoader())
+        # Cada película o lote toma su propia conexión del pool (ThreadedConnectionPool).
         return SaveMovieWithActorsPostgresUseCase(
-            movie_repository=MoviePostgresRepository(conn),
-            actor_repository=ActorPostgresRepository(conn),
-            movie_actor_repository=MovieActorPostgresRepository(conn)
+            unit_of_work_factory=PostgresUnitOfWork,
+            bulk=write_mode == "bulk",
+            actor_cache=self._get_actor_cache("postgres", self._load_postgres_actors)
         )
 
-    def get_composite_use_case(self) -> UseCaseInterface:
-        """Construye el caso de uso compuesto."""
-        use_cases = [self.get_csv_use_case(), self.get_postgres_use_case()]
-        return CompositeSaveMovieWithActorsUseCase(use_cases)
+    @staticmethod
+    def _load_postgres_actors():
+        with PostgresUnitOfWork() as uow:
+            return uow.actor_repository.find_all()
+
+    def _get_actor_cache(self, name: str, loader) -> ActorIdentityCache:
+        """Crea la caché de actores de una persistencia y la precarga una sola vez."""
+        if name not in self.actor_caches:
+            cache = ActorIdentityCache(name, self.config.ACTOR_CACHE_MAX_SIZE)
+            try:
+                cache.preload(loader())
+            except Exception as e:
+                logger.warning(f"[ActorCache:{name}] No se pudo precargar: {e}")
+            self.actor_caches[name] = cache
+        return self.actor_caches[name]
+
+    def log_cache_stats(self):
+        """Registra aciertos/fallos de las cachés de actores y de la caché HTTP."""
+        for name, cache in self.actor_caches.items():
+            logger.info(f"[ActorCache:{name}] {cache.stats()}")
+        if http_cache.enabled:
+            logger.info(f"[HTTP-CACHE] {http_cache.stats()}")
+
+    def get_composite_use_case(self) -> CompositeSaveMovieWithActorsUseCase:
+        """Caso de uso compuesto (CSV + PostgreSQL); se construye una sola vez por ejecución."""
+        if self._composite_use_case is None:
+            use_cases = [self.get_csv_use_case(), self.get_postgres_use_case()]
+            self._composite_use_case = CompositeSaveMovieWithActorsUseCase(use_cases)
+        return self._composite_use_case
+
+    def close_use_cases(self):
+        """Libera el pool de hilos del caso de uso compuesto."""
+        if self._composite_use_case is not None:
+            self._composite_use_case.close()
+            self._composite_use_case = None
     def get_proxy_provider(self) -> ProxyProviderInterface:
-            """Fábrica para el proveedor de proxy."""
-            return ProxyProvider()
+            """Proveedor de proxy compartido: la salud de cada proxy se acumula entre scrapers."""
+            return self.proxy_provider
+
+    def export_proxy_scores(self):
+        """Exporta la salud de los proxies (éxito, bloqueos, p50/p95) a `PROXY_SCORES_PATH`."""
+        self.proxy_provider.export_scores(self.proxy_scores_path)
 
     def get_tor_rotator(self) -> TorInterface:
-        """Fábrica para el rotador de TOR."""
-        return TorRotator()
-    def get_scraper(self) -> ScraperInterface:
+        """
+        Rotador de TOR compartido (pool de circuitos aislados o un único circuito con NEWNYM):
+        una sola instancia coordina las rotaciones de todos los scrapers.
+        """
+        if self.tor_rotator is None:
+            if self.config.TOR_CIRCUIT_POOL_SIZE > 1:
+                self.tor_rotator = TorCircuitPool(size=self.config.TOR_CIRCUIT_POOL_SIZE, namespace=self.tor_namespace)
+            else:
+                self.tor_rotator = TorRotator(namespace=self.tor_namespace)
+        return self.tor_rotator
+    def get_scraper(self, assigned: Optional[list] = None, refresh_ids: Optional[set] = None) -> ScraperInterface:
         """
         Construye y devuelve el scraper principal inyectando TODAS sus dependencias.
+
+        Args:
+            assigned: En un shard de --workers, los pares (puesto, imdb_id) que le tocan.
+            refresh_ids: En un shard, los asignados que ya están en todas las persistencias.
         """
         use_case = self.get_composite_use_case()
         
@@ -81,15 +207,36 @@ class DependencyContainer:
         tor_rotator = self.get_tor_rotator()
         
         engine = self.config.SCRAPER_ENGINE.lower()
+        checkpoint = ScrapeCheckpoint(self.checkpoint_path, self.config.SCRAPE_CHECKPOINT_EVERY)
 
         if engine == "requests":
+            graphql_fetcher = None
+            if self.config.GRAPHQL_DETAILS_ENABLED:
+                graphql_fetcher = GraphqlTitleFetcher(proxy_provider=proxy_provider, tor_rotator=tor_rotator)
             return ImdbScraper(
                 use_case=use_case, 
                 proxy_provider=proxy_provider, 
                 tor_rotator=tor_rotator,
-                engine=engine
+                engine=engine,
+                graphql_fetcher=graphql_fetcher,
+                checkpoint=checkpoint,
+                assigned=assigned,
+                refresh_ids=refresh_ids,
+                # El pipeline da a cada persistencia su propio escritor por lotes.
+                sinks=use_case.use_cases
             )
-        
+
+        elif engine == "async":
+            return AsyncImdbScraper(
+                use_case=use_case,
+                proxy_provider=proxy_provider,
+                tor_rotator=tor_rotator,
+                engine=engine,
+                checkpoint=checkpoint,
+                assigned=assigned,
+                refresh_ids=refresh_ids
+            )
+
         elif engine == "playwright":
             raise NotImplementedError("El motor 'playwright' aún no está implementado.")
         else:
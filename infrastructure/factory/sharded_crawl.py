@@ -0,0 +1,120 @@
+import logging
+import multiprocessing
+import os
+from typing import List, Set
+
+from infrastructure.factory.dependency_container import DependencyContainer
+from infrastructure.persistence.csv.shard_merger import CsvShardMerger, existing_shards, shard_dir
+from shared.config import config
+
+logger = logging.getLogger(__name__)
+
+
+def _run_shard(index: int, count: int, assigned: List[tuple[int, str]], refresh_ids: Set[str]) -> None:
+    """
+    Punto de entrada de cada proceso hijo: construye su propio contenedor (CSV, checkpoint,
+    proxies, circuitos TOR y pool de PostgreSQL propios) y descarga los títulos asignados.
+    `refresh_ids` son los que el padre encontró en todas las persistencias.
+    """
+    container = DependencyContainer(config, shard=(index, count))
+    try:
+        container.get_scraper(assigned=assigned, refresh_ids=refresh_ids).scrape()
+    finally:
+        container.shutdown()
+
+
+class ShardedCrawl:
+    """
+    Scraping repartido en `workers` procesos (`run_scraper.py --workers N`).
+
+    1. El proceso padre obtiene los IDs, selecciona los pendientes y los reparte en
+       round-robin por puesto en el chart, de modo que cada shard recibe una mezcla
+       equivalente de títulos nuevos y caducados.
+    2. Cada hijo (contexto "spawn": sin sockets ni pools heredados) scrapea su shard con
+       su propia ruta de red y su propio pool de PostgreSQL. PostgreSQL asigna los IDs con
+       sus secuencias, así que los hijos escriben en la base directamente.
+    3. Los CSV no tienen secuencias: cada hijo escribe en `SHARDS_DIR/shard-<i>/` y, al
+       terminar todos, el padre los fusiona en los CSV principales asignando IDs globales,
+       e incorpora el checkpoint de cada shard al checkpoint principal.
+
+    La ejecución solo se marca como terminada si todos los shards acabaron bien; si no,
+    la siguiente ejecución la reanuda y vuelve a pedir solo los títulos no guardados.
+    El directorio de un shard solo se borra si su proceso terminó bien y su merge guardó
+    todas sus películas; si no, se conserva y la siguiente ejecución lo vuelve a fusionar
+    (junto con lo que escriba el nuevo proceso de ese shard, si lo hay).
+    """
+
+    def __init__(self, container: DependencyContainer, workers: int):
+        self.container = container
+        self.workers = workers
+
+    def run(self) -> None:
+        scraper = self.container.get_scraper()
+        pending = scraper.plan_run()
+        if pending is None:
+            return
+        checkpoint = scraper.checkpoint
+        # El padre ya no usa PostgreSQL (el merge solo toca los CSV): sus conexiones se
+        # liberan antes de que los hijos abran las suyas, para no pasar de POSTGRES_MAX_CONNECTIONS.
+        self.container.close_db_connection()
+
+        if checkpoint:
+            # Un shard conservado de una ejecución anterior tiene validadores y hashes que el
+            # checkpoint principal aún no tiene: se incorporan antes de que `export_titles`
+            # sobrescriba su archivo.
+            for index in existing_shards():
+                checkpoint.merge(DependencyContainer.shard_checkpoint_path(index))
+
+        shards = [pending[index::self.workers] for index in range(self.workers)]
+        # Los hijos releen la configuración al importarla: así dimensionan su pool de
+        # PostgreSQL a su parte de POSTGRES_MAX_CONNECTIONS.
+        os.environ["SCRAPER_WORKERS"] = str(self.workers)
+        context = multiprocessing.get_context("spawn")
+        processes = []
+        for index, assigned in enumerate(shards):
+            if not assigned:
+                continue
+            if checkpoint:
+                checkpoint.export_titles(DependencyContainer.shard_checkpoint_path(index), [imdb_id for _, imdb_id in assigned])
+            process = context.Process(
+                target=_run_shard,
+                args=(index, self.workers, assigned, {imdb_id for _, imdb_id in assigned} & scraper.refresh_ids),
+                name=f"scraper-shard-{index}"
+            )
+            process.start()
+            processes.append((index, process))
+            logger.info(f"[Shard {index}] Proceso {process.pid} iniciado con {len(assigned)} títulos.")
+
+        for index, process in processes:
+            process.join()
+            if process.exitcode != 0:
+                logger.error(f"[Shard {index}] El proceso terminó con código {process.exitcode}.")
+
+        spawned = [index for index, _ in processes]
+        # Shards conservados de una ejecución anterior que esta vez no se lanzaron.
+        leftovers = [index for index in existing_shards() if index not in spawned]
+        succeeded = [index for index, process in processes if process.exitcode == 0]
+        self._merge(spawned + leftovers, succeeded + leftovers, checkpoint)
+        if checkpoint and len(succeeded) == len(processes):
+            checkpoint.finish_run()
+        logger.info(f"Scraping en {len(processes)} procesos completado.")
+
+    def _merge(self, indexes: List[int], succeeded: List[int], checkpoint) -> None:
+        """
+        Fusiona los CSV y checkpoints de los shards y borra los directorios de trabajo de
+        los que terminaron bien y se fusionaron por completo.
+        """
+        merger = CsvShardMerger(self.container.get_csv_use_case())
+        merged = []
+        for index in indexes:
+            if merger.merge(index):
+                merged.append(index)
+            if checkpoint:
+                checkpoint.merge(DependencyContainer.shard_checkpoint_path(index))
+        # Los CSV principales deben estar en disco antes de borrar los de los shards.
+        self.container.close_csv_sink()
+        for index in indexes:
+            if index in succeeded and index in merged:
+                CsvShardMerger.cleanup(index)
+            else:
+                logger.warning(f"[Shard {index}] Se conserva {shard_dir(index)} para fusionarlo en la próxima ejecución.")
@@ -0,0 +1,145 @@
+import logging
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+from shared.config import config
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker de una ruta de salida (estrategia o circuito TOR + host), compartido
+    por todos los hilos.
+
+    - closed: las peticiones pasan; `failure_threshold` fallos seguidos lo abren.
+    - open: las peticiones se rechazan sin salir a la red durante `reset_timeout` segundos.
+    - half_open: pasado ese tiempo se deja pasar una única petición de sondeo; si tiene
+      éxito el circuito se cierra y si falla vuelve a abrirse.
+
+    Un fallo es un error de red/timeout o una respuesta 5xx: señales de que la ruta está
+    caída. Los bloqueos (403, 429...) los gestionan la rotación de TOR y la salud de proxies.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = config.BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float = config.BREAKER_RESET_TIMEOUT
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        # Generación del circuito TOR al que corresponde el estado (0 fuera de TOR).
+        self.generation = 0
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def renew(self, generation: int) -> None:
+        """Un circuito TOR nuevo en el mismo puesto (tras NEWNYM) empieza con el breaker cerrado."""
+        with self._lock:
+            if generation <= self.generation:
+                return
+            self.generation = generation
+            self.state = CLOSED
+            self._failures = 0
+            self._probe_started = None
+
+    def allow(self) -> bool:
+        """True si la petición puede salir por esta ruta."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            now = time.monotonic()
+            if self.state == OPEN:
+                if now - self._opened_at < self.reset_timeout:
+                    return False
+                self.state = HALF_OPEN
+                logger.info(f"[BREAKER] {self.name}: semiabierto, enviando petición de sondeo.")
+            # Un solo sondeo a la vez; si el sondeo nunca informa, se permite otro tras reset_timeout.
+            if self._probe_started is None or now - self._probe_started >= self.reset_timeout:
+                self._probe_started = now
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != CLOSED:
+                logger.info(f"[BREAKER] {self.name}: sondeo correcto, circuito cerrado.")
+            self.state = CLOSED
+            self._failures = 0
+            self._probe_started = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self.state == HALF_OPEN or (self.state == CLOSED and self._failures >= self.failure_threshold):
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+                self._probe_started = None
+                logger.warning(f"[BREAKER] {self.name}: circuito abierto tras {self._failures} fallos; se omite durante {self.reset_timeout}s.")
+
+    def record_status(self, status_code: int) -> None:
+        """Clasifica una respuesta HTTP: 5xx es fallo de la ruta; cualquier otra, éxito."""
+        if status_code >= 500:
+            self.record_failure()
+        else:
+            self.record_success()
+
+
+def tor_circuit_route(proxies: Optional[Dict[str, str]]) -> str:
+    """
+    Puesto del circuito TOR de unos proxies: el usuario de sus credenciales SOCKS
+    (ej. `circuit-3`). Con `IsolateSOCKSAuth` cada puesto es un circuito distinto; la
+    generación (la contraseña) no forma parte de la clave para que el registro no crezca
+    con cada rotación: ver `tor_circuit_generation`.
+    """
+    return urlsplit((proxies or {}).get("https") or "").username or ""
+
+
+def tor_circuit_generation(proxies: Optional[Dict[str, str]]) -> int:
+    """Generación del circuito (contraseña SOCKS): al avanzar, el breaker del puesto se reinicia."""
+    password = urlsplit((proxies or {}).get("https") or "").password or ""
+    return int(password) if password.isdigit() else 0
+
+
+class CircuitBreakerRegistry:
+    """
+    Un `CircuitBreaker` por estrategia (o por circuito TOR, vía `route`) y host, creado
+    la primera vez que se pide.
+    """
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, strategy: str, url: str, route: str = "", generation: int = 0) -> CircuitBreaker:
+        """
+        Args:
+            route: Ruta concreta dentro de la estrategia (ej. `tor_circuit_route`); vacía,
+                   un solo breaker para toda la estrategia.
+            generation: Generación del circuito de `route`; una más reciente que la del
+                        breaker lo reinicia (circuito nuevo tras rotar).
+        """
+        prefix = f"{strategy}[{route}]" if route else strategy
+        name = f"{prefix}:{urlsplit(url).hostname or ''}"
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(name, CircuitBreaker(name))
+        if generation > breaker.generation:
+            breaker.renew(generation)
+        return breaker
+
+
+# Instancia compartida por todo el proceso, como el throttle y el pool de sesiones.
+circuit_breakers = CircuitBreakerRegistry()
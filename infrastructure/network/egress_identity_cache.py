@@ -0,0 +1,90 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+from shared.config import config
+
+logger = logging.getLogger(__name__)
+
+EgressIdentity = Tuple[str, str, str]  # (IP pública, ciudad, país)
+
+
+class EgressIdentityCache:
+    """
+    Caché de la identidad de salida (IP, ciudad, país) por ruta y generación de circuito.
+
+    La consulta a ipinfo.io solo sirve para los logs, así que se hace una vez por
+    ruta/generación y no en cada intento. Cuando TOR cambia de circuito (NEWNYM) la
+    generación avanza y la entrada anterior deja de ser válida.
+
+    Las consultas fallidas ("N/A") también se cachean por ruta/generación, pero solo
+    `EGRESS_IDENTITY_NEGATIVE_TTL` segundos: si ipinfo.io no responde, los intentos
+    siguientes no lo vuelven a esperar, y pasado ese tiempo se reintenta.
+    """
+
+    def __init__(self, negative_ttl: float = config.EGRESS_IDENTITY_NEGATIVE_TTL):
+        self.negative_ttl = negative_ttl
+        self._entries: Dict[str, Tuple[Hashable, EgressIdentity]] = {}
+        self._failures: Dict[str, Tuple[Hashable, float, EgressIdentity]] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+
+    def _lock_for(self, route: str) -> threading.Lock:
+        with self._guard:
+            return self._locks.setdefault(route, threading.Lock())
+
+    def get(self, route: str, generation: Hashable = 0) -> Optional[EgressIdentity]:
+        """Devuelve la identidad cacheada si corresponde a la generación actual."""
+        entry = self._entries.get(route)
+        if entry and entry[0] == generation:
+            return entry[1]
+        return None
+
+    def _recent_failure(self, route: str, generation: Hashable) -> Optional[EgressIdentity]:
+        """Resultado de la última consulta fallida de la ruta, si es de esta generación y no ha caducado."""
+        failure = self._failures.get(route)
+        if failure and failure[0] == generation and failure[1] > time.monotonic():
+            return failure[2]
+        return None
+
+    def get_or_load(
+        self,
+        route: str,
+        generation: Hashable,
+        loader: Callable[[], EgressIdentity]
+    ) -> EgressIdentity:
+        """
+        Devuelve la identidad cacheada o la consulta con `loader`.
+        Si varios hilos piden la misma ruta a la vez, solo uno hace la consulta.
+        """
+        identity = self.get(route, generation) or self._recent_failure(route, generation)
+        if identity is not None:
+            return identity
+
+        with self._lock_for(route):
+            identity = self.get(route, generation) or self._recent_failure(route, generation)
+            if identity is None:
+                identity = loader()
+                self.put(route, generation, identity)
+            return identity
+
+    def put(self, route: str, generation: Hashable, identity: EgressIdentity) -> None:
+        """
+        Guarda una identidad recién consultada (ej. la verificación tras rotar). Un fallo
+        se guarda aparte, con caducidad, y no sustituye a la identidad válida cacheada.
+        """
+        if identity and identity[0] not in ("", "N/A"):
+            self._entries[route] = (generation, identity)
+            self._failures.pop(route, None)
+        elif self.negative_ttl > 0:
+            self._failures[route] = (generation, time.monotonic() + self.negative_ttl, identity or ("N/A", "N/A", "N/A"))
+
+    def invalidate(self, route: str) -> None:
+        """Elimina la identidad cacheada de una ruta."""
+        self._entries.pop(route, None)
+        self._failures.pop(route, None)
+
+
+# Instancia compartida por todo el proceso.
+egress_identity_cache = EgressIdentityCache()
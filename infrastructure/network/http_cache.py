@@ -0,0 +1,172 @@
+# En: infrastructure/network/http_cache.py
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from shared.config import config
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedResponse:
+    """Respuesta HTTP tal como se guardó en disco."""
+    status_code: int
+    url: str
+    content: bytes
+    encoding: Optional[str] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+class HttpResponseCache:
+    """
+    Caché en disco de respuestas HTTP, direccionada por contenido y comprimida con gzip.
+
+    La clave es el hash SHA-256 de método + URL + payload JSON, y cada entrada es un
+    archivo `<dir>/<2 primeros hex>/<hash>.gz` con una línea JSON de metadatos seguida del
+    cuerpo. Las entradas caducan tras `ttl` segundos y, si el directorio supera
+    `max_bytes`, se expulsan las más antiguas.
+
+    Modos:
+        "off":    desactivada.
+        "on":     se consulta antes de ir a la red y se guardan las respuestas 200.
+        "replay": solo se sirve desde la caché (ignorando el TTL); nunca se sale a la red.
+    """
+
+    def __init__(
+        self,
+        directory: str = config.HTTP_CACHE_DIR,
+        mode: str = config.HTTP_CACHE_MODE,
+        ttl: float = config.HTTP_CACHE_TTL,
+        max_bytes: int = config.HTTP_CACHE_MAX_BYTES
+    ):
+        self.directory = directory
+        self.mode = mode.lower()
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode in ("on", "replay")
+
+    @property
+    def replay(self) -> bool:
+        return self.mode == "replay"
+
+    @staticmethod
+    def key(method: str, url: str, payload: Optional[dict] = None) -> str:
+        raw = json.dumps([method.upper(), url, payload], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.gz")
+
+    def get(self, method: str, url: str, payload: Optional[dict] = None) -> Optional[CachedResponse]:
+        """Devuelve la respuesta guardada si existe y está vigente (en replay, aunque haya caducado)."""
+        path = self._path(self.key(method, url, payload))
+        try:
+            if not self.replay and time.time() - os.path.getmtime(path) > self.ttl:
+                self._count(hit=False)
+                return None
+            with gzip.open(path, "rb") as f:
+                meta = json.loads(f.readline())
+                content = f.read()
+        except FileNotFoundError:
+            self._count(hit=False)
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"[HTTP-CACHE] Entrada ilegible para {url}: {e}")
+            self._count(hit=False)
+            return None
+
+        self._count(hit=True)
+        return CachedResponse(
+            status_code=meta["status_code"],
+            url=meta["url"],
+            content=content,
+            encoding=meta.get("encoding"),
+            headers=meta.get("headers", {})
+        )
+
+    def put(self, method: str, url: str, payload: Optional[dict], response: CachedResponse) -> None:
+        """Guarda una respuesta (escritura atómica) y aplica el límite de tamaño."""
+        path = self._path(self.key(method, url, payload))
+        meta = {
+            "status_code": response.status_code,
+            "url": response.url,
+            "encoding": response.encoding,
+            "headers": dict(response.headers),
+            "stored_at": time.time()
+        }
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            previous_size = os.path.getsize(path) if os.path.exists(path) else 0
+            with gzip.open(tmp_path, "wb") as f:
+                f.write(json.dumps(meta, ensure_ascii=False).encode("utf-8") + b"\n")
+                f.write(response.content)
+            os.replace(tmp_path, path)
+            self._add_bytes(os.path.getsize(path) - previous_size)
+        except OSError as e:
+            logger.warning(f"[HTTP-CACHE] No se pudo guardar {url}: {e}")
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _add_bytes(self, delta: int) -> None:
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(size for _, size, _ in self._entries())
+            else:
+                self._total_bytes += delta
+            if self._total_bytes > self.max_bytes:
+                self._evict_locked()
+
+    def _entries(self):
+        """(ruta, tamaño, mtime) de cada entrada del directorio."""
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".gz"):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    yield path, stat.st_size, stat.st_mtime
+
+    def _evict_locked(self) -> None:
+        """Borra las entradas más antiguas hasta quedar en el 90% del límite."""
+        target = self.max_bytes * 0.9
+        evicted = 0
+        for path, size, _ in sorted(self._entries(), key=lambda entry: entry[2]):
+            if self._total_bytes <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self._total_bytes -= size
+            evicted += 1
+        logger.info(f"[HTTP-CACHE] Expulsadas {evicted} entradas por tamaño.")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"mode": self.mode, "hits": self.hits, "misses": self.misses}
+
+
+http_cache = HttpResponseCache()
@@ -0,0 +1,183 @@
+import json
+import logging
+import math
+import os
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional
+
+from shared.config import config
+
+logger = logging.getLogger(__name__)
+
+
+def _percentile(values: List[float], q: float) -> Optional[float]:
+    """Percentil por el método del rango más cercano (suficiente para una ventana corta)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def _redact(url: str) -> str:
+    """Oculta las credenciales de la URL de un proxy para logs y exportaciones."""
+    if "@" not in url:
+        return url
+    scheme, _, rest = url.partition("://")
+    return f"{scheme}://***@{rest.rsplit('@', 1)[-1]}"
+
+
+@dataclass
+class ProxyStats:
+    """Resultados recientes de un proxy."""
+    url: str
+    proxies: Dict[str, str]
+    successes: int = 0
+    blocks: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    ejections: int = 0
+    ejected_until: float = 0.0
+    latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=config.PROXY_HEALTH_WINDOW))
+
+    @property
+    def total(self) -> int:
+        return self.successes + self.blocks + self.failures
+
+    @property
+    def success_rate(self) -> float:
+        # Suavizado de Laplace: un proxy sin historial parte de 0.5, no de 0 ni de 1.
+        return (self.successes + 1) / (self.total + 2)
+
+    @property
+    def block_rate(self) -> float:
+        return self.blocks / self.total if self.total else 0.0
+
+    def score(self) -> float:
+        """Peso de selección: tasa de éxito penalizada por la latencia mediana."""
+        p50 = _percentile(list(self.latencies), 0.5)
+        latency_penalty = 1.0 + (p50 if p50 is not None else config.REQUEST_TIMEOUT / 4)
+        return self.success_rate / latency_penalty
+
+
+class ProxyHealthPool:
+    """
+    Salud de cada proxy de la lista a partir de los resultados de `make_request`.
+
+    - La selección es aleatoria ponderada por `ProxyStats.score`: los proxies rápidos y
+      con más éxitos reciben más peticiones, pero ninguno sano queda a cero.
+    - Tras `PROXY_EJECT_AFTER_FAILURES` fallos seguidos (errores de red o códigos de
+      bloqueo) el proxy se expulsa durante `PROXY_EJECT_SECONDS`, duplicando el tiempo
+      en cada expulsión consecutiva. Al vencer, vuelve como sondeo: un éxito lo rehabilita
+      y un fallo lo expulsa de nuevo.
+    """
+
+    def __init__(self, proxy_list: List[Dict[str, str]]):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, ProxyStats] = {}
+        for proxies in proxy_list:
+            self._stats_for(proxies)
+
+    @staticmethod
+    def _url(proxies: Dict[str, str]) -> str:
+        return proxies.get("https") or proxies.get("http") or ""
+
+    def _stats_for(self, proxies: Dict[str, str]) -> ProxyStats:
+        url = self._url(proxies)
+        stats = self._stats.get(url)
+        if stats is None:
+            stats = self._stats[url] = ProxyStats(url=url, proxies=proxies)
+        return stats
+
+    def select(self) -> Optional[Dict[str, str]]:
+        """
+        Elige un proxy entre los no expulsados. Si todos están expulsados, devuelve el
+        que antes vuelve a estar disponible (mejor un sondeo que la conexión directa).
+        """
+        with self._lock:
+            if not self._stats:
+                return None
+            now = time.monotonic()
+            available = [stats for stats in self._stats.values() if stats.ejected_until <= now]
+            if not available:
+                return min(self._stats.values(), key=lambda stats: stats.ejected_until).proxies
+            weights = [stats.score() for stats in available]
+            return random.choices(available, weights=weights, k=1)[0].proxies
+
+    def record(
+        self,
+        proxies: Optional[Dict[str, str]],
+        status_code: Optional[int] = None,
+        latency: Optional[float] = None
+    ) -> None:
+        """
+        Registra el resultado de una petición hecha con `proxies`.
+        `status_code` None significa error de red o timeout.
+        """
+        if not proxies:
+            return
+        with self._lock:
+            stats = self._stats_for(proxies)
+            # Un 404 también es una respuesta válida del proxy: la ruta funciona.
+            if status_code is not None and status_code in config.SUCCESS_CODES + config.NON_RETRYABLE_CODES:
+                stats.successes += 1
+                stats.consecutive_failures = 0
+                stats.ejections = 0
+                stats.ejected_until = 0.0
+                if latency is not None:
+                    stats.latencies.append(latency)
+                return
+
+            if status_code is not None and status_code in config.BLOCK_CODES:
+                stats.blocks += 1
+            else:
+                stats.failures += 1
+            stats.consecutive_failures += 1
+
+            # Un proxy que vuelve de una expulsión está en sondeo: basta un fallo para expulsarlo otra vez.
+            threshold = 1 if stats.ejections else config.PROXY_EJECT_AFTER_FAILURES
+            if stats.consecutive_failures >= threshold:
+                stats.ejections += 1
+                backoff = min(config.PROXY_EJECT_SECONDS * 2 ** (stats.ejections - 1), config.PROXY_EJECT_MAX_SECONDS)
+                stats.ejected_until = time.monotonic() + backoff
+                stats.consecutive_failures = 0
+                logger.warning(f"[PROXY] {_redact(stats.url)} expulsado {backoff:.0f}s tras fallos consecutivos (expulsión {stats.ejections}).")
+
+    def scores(self) -> List[dict]:
+        """Instantánea de la salud de cada proxy, del mejor al peor."""
+        now = time.monotonic()
+        with self._lock:
+            rows = []
+            for stats in self._stats.values():
+                latencies = list(stats.latencies)
+                p50, p95 = _percentile(latencies, 0.5), _percentile(latencies, 0.95)
+                rows.append({
+                    "proxy": _redact(stats.url),
+                    "score": round(stats.score(), 4),
+                    "requests": stats.total,
+                    "success_rate": round(stats.success_rate, 3),
+                    "block_rate": round(stats.block_rate, 3),
+                    "p50_latency": round(p50, 3) if p50 is not None else None,
+                    "p95_latency": round(p95, 3) if p95 is not None else None,
+                    "ejected": stats.ejected_until > now,
+                    "ejections": stats.ejections
+                })
+        return sorted(rows, key=lambda row: row["score"], reverse=True)
+
+    def export(self, path: str = config.PROXY_SCORES_PATH) -> None:
+        """Escribe `scores()` en un archivo JSON (escritura atómica)."""
+        rows = self.scores()
+        if not rows:
+            return
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"exported_at": time.time(), "proxies": rows}, f, indent=2)
+            os.replace(tmp_path, path)
+            logger.info(f"[PROXY] Puntuaciones de {len(rows)} proxies exportadas a {path}")
+        except OSError as e:
+            logger.error(f"[PROXY] No se pudieron exportar las puntuaciones: {e}")
@@ -1,9 +1,11 @@
 
-import random
 import requests
 import logging
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 from domain.interfaces.proxy_interface import ProxyProviderInterface
+from infrastructure.network.session_manager import session_manager
+from infrastructure.network.egress_identity_cache import egress_identity_cache
+from infrastructure.network.proxy_health import ProxyHealthPool
 from shared.config import config
 
 logger = logging.getLogger(__name__)
@@ -15,19 +17,26 @@ class ProxyProvider(ProxyProviderInterface):
     Soporta:
     - Proxy autenticado personalizado
     - Red TOR
-    - Lista rotativa de proxies
+    - Lista rotativa de proxies, ponderada por su salud (`ProxyHealthPool`)
     - Conexión directa (sin proxy)
     """
-    def __init__(self):
+    def __init__(self, proxy_list: Optional[List[Dict[str, str]]] = None):
+        """
+        Args:
+            proxy_list: Proxies de lista que puede usar este proveedor; por defecto
+                        `config.PROXY_LIST` (en modo --workers, el subconjunto del shard).
+        """
         self.current_proxy: Optional[Dict[str, str]] = None
+        self.proxy_list = (getattr(config, 'PROXY_LIST', None) or []) if proxy_list is None else proxy_list
+        self.health = ProxyHealthPool(self.proxy_list)
         
     def get_proxy(self) -> Optional[Dict[str, str]]:
         """
         Retorna la configuración de proxy a utilizar según la prioridad:
 
         1. Proxy autenticado (usuario/clave)
-        2. Red TOR
-        3. Proxy aleatorio desde lista
+        2. Proxy desde lista, ponderado por su salud
+        3. Red TOR
         4. Conexión directa (None)
 
         Returns:
@@ -42,13 +51,13 @@ class ProxyProvider(ProxyProviderInterface):
                 "http": f"http://{proxy_auth}",
                 "https": f"http://{proxy_auth}"
             }
+        elif self.proxy_list:
+            selected = self.health.select()
+            logger.info(f"[PROXY] Usando proxy de lista: {selected['http']}")
+            proxy_to_use = selected
         elif config.USE_TOR:
             logger.info(f"[PROXY] Usando red TOR: {config.TOR_PROXY}")
             proxy_to_use = config.TOR_PROXY
-        elif hasattr(config, 'PROXY_LIST') and config.PROXY_LIST:
-            selected = random.choice(config.PROXY_LIST)
-            logger.info(f"[PROXY] Usando proxy de lista: {selected['http']}")
-            proxy_to_use = selected
         else:
             logger.warning("[PROXY] No se encontró proxy configurado. Usando conexión directa.")
             proxy_to_use = None
@@ -57,18 +66,37 @@ class ProxyProvider(ProxyProviderInterface):
         
         return self.current_proxy
 
+    def report_result(
+        self,
+        proxy: Optional[Dict[str, str]],
+        status_code: Optional[int] = None,
+        latency: Optional[float] = None
+    ) -> None:
+        """Registra el resultado en `ProxyHealthPool` (también el del proxy autenticado, para exportarlo)."""
+        self.health.record(proxy, status_code, latency)
+
+    def export_scores(self, path: str = config.PROXY_SCORES_PATH) -> None:
+        """Exporta la salud de los proxies usados (éxito, bloqueos, p50/p95)."""
+        self.health.export(path)
+
     def get_proxy_location(self) -> tuple[str, str, str]:
         """
-        Consulta la IP pública, ciudad y país asociada al proxy proporcionado, usando el servicio ipinfo.io.
-
-        Args:
-            proxy (Optional[Dict[str, str]]): Proxy con el cual realizar la consulta.
+        Devuelve la IP pública, ciudad y país del proxy actual. La consulta a ipinfo.io
+        se hace una sola vez por ruta; las llamadas siguientes salen de la caché.
 
         Returns:
             tuple[str, str, str]: (IP pública, ciudad, país). Si hay error, retorna ('N/A', 'N/A', 'N/A').
         """
+        route = session_manager.route_key("proxy", self.current_proxy)
+        return egress_identity_cache.get_or_load(route, 0, self._lookup_proxy_location)
+
+    def _lookup_proxy_location(self) -> tuple[str, str, str]:
+        """
+        Consulta la IP pública, ciudad y país asociada al proxy actual, usando el servicio ipinfo.io.
+        """
         try:
-            resp = requests.get(config.URL_IPINFO, proxies=self.current_proxy, timeout=config.REQUEST_TIMEOUT)
+            session = session_manager.get_session(session_manager.route_key("proxy", self.current_proxy), self.current_proxy)
+            resp = session.get(config.URL_IPINFO, proxies=self.current_proxy, timeout=config.REQUEST_TIMEOUT)
             resp.raise_for_status()
 
             data = resp.json()
@@ -0,0 +1,246 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Deque, Iterator, Tuple
+
+from shared.config import config
+
+logger = logging.getLogger(__name__)
+
+
+def _wake(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class TokenBucketRateLimiter:
+    """
+    Token bucket compartido entre hilos: limita las peticiones por segundo hacia IMDb
+    permitiendo pequeñas ráfagas de hasta `burst` peticiones.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        """
+        Args:
+            rate (float): Tokens (peticiones) que se reponen por segundo.
+            burst (int): Capacidad máxima del bucket.
+        """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def set_rate(self, rate: float) -> None:
+        """Cambia la tasa de reposición (lo usa el controlador adaptativo)."""
+        with self._lock:
+            self._refill()
+            self.rate = rate
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def try_acquire(self) -> float:
+        """
+        Consume un token si hay uno disponible sin bloquear.
+
+        Returns:
+            float: 0 si se consumió el token; si no, segundos hasta que haya uno.
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self) -> None:
+        """Bloquea al hilo hasta que haya un token disponible y lo consume."""
+        while True:
+            wait = self.try_acquire()
+            if not wait:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """Como `acquire`, pero cede el event loop mientras espera."""
+        while True:
+            wait = self.try_acquire()
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+
+class AdaptiveConcurrencyController:
+    """
+    Controlador AIMD (Additive Increase / Multiplicative Decrease) de las peticiones salientes.
+
+    Ajusta dos límites compartidos por todos los hilos:
+    - Concurrencia: cuántas peticiones pueden estar en vuelo a la vez.
+    - Tasa: peticiones por segundo del `TokenBucketRateLimiter`.
+
+    Mientras las respuestas son 200 ambos crecen de forma lineal; ante códigos de
+    bloqueo o timeouts se reducen multiplicativamente (como mucho una vez por
+    `cooldown` segundos, para que una ráfaga de bloqueos no los hunda al mínimo).
+    """
+
+    def __init__(
+        self,
+        rate_limiter: TokenBucketRateLimiter,
+        initial_concurrency: int = config.AIMD_INITIAL_CONCURRENCY,
+        min_concurrency: int = config.AIMD_MIN_CONCURRENCY,
+        max_concurrency: int = config.AIMD_MAX_CONCURRENCY,
+        min_rate: float = config.RATE_LIMIT_MIN_RPS,
+        max_rate: float = config.RATE_LIMIT_MAX_RPS,
+        rate_step: float = config.AIMD_RATE_STEP,
+        decrease_factor: float = config.AIMD_DECREASE_FACTOR,
+        cooldown: float = config.AIMD_COOLDOWN_SECONDS
+    ):
+        self.rate_limiter = rate_limiter
+        self.limit = initial_concurrency
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.rate_step = rate_step
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+
+        self.in_flight = 0
+        self.successes = 0
+        self.blocks = 0
+        self.failures = 0
+        self._successes_since_increase = 0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+        # Corrutinas esperando hueco: no pueden bloquearse en la Condition sin parar el
+        # event loop, así que esperan un future que `_notify_locked` resuelve en su loop.
+        self._async_waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """
+        Reserva un hueco de concurrencia y un token de tasa antes de una petición.
+        Los hilos que superan el límite actual esperan aquí sin consumir red.
+        """
+        with self._condition:
+            while self.in_flight >= self.limit:
+                self._condition.wait()
+            self.in_flight += 1
+        try:
+            self.rate_limiter.acquire()
+            yield
+        finally:
+            self._release()
+
+    @asynccontextmanager
+    async def async_slot(self) -> AsyncIterator[None]:
+        """
+        Equivalente de `slot` para corrutinas (motor async): comparte los mismos límites
+        que los hilos, pero espera un aviso de `_release` sin bloquear el event loop.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._condition:
+                if self.in_flight < self.limit:
+                    self.in_flight += 1
+                    break
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                with self._condition:
+                    try:
+                        self._async_waiters.remove((loop, waiter))
+                    except ValueError:
+                        # Ya había recibido el aviso: se pasa a otro para no perder el hueco.
+                        self._notify_locked()
+                raise
+        try:
+            await self.rate_limiter.acquire_async()
+            yield
+        finally:
+            self._release()
+
+    def _notify_locked(self) -> None:
+        """
+        Avisa de un hueco libre a un hilo y a una corrutina en espera (el que llegue
+        tarde vuelve a esperar). Se llama con `_condition` adquirida.
+        """
+        self._condition.notify()
+        if self._async_waiters:
+            loop, waiter = self._async_waiters.popleft()
+            loop.call_soon_threadsafe(_wake, waiter)
+
+    def _release(self) -> None:
+        with self._condition:
+            self.in_flight -= 1
+            self._notify_locked()
+
+    def record_success(self) -> None:
+        """Incremento aditivo: +1 de concurrencia y +rate_step de tasa por cada 'ventana' de éxitos."""
+        with self._condition:
+            self.successes += 1
+            self._successes_since_increase += 1
+            if self._successes_since_increase < self.limit:
+                return
+            self._successes_since_increase = 0
+            if self.limit < self.max_concurrency:
+                self.limit += 1
+                self._notify_locked()
+            new_rate = min(self.max_rate, self.rate_limiter.rate + self.rate_step)
+        self.rate_limiter.set_rate(new_rate)
+
+    def record_block(self) -> None:
+        """Registra un código de bloqueo (429/403...) y reduce los límites."""
+        with self._condition:
+            self.blocks += 1
+        self._decrease("bloqueo")
+
+    def record_failure(self) -> None:
+        """Registra un timeout o error de red y reduce los límites."""
+        with self._condition:
+            self.failures += 1
+        self._decrease("timeout/error de red")
+
+    def record_status(self, status_code: int) -> None:
+        """Clasifica un código HTTP y actualiza el controlador."""
+        if status_code in config.SUCCESS_CODES:
+            self.record_success()
+        elif status_code in config.AIMD_BACKOFF_CODES:
+            self.record_block()
+
+    def _decrease(self, reason: str) -> None:
+        now = time.monotonic()
+        with self._condition:
+            if now - self._last_decrease < self.cooldown:
+                return
+            self._last_decrease = now
+            self._successes_since_increase = 0
+            self.limit = max(self.min_concurrency, int(self.limit * self.decrease_factor))
+            new_rate = max(self.min_rate, self.rate_limiter.rate * self.decrease_factor)
+            limit = self.limit
+        self.rate_limiter.set_rate(new_rate)
+        logger.warning(f"[THROTTLE] Reducción por {reason}: concurrencia={limit}, tasa={new_rate:.2f} req/s")
+
+    def stats(self) -> dict:
+        """Resumen del estado actual del controlador (para logs)."""
+        return {
+            "concurrency_limit": self.limit,
+            "rate_rps": round(self.rate_limiter.rate, 2),
+            "successes": self.successes,
+            "blocks": self.blocks,
+            "failures": self.failures,
+        }
+
+
+# Instancia compartida por todo el proceso: todas las peticiones a IMDb pasan por aquí.
+outbound_throttle = AdaptiveConcurrencyController(
+    TokenBucketRateLimiter(rate=config.RATE_LIMIT_INITIAL_RPS, burst=config.RATE_LIMIT_BURST)
+)
@@ -0,0 +1,92 @@
+import logging
+import threading
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from shared.config import config
+
+logger = logging.getLogger(__name__)
+
+
+class SessionManager:
+    """
+    Mantiene una `requests.Session` con pool de conexiones keep-alive por cada ruta
+    de salida (proxy, TOR o conexión directa).
+
+    Reutilizar la sesión evita repetir el handshake TCP+TLS (y la negociación SOCKS
+    en TOR) en cada petición. Las sesiones se comparten entre los hilos del scraper.
+    """
+
+    def __init__(self, pool_size: int = config.HTTP_POOL_SIZE):
+        """
+        Args:
+            pool_size (int): Conexiones máximas por host dentro de cada ruta.
+                             Debe acompañar a MAX_THREADS para que ningún hilo espere un socket.
+        """
+        self.pool_size = pool_size
+        self._sessions: Dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def route_key(strategy: str, proxies: Optional[Dict[str, str]]) -> str:
+        """Identificador de la ruta de salida: estrategia + URL del proxy usado."""
+        if not proxies:
+            return "direct"
+        return f"{strategy}:{proxies.get('https') or proxies.get('http')}"
+
+    def _build_session(self, proxies: Optional[Dict[str, str]]) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=config.HTTP_POOL_HOSTS,
+            pool_maxsize=self.pool_size
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        if proxies:
+            session.proxies.update(proxies)
+        return session
+
+    def get_session(self, route: str, proxies: Optional[Dict[str, str]] = None) -> requests.Session:
+        """
+        Devuelve la sesión asociada a la ruta, creándola la primera vez.
+
+        Args:
+            route (str): Clave de la ruta (ver `route_key`).
+            proxies (Optional[Dict[str, str]]): Proxies que usará la sesión si se crea.
+        """
+        session = self._sessions.get(route)
+        if session is not None:
+            return session
+        with self._lock:
+            session = self._sessions.get(route)
+            if session is None:
+                session = self._build_session(proxies)
+                self._sessions[route] = session
+                logger.info(f"[HTTP] Pool de conexiones creado para la ruta '{route}' (tamaño {self.pool_size}).")
+            return session
+
+    def reset(self, prefix: str) -> None:
+        """
+        Descarta las sesiones cuyas rutas empiezan por `prefix`.
+        Se usa tras rotar el circuito de TOR: las conexiones keep-alive seguirían
+        saliendo por el circuito anterior.
+        """
+        with self._lock:
+            routes = [route for route in self._sessions if route.startswith(prefix)]
+            for route in routes:
+                self._sessions.pop(route).close()
+        if routes:
+            logger.info(f"[HTTP] Pools reconstruidos para las rutas: {', '.join(routes)}")
+
+    def close_all(self) -> None:
+        """Cierra todas las sesiones abiertas."""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+# Instancia compartida por todo el proceso, igual que el pool de PostgreSQL.
+session_manager = SessionManager()
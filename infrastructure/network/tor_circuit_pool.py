@@ -0,0 +1,212 @@
+import logging
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+from domain.interfaces.tor_interface import TorInterface
+from infrastructure.network.session_manager import session_manager
+from infrastructure.network.egress_identity_cache import egress_identity_cache, EgressIdentity
+from shared.config import config
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TorCircuit:
+    """Un circuito del pool: sus credenciales SOCKS son `[namespace]circuit-<index>:<generation>`."""
+    index: int
+    generation: int = 0
+    requests: int = 0
+    healthy: bool = True
+
+
+class TorCircuitPool(TorInterface):
+    """
+    Pool de circuitos TOR simultáneos sobre una sola instancia de TOR.
+
+    Con `IsolateSOCKSAuth` (activo por defecto en el SocksPort), TOR usa un circuito
+    distinto para cada par usuario/contraseña SOCKS. Cada circuito del pool sale por
+    `socks5h://circuit-<i>:<generación>@tor:9050`, y las peticiones se reparten en
+    round-robin entre los circuitos sanos.
+
+    Rotar un circuito no necesita NEWNYM (que renovaría todos a la vez): basta con
+    avanzar su generación para que las nuevas credenciales abran un circuito nuevo.
+    La rotación se hace en un hilo de fondo que verifica la nueva IP de salida; mientras
+    tanto, el circuito queda fuera del reparto y los demás siguen sirviendo.
+    """
+
+    def __init__(
+        self,
+        size: int = config.TOR_CIRCUIT_POOL_SIZE,
+        host: str = config.TOR_HOST,
+        port: int = config.TOR_PROXY_PORT,
+        namespace: str = ""
+    ):
+        """
+        Args:
+            namespace: Prefijo del usuario SOCKS; procesos distintos (modo --workers) usan
+                       prefijos distintos para no compartir circuitos.
+        """
+        self.namespace = namespace
+        self.host = host
+        self.port = port
+        self.max_retries = config.MAX_RETRIES
+        self.wait_time = config.TOR_WAIT_AFTER_ROTATION
+        self.requests_per_circuit = config.TOR_REQUESTS_PER_CIRCUIT
+        self.circuits: List[TorCircuit] = [TorCircuit(index=i) for i in range(max(1, size))]
+        self._cond = threading.Condition()
+        self._next = 0
+        self._local = threading.local()
+        self._rotations: "queue.Queue[TorCircuit]" = queue.Queue()
+        self._rotator_thread: Optional[threading.Thread] = None
+
+    def _proxy_url(self, circuit: TorCircuit) -> str:
+        return f"socks5h://{self.namespace}circuit-{circuit.index}:{circuit.generation}@{self.host}:{self.port}"
+
+    def _proxies(self, circuit: TorCircuit) -> Dict[str, str]:
+        url = self._proxy_url(circuit)
+        return {"http": url, "https": url}
+
+    def get_proxies(self) -> Dict[str, str]:
+        """
+        Asigna la petición al siguiente circuito sano. Si todos están rotando, espera
+        hasta `TOR_WAIT_AFTER_ROTATION` segundos a que vuelva alguno; pasado ese tiempo
+        usa cualquiera antes que detener el scraping.
+        """
+        with self._cond:
+            if not any(circuit.healthy for circuit in self.circuits):
+                self._cond.wait_for(lambda: any(c.healthy for c in self.circuits), timeout=self.wait_time)
+            candidates = [circuit for circuit in self.circuits if circuit.healthy] or self.circuits
+            circuit = candidates[self._next % len(candidates)]
+            self._next += 1
+
+            proxies = self._proxies(circuit)
+            circuit.requests += 1
+            if self.requests_per_circuit and circuit.requests >= self.requests_per_circuit and circuit.healthy:
+                logger.info(f"[TOR] Circuito {circuit.index}: presupuesto de {self.requests_per_circuit} peticiones agotado.")
+                self._schedule_locked(circuit)
+
+        self._local.circuit = (circuit, proxies)
+        return proxies
+
+    def register_request(self) -> bool:
+        """El presupuesto por circuito se contabiliza en `get_proxies` y rota en segundo plano."""
+        return False
+
+    def report_block(self, proxies: Dict[str, str]) -> None:
+        """
+        Saca del reparto el circuito bloqueado y encola su rotación. No bloquea: el
+        reintento sale de inmediato por otro circuito.
+        """
+        circuit = self._circuit_for(proxies)
+        if circuit is None:
+            return
+        with self._cond:
+            if circuit.healthy:
+                logger.warning(f"[TOR] Circuito {circuit.index} bloqueado. Rotándolo en segundo plano...")
+                self._schedule_locked(circuit)
+
+    def _circuit_for(self, proxies: Dict[str, str]) -> Optional[TorCircuit]:
+        """
+        Circuito al que pertenecen unos proxies, o None si ya no es la generación
+        vigente (otro hilo ya lo rotó).
+        """
+        parts = urlsplit((proxies or {}).get("https", ""))
+        try:
+            index = int((parts.username or "").rsplit("-", 1)[-1])
+            generation = int(parts.password or "")
+        except ValueError:
+            return None
+        if not 0 <= index < len(self.circuits):
+            return None
+        circuit = self.circuits[index]
+        return circuit if circuit.generation == generation else None
+
+    def _schedule_locked(self, circuit: TorCircuit) -> None:
+        circuit.healthy = False
+        self._rotations.put(circuit)
+        if self._rotator_thread is None or not self._rotator_thread.is_alive():
+            self._rotator_thread = threading.Thread(target=self._rotation_loop, name="tor-circuit-rotator", daemon=True)
+            self._rotator_thread.start()
+
+    def _rotation_loop(self) -> None:
+        while True:
+            circuit = self._rotations.get()
+            try:
+                self._rotate(circuit)
+            except Exception as e:
+                logger.error(f"[TOR] Error rotando el circuito {circuit.index}: {e}")
+                with self._cond:
+                    circuit.healthy = True
+                    self._cond.notify_all()
+
+    def _rotate(self, circuit: TorCircuit) -> str:
+        """
+        Renueva las credenciales del circuito hasta obtener una IP de salida distinta
+        (TOR puede elegir el mismo nodo de salida para el circuito nuevo).
+        """
+        old_route = session_manager.route_key("tor", self._proxies(circuit))
+        original_ip = (egress_identity_cache.get(old_route, circuit.generation) or ("",))[0]
+        new_ip = ""
+
+        for attempt in range(1, self.max_retries + 1):
+            with self._cond:
+                circuit.generation += 1
+                circuit.requests = 0
+                proxies = self._proxies(circuit)
+            # Las conexiones keep-alive del circuito anterior seguirían saliendo por él.
+            session_manager.reset(old_route)
+            egress_identity_cache.invalidate(old_route)
+
+            route = session_manager.route_key("tor", proxies)
+            identity = self._lookup_identity(route, proxies)
+            egress_identity_cache.put(route, circuit.generation, identity)
+            new_ip = identity[0]
+            if not new_ip or new_ip != original_ip:
+                break
+            logger.warning(f"[TOR] Circuito {circuit.index}: la IP no cambió ({new_ip}), intento {attempt}/{self.max_retries}.")
+            old_route = route
+
+        with self._cond:
+            circuit.healthy = True
+            self._cond.notify_all()
+        logger.info(f"[TOR] Circuito {circuit.index} rotado (generación {circuit.generation}): {original_ip or '?'} → {new_ip or '?'}")
+        return new_ip
+
+    def _lookup_identity(self, route: str, proxies: Dict[str, str]) -> EgressIdentity:
+        """Consulta a ipinfo.io la identidad de salida de un circuito (y de paso lo establece)."""
+        try:
+            session = session_manager.get_session(route, proxies)
+            response = session.get(config.URL_IPINFO, timeout=config.REQUEST_TIMEOUT)
+            response.raise_for_status()
+            data = response.json()
+            return data.get("ip", ""), data.get("city", "N/A"), data.get("country", "N/A")
+        except requests.RequestException as e:
+            logger.warning(f"[TOR] No se pudo obtener la IP del circuito: {e}")
+            return "", "N/A", "N/A"
+
+    def _current(self):
+        """Circuito y proxies asignados por última vez al hilo que llama."""
+        current = getattr(self._local, "circuit", None)
+        if current is None:
+            circuit = self.circuits[0]
+            current = (circuit, self._proxies(circuit))
+        return current
+
+    def get_current_ip(self) -> str:
+        """IP de salida del circuito asignado al hilo; una consulta a ipinfo.io por generación."""
+        _, proxies = self._current()
+        route = session_manager.route_key("tor", proxies)
+        generation = int(urlsplit(proxies["https"]).password)
+        return egress_identity_cache.get_or_load(route, generation, lambda: self._lookup_identity(route, proxies))[0]
+
+    def rotate_ip(self) -> str:
+        """Rota de forma síncrona el circuito asignado al hilo y devuelve su nueva IP."""
+        circuit, _ = self._current()
+        with self._cond:
+            circuit.healthy = False
+        return self._rotate(circuit)
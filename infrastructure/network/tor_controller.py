@@ -0,0 +1,104 @@
+import logging
+import socket
+import threading
+import time
+from typing import Optional, Set
+
+import stem
+from stem import CircStatus, Signal
+from stem.control import Controller, EventType, State
+
+from shared.config import config
+
+logger = logging.getLogger(__name__)
+
+
+class TorControlSession:
+    """
+    Conexión persistente al puerto de control de TOR.
+
+    Se conecta y autentica una sola vez y se reconecta sola si TOR cierra el socket.
+    Escucha los eventos `SIGNAL` (confirmación de NEWNYM) y `CIRC` (circuitos
+    construidos), de modo que tras un NEWNYM se espera a que TOR construya un circuito
+    que no existía al enviar la señal, y no un tiempo fijo.
+
+    El evento indica que TOR ya tiene circuitos nuevos, no que las peticiones vayan a
+    salir por ese circuito en concreto: la IP de salida la verifica `TorRotator` aparte.
+    """
+
+    def __init__(self, host: str = config.TOR_HOST, port: int = config.TOR_CONTROL_PORT):
+        self.host = host
+        self.port = port
+        self._controller: Optional[Controller] = None
+        self._lock = threading.Lock()
+        # IDs de los circuitos que existían al enviar el último NEWNYM (None: aún no se envió).
+        self._circuits_before: Optional[Set[str]] = None
+        self._circuit_built = threading.Event()
+
+    def _connect_locked(self) -> Controller:
+        if self._controller is not None and self._controller.is_alive():
+            return self._controller
+
+        tor_ip = socket.gethostbyname(self.host)
+        logger.info(f"[TOR] Conectando al puerto de control en {self.host} ({tor_ip}:{self.port})...")
+        controller = Controller.from_port(address=tor_ip, port=self.port)
+        controller.authenticate()  # Sin contraseña, como se configura en Docker.
+        controller.add_event_listener(self._on_event, EventType.CIRC, EventType.SIGNAL)
+        controller.add_status_listener(self._on_status)
+        self._controller = controller
+        return controller
+
+    def _on_status(self, controller: Controller, state: State, timestamp: float) -> None:
+        if state == State.CLOSED:
+            logger.warning("[TOR] Conexión de control cerrada; se reconectará en la próxima rotación.")
+            with self._lock:
+                if self._controller is controller:
+                    self._controller = None
+
+    def _on_event(self, event) -> None:
+        if event.type == "SIGNAL" and event.signal == Signal.NEWNYM:
+            logger.info("[TOR] NEWNYM confirmado por TOR.")
+        elif event.type == "CIRC" and event.status == CircStatus.BUILT and event.purpose == "GENERAL":
+            # Solo cuentan los circuitos creados después de la señal: uno que ya existía
+            # (o se estaba construyendo) al enviar NEWNYM es de la identidad anterior.
+            circuits_before = self._circuits_before
+            if circuits_before is not None and event.id not in circuits_before:
+                self._circuit_built.set()
+
+    def newnym(self) -> bool:
+        """
+        Envía NEWNYM respetando el límite de frecuencia de TOR (`get_newnym_wait`).
+        Si la conexión se había caído, reconecta y reintenta una vez.
+        """
+        for attempt in (1, 2):
+            try:
+                with self._lock:
+                    controller = self._connect_locked()
+                wait = controller.get_newnym_wait()
+                if wait > 0:
+                    logger.info(f"[TOR] TOR limita NEWNYM: esperando {wait:.1f}s.")
+                    time.sleep(wait)
+                self._circuit_built.clear()
+                self._circuits_before = {circuit.id for circuit in controller.get_circuits()}
+                controller.signal(Signal.NEWNYM)
+                return True
+            except (stem.SocketError, stem.ControllerError, OSError) as e:
+                logger.error(f"[TOR] Error en el puerto de control (intento {attempt}/2): {e}")
+                self.close()
+        return False
+
+    def wait_for_circuit(self, timeout: float) -> bool:
+        """Espera a que TOR construya un circuito creado tras el último NEWNYM (como mucho `timeout` s)."""
+        built = self._circuit_built.wait(timeout)
+        if not built:
+            logger.warning(f"[TOR] Sin evento de circuito construido en {timeout}s; se continúa igualmente.")
+        return built
+
+    def close(self) -> None:
+        with self._lock:
+            if self._controller is not None:
+                try:
+                    self._controller.close()
+                except Exception:
+                    pass
+                self._controller = None
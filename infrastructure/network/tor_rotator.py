@@ -1,9 +1,12 @@
-import socket
-import time
+import threading
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
 import requests
-from stem import Signal
-from stem.control import Controller
 from domain.interfaces.tor_interface import TorInterface
+from infrastructure.network.tor_controller import TorControlSession
+from infrastructure.network.session_manager import session_manager
+from infrastructure.network.egress_identity_cache import egress_identity_cache, EgressIdentity
 from shared.config import config
 from shared.logger.logging_config import setup_logger
 import logging # Importar logging si no está ya
@@ -14,51 +17,163 @@ class TorRotator(TorInterface):
     """
     Implementación de la interfaz TorInterface que permite rotar la IP de salida
     mediante la red TOR usando el puerto de control y el protocolo `stem`.
+
+    Todas las peticiones comparten un único circuito. Las rotaciones se coordinan: de
+    las peticiones de rotación concurrentes para una misma generación solo una envía
+    NEWNYM, y el resto de hilos espera a un evento en lugar de dormir cada uno por su cuenta.
     """
 
-    def __init__(self):
+    def __init__(self, namespace: str = ""):
         """
         Constructor del rotador de IP TOR.
         Lee la configuración desde el objeto 'config' centralizado.
+
+        Args:
+            namespace: Prefijo del usuario SOCKS; en modo --workers cada proceso usa el
+                       suyo para salir por un circuito propio.
         """
+        self.namespace = namespace
         self.control_port = config.TOR_CONTROL_PORT
+        # Conexión de control persistente (se abre en la primera rotación).
+        self.control = TorControlSession(config.TOR_HOST, self.control_port)
         self.wait_time = config.TOR_WAIT_AFTER_ROTATION
         self.max_retries = config.MAX_RETRIES
-        self.proxy = config.TOR_PROXY
         self.host = config.TOR_HOST
+        self.proxy_port = config.TOR_PROXY_PORT
+        self.requests_per_circuit = config.TOR_REQUESTS_PER_CIRCUIT
+        # Generación del circuito: avanza con cada NEWNYM enviado.
+        self.generation = 0
+        self._requests_in_circuit = 0
+        self._counter_lock = threading.Lock()
+        # Evento "circuito listo": se limpia mientras una rotación está en curso.
+        self._ready = threading.Event()
+        self._ready.set()
+        self._rotating = False
 
-    def get_current_ip(self) -> str:
+    def _proxies_for(self, generation: int) -> Dict[str, str]:
+        """
+        Proxies de una generación. La generación viaja como contraseña SOCKS para que
+        `report_block` sepa a qué circuito se refiere un bloqueo.
+        """
+        url = f"socks5h://{self.namespace}rotator:{generation}@{self.host}:{self.proxy_port}"
+        return {"http": url, "https": url}
+
+    @property
+    def proxy(self) -> Dict[str, str]:
+        return self._proxies_for(self.generation)
+
+    @property
+    def route(self) -> str:
+        return session_manager.route_key("tor", self.proxy)
+
+    def _lookup_identity(self) -> EgressIdentity:
         """
-        Consulta la IP pública actual a través de la red TOR.
+        Consulta a ipinfo.io la IP pública, ciudad y país de la salida TOR actual.
         """
         try:
-            response = requests.get(config.URL_IPINFO, proxies=self.proxy, timeout=10)
+            session = session_manager.get_session(self.route, self.proxy)
+            response = session.get(config.URL_IPINFO, timeout=10)
             response.raise_for_status()
-            return response.json().get("ip", "")
+            data = response.json()
+            return data.get("ip", ""), data.get("city", "N/A"), data.get("country", "N/A")
         except requests.RequestException as e:
             logger.warning(f"[TOR] No se pudo obtener la IP actual: {e}")
-            return ""
+            return "", "N/A", "N/A"
 
-    def _send_newnym(self) -> bool:
+    def get_current_ip(self) -> str:
+        """
+        Devuelve la IP pública actual de TOR. Solo consulta ipinfo.io una vez por
+        generación de circuito; el resto de llamadas sale de la caché.
+        """
+        return egress_identity_cache.get_or_load(self.route, self.generation, self._lookup_identity)[0]
+
+    def register_request(self) -> bool:
+        """
+        Cuenta una petición en el circuito actual. Devuelve True (a un único hilo)
+        cuando se agota el presupuesto `TOR_REQUESTS_PER_CIRCUIT`.
+        """
+        if not self.requests_per_circuit:
+            return False
+        with self._counter_lock:
+            self._requests_in_circuit += 1
+            return self._requests_in_circuit == self.requests_per_circuit
+
+    def get_proxies(self) -> dict:
         """
-        Envía una señal NEWNYM al controlador de TOR para solicitar una nueva IP.
+        Un único circuito: todas las peticiones comparten el mismo proxy SOCKS.
+        Si hay una rotación en curso, espera a que termine en lugar de salir por el
+        circuito que se está descartando.
         """
+        self._ready.wait(timeout=self._rotation_timeout())
+        return self.proxy
+
+    def report_block(self, proxies: dict) -> None:
+        """Pide la rotación del circuito con el que se hizo la petición bloqueada."""
+        self._request_rotation(self._generation_of(proxies))
+
+    def _generation_of(self, proxies: Optional[dict]) -> Optional[int]:
         try:
-            tor_ip = socket.gethostbyname(self.host)
-            logger.info(f"[TOR] Intentando conectar al puerto de control en {self.host} ({tor_ip}:{self.control_port})...")           
-         
-            # Se especifica la dirección (address) del contenedor de TOR.
-            with Controller.from_port(address=tor_ip , port=self.control_port) as controller:
-                controller.authenticate()  # Asume que no hay contraseña, como configuramos en Docker.
-                controller.signal(Signal.NEWNYM)
-            
-            return True
-        except Exception as e:
-            # Captura errores de conexión (ej. Connection refused)
-            logger.error(f"[TOR] No se pudo conectar al puerto de control de TOR: {e}", exc_info=False)
+            return int(urlsplit((proxies or {}).get("https", "")).password or "")
+        except ValueError:
+            return None
+
+    def _rotation_timeout(self) -> float:
+        """Lo máximo que puede durar una rotación completa (todos sus reintentos)."""
+        return (self.wait_time + 10) * self.max_retries
+
+    def _request_rotation(self, generation: Optional[int]) -> None:
+        """
+        Coordinador de rotaciones: si el circuito de `generation` sigue vigente y nadie
+        lo está rotando, este hilo envía NEWNYM; si no, espera a que termine la rotación
+        en curso. Un bloqueo de una generación ya rotada se descarta.
+        """
+        with self._counter_lock:
+            stale = generation is not None and generation != self.generation
+            leader = not stale and not self._rotating
+            if leader:
+                self._rotating = True
+                self._ready.clear()
+
+        if leader:
+            try:
+                self._rotate()
+            finally:
+                with self._counter_lock:
+                    self._rotating = False
+                self._ready.set()
+        elif not stale:
+            logger.info("[TOR] Rotación ya en curso; esperando a que termine.")
+            self._ready.wait(timeout=self._rotation_timeout())
+
+    def _send_newnym(self) -> bool:
+        """
+        Envía una señal NEWNYM por la conexión de control persistente.
+        """
+        if not self.control.newnym():
             return False
 
+        # Nuevo circuito: la identidad cacheada y las conexiones keep-alive quedan obsoletas.
+        old_route = self.route
+        with self._counter_lock:
+            self.generation += 1
+            self._requests_in_circuit = 0
+        egress_identity_cache.invalidate(old_route)
+        session_manager.reset("tor")
+        return True
+
+    def close(self) -> None:
+        """Cierra la conexión con el puerto de control."""
+        self.control.close()
+
     def rotate_ip(self) -> str:
+        """
+        Rota la IP de TOR a través del coordinador (una sola rotación aunque la pidan
+        varios hilos a la vez) y devuelve la IP resultante.
+        """
+        self._request_rotation(self.generation)
+        return self.get_current_ip()
+
+    def _rotate(self) -> str:
         """
         Intenta rotar la IP de TOR, reintentando si la nueva IP es la misma que la original.
         """
@@ -74,9 +189,13 @@ class TorRotator(TorInterface):
                 # Si no se puede conectar al control port, no tiene sentido seguir intentando.
                 return original_ip
 
-            time.sleep(self.wait_time)
-            new_ip = self.get_current_ip()
-            
+            # Espera al evento CIRC BUILT; `wait_time` es solo el tope si no llega.
+            self.control.wait_for_circuit(self.wait_time)
+            # Consulta directa (no caché): es la verificación que llena la caché de esta generación.
+            identity = self._lookup_identity()
+            egress_identity_cache.put(self.route, self.generation, identity)
+            new_ip = identity[0]
+
             if new_ip and new_ip != original_ip:
                 logger.info(f"[TOR] Rotación exitosa: {original_ip} → {new_ip}")
                 return new_ip
@@ -84,4 +203,4 @@ class TorRotator(TorInterface):
                 logger.warning(f"[TOR] La IP no cambió. Nueva IP obtenida: {new_ip}")
 
         logger.warning("[TOR] No se logró rotar la IP después de todos los intentos.")
-        return original_ip
\ No newline at end of file
+        return original_ip
@@ -0,0 +1,190 @@
+import csv
+import io
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from shared.config import config
+
+logger = logging.getLogger(__name__)
+
+
+def _csv_row(row: Iterable) -> List[str]:
+    """Fila tal como la leería `csv.reader` (None → vacío)."""
+    return ["" if value is None else str(value) for value in row]
+
+
+def replace_csv_rows(path: str, replacements: Dict[str, List[List[str]]]) -> None:
+    """
+    Reescribe un CSV sustituyendo las filas de cada clave (primera columna) por las de
+    `replacements`, en la posición de la primera fila con esa clave (o al final si no
+    había ninguna). La escritura es atómica: archivo temporal + os.replace.
+    """
+    if not replacements:
+        return
+    tmp_path = f"{path}.tmp"
+    emitted = set()
+    with open(path, "r", newline="", encoding="utf-8") as src, \
+         open(tmp_path, "w", newline="", encoding="utf-8") as dst:
+        reader = csv.reader(src)
+        writer = csv.writer(dst)
+        header = next(reader, None)
+        if header is not None:
+            writer.writerow(header)
+        for row in reader:
+            key = row[0] if row else ""
+            if key not in replacements:
+                writer.writerow(row)
+            elif key not in emitted:
+                emitted.add(key)
+                writer.writerows(replacements[key])
+        for key, rows in replacements.items():
+            if key not in emitted:
+                writer.writerows(rows)
+    os.replace(tmp_path, path)
+
+
+class BufferedCsvWriter:
+    """
+    Escritor CSV que mantiene el archivo abierto y acumula filas en memoria.
+
+    Vuelca el buffer al disco cuando supera `flush_rows` filas o `flush_bytes` bytes,
+    cuando lo pide el `CsvSink` por tiempo, y al cerrar. Así una película ya no
+    cuesta un open/write/close por archivo.
+
+    Las actualizaciones (`replace_rows`) también se añaden al final, para que no se
+    pierdan si el proceso muere; al cerrar, el archivo se compacta y cada clave
+    reemplazada queda solo con sus filas nuevas, en su posición original. Si el
+    proceso muere antes, ambas versiones quedan en el archivo y la vigente es la última.
+    """
+
+    def __init__(self, path: str, headers: List[str], flush_rows: int, flush_bytes: int):
+        self.path = path
+        self.flush_rows = flush_rows
+        self.flush_bytes = flush_bytes
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+        self._pending_rows = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._replacements: Dict[str, List[List[str]]] = {}
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file = open(path, "a", newline="", encoding="utf-8")
+        if is_new:
+            csv.writer(self._file).writerow(headers)
+            self._file.flush()
+
+    def writerow(self, row: Iterable) -> None:
+        self.writerows([row])
+
+    def writerows(self, rows: Iterable[Iterable]) -> None:
+        with self._lock:
+            for row in rows:
+                self._writer.writerow(row)
+                self._pending_rows += 1
+            if self._pending_rows >= self.flush_rows or self._buffer.tell() >= self.flush_bytes:
+                self._flush_locked()
+
+    def replace_rows(self, replacements: Dict[object, List[Iterable]]) -> None:
+        """
+        Sustituye todas las filas de cada clave (valor de la primera columna) por las
+        indicadas. Una clave con lista vacía se elimina del archivo al compactar.
+        """
+        with self._lock:
+            for key, rows in replacements.items():
+                rows = [_csv_row(row) for row in rows]
+                self._replacements[str(key)] = rows
+                self._writer.writerows(rows)
+                self._pending_rows += len(rows)
+            if self._pending_rows >= self.flush_rows or self._buffer.tell() >= self.flush_bytes:
+                self._flush_locked()
+
+    def flush(self, older_than: Optional[float] = None) -> None:
+        """
+        Vuelca el buffer al archivo.
+
+        Args:
+            older_than (Optional[float]): Si se indica, solo vuelca cuando el último
+                                          volcado tiene más de esos segundos.
+        """
+        with self._lock:
+            if older_than is not None and time.monotonic() - self._last_flush < older_than:
+                return
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        self._last_flush = time.monotonic()
+        if not self._pending_rows:
+            return
+        self._file.write(self._buffer.getvalue())
+        self._file.flush()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        self._pending_rows = 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file.closed:
+                return
+            self._flush_locked()
+            self._file.close()
+            if self._replacements:
+                replace_csv_rows(self.path, self._replacements)
+                logger.info(f"[CSV] {self.path} compactado: {len(self._replacements)} claves actualizadas.")
+                self._replacements = {}
+
+
+class CsvSink:
+    """
+    Agrupa los escritores de los tres CSV (películas, actores y relaciones) y un hilo
+    que vuelca periódicamente los buffers cada `flush_interval` segundos.
+    """
+
+    def __init__(
+        self,
+        movies_path: str,
+        actors_path: str,
+        movie_actor_path: str,
+        movie_headers: List[str],
+        actor_headers: List[str],
+        movie_actor_headers: List[str],
+        flush_rows: int = config.CSV_FLUSH_ROWS,
+        flush_bytes: int = config.CSV_FLUSH_BYTES,
+        flush_interval: float = config.CSV_FLUSH_INTERVAL
+    ):
+        self.movies = BufferedCsvWriter(movies_path, movie_headers, flush_rows, flush_bytes)
+        self.actors = BufferedCsvWriter(actors_path, actor_headers, flush_rows, flush_bytes)
+        self.movie_actors = BufferedCsvWriter(movie_actor_path, movie_actor_headers, flush_rows, flush_bytes)
+        self.flush_interval = flush_interval
+
+        self._stop = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_periodically, name="csv-flusher", daemon=True)
+        self._flusher.start()
+
+    @property
+    def writers(self) -> List[BufferedCsvWriter]:
+        return [self.movies, self.actors, self.movie_actors]
+
+    def _flush_periodically(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            for writer in self.writers:
+                try:
+                    writer.flush(older_than=self.flush_interval)
+                except OSError as e:
+                    logger.error(f"[CSV] Error al volcar {writer.path}: {e}")
+
+    def flush(self) -> None:
+        for writer in self.writers:
+            writer.flush()
+
+    def close(self) -> None:
+        """Detiene el volcado periódico y cierra los archivos volcando lo pendiente."""
+        self._stop.set()
+        self._flusher.join()
+        for writer in self.writers:
+            writer.close()
+        logger.info("[CSV] Buffers volcados y archivos cerrados.")
@@ -0,0 +1,87 @@
+import csv
+import os
+import threading
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+
+class CsvIndex:
+    """
+    Índice en memoria de un archivo CSV: clave → fila, más el ID máximo asignado.
+
+    El archivo se lee una sola vez; después las búsquedas son O(1) y los repositorios
+    mantienen el índice al día registrando cada fila que añaden con `add`.
+    No es thread-safe por sí mismo: se usa bajo el lock del repositorio dueño del archivo.
+    """
+
+    def __init__(self, path: str, key_field: str, normalize: Callable[[str], str] = lambda value: value):
+        """
+        Args:
+            path (str): Ruta del CSV (con cabecera).
+            key_field (str): Columna usada como clave de búsqueda.
+            normalize (Callable): Normalización de la clave (ej. str.lower para nombres).
+        """
+        self.path = path
+        self.key_field = key_field
+        self.normalize = normalize
+        self.max_id = 0
+        self._rows: Dict[str, Dict[str, str]] = {}
+        self._loaded = False
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        if os.path.exists(self.path):
+            with open(self.path, "r", newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    self._index_row(row)
+        self._loaded = True
+
+    def _index_row(self, row: Dict[str, str]) -> None:
+        # Ante claves repetidas gana la última fila: `BufferedCsvWriter.replace_rows` añade
+        # la versión nueva al final y, si el proceso muere antes de compactar, es la vigente.
+        self._rows[self.normalize(row[self.key_field])] = row
+        if row.get("id"):
+            self.max_id = max(self.max_id, int(row["id"]))
+
+    def get(self, key: str) -> Optional[Dict[str, str]]:
+        """Devuelve la fila cuya clave coincide (normalizada), o None."""
+        self._ensure_loaded()
+        return self._rows.get(self.normalize(key))
+
+    def add(self, row: Dict[str, str]) -> None:
+        """Registra una fila recién escrita en el archivo."""
+        self._ensure_loaded()
+        self._index_row(row)
+
+    def replace(self, row: Dict[str, str]) -> None:
+        """Sustituye la fila de su clave por una versión actualizada."""
+        self._ensure_loaded()
+        self._rows[self.normalize(row[self.key_field])] = row
+
+    def next_id(self) -> int:
+        """Siguiente ID libre (máximo + 1); el ID queda reservado al registrar la fila."""
+        self._ensure_loaded()
+        return self.max_id + 1
+
+    def items(self) -> Iterator[Tuple[str, Dict[str, str]]]:
+        """Recorre (clave normalizada, fila) de todo el índice."""
+        self._ensure_loaded()
+        return iter(list(self._rows.items()))
+
+
+_indexes: Dict[Tuple[str, str], CsvIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_csv_index(path: str, key_field: str, normalize: Callable[[str], str] = lambda value: value) -> CsvIndex:
+    """
+    Índice compartido por archivo y clave: todas las instancias de repositorio del
+    proceso que apunten al mismo CSV ven el mismo estado.
+    """
+    cache_key = (os.path.abspath(path), key_field)
+    with _indexes_lock:
+        index = _indexes.get(cache_key)
+        if index is None:
+            index = CsvIndex(path, key_field, normalize)
+            _indexes[cache_key] = index
+        return index
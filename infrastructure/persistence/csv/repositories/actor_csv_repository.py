@@ -6,6 +6,8 @@ import threading
 from typing import Optional, List
 from domain.models.actor import Actor
 from domain.repositories.actor_repository import ActorRepository
+from infrastructure.persistence.csv.csv_index import get_csv_index
+from infrastructure.persistence.csv.buffered_csv_writer import BufferedCsvWriter
 
 ACTORS_CSV = "data/actors.csv"
 ACTOR_HEADERS = ["id", "name"]
@@ -14,24 +16,24 @@ actor_lock = threading.Lock()
 class ActorCsvRepository(ActorRepository):
     """
     Implementación del repositorio de actores para almacenamiento en archivos CSV.
+
+    Los actores se indexan en memoria por nombre en minúsculas, así que buscar
+    un actor no recorre el archivo. Con un `BufferedCsvWriter` las filas nuevas
+    pasan por su buffer en vez de abrir el archivo en cada guardado.
     """
-    def __init__(self):
-        os.makedirs(os.path.dirname(ACTORS_CSV), exist_ok=True)
-        if not os.path.exists(ACTORS_CSV):
-            with open(ACTORS_CSV, "w", newline="", encoding="utf-8") as f:
+    def __init__(self, path: str = ACTORS_CSV, writer: Optional[BufferedCsvWriter] = None):
+        self.path = path
+        self.writer = writer
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        if not os.path.exists(self.path):
+            with open(self.path, "w", newline="", encoding="utf-8") as f:
                 writer = csv.writer(f)
                 writer.writerow(ACTOR_HEADERS)
-    
+        self._index = get_csv_index(self.path, "name", normalize=str.lower)
+
     def _get_next_id(self) -> int:
-        """Lee el CSV para determinar el siguiente ID disponible."""
-        with open(ACTORS_CSV, "r", newline="", encoding="utf-8") as f:
-            reader = csv.reader(f)
-            next(reader) # Saltar encabezados
-            last_id = 0
-            for row in reader:
-                if row:
-                    last_id = int(row[0])
-            return last_id + 1
+        """Siguiente ID disponible según el índice en memoria."""
+        return self._index.next_id()
 
     def save(self, actor: Actor) -> Actor:
         """
@@ -42,20 +44,28 @@ class ActorCsvRepository(ActorRepository):
             if actor.id is None:
                 actor.id = self._get_next_id()
             
-            with open(ACTORS_CSV, "a", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow([actor.id, actor.name])
+            if self.writer:
+                self.writer.writerow([actor.id, actor.name])
+            else:
+                with open(self.path, "a", newline="", encoding="utf-8") as f:
+                    writer = csv.writer(f)
+                    writer.writerow([actor.id, actor.name])
+            self._index.add({"id": str(actor.id), "name": actor.name})
             
             return actor
 
     def find_by_name(self, name: str) -> Optional[Actor]:
         """
-        Busca un actor por su nombre en el archivo CSV.
+        Busca un actor por su nombre (sin distinguir mayúsculas) en el índice en memoria.
         """
         with actor_lock:
-            with open(ACTORS_CSV, "r", newline="", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    if row["name"].lower() == name.lower():
-                        return Actor(id=int(row["id"]), name=row["name"])
-        return None
\ No newline at end of file
+            row = self._index.get(name)
+        if row is None:
+            return None
+        return Actor(id=int(row["id"]), name=row["name"])
+
+    def find_all(self) -> List[Actor]:
+        """Todos los actores del índice en memoria."""
+        with actor_lock:
+            rows = [row for _, row in self._index.items()]
+        return [Actor(id=int(row["id"]), name=row["name"]) for row in rows]
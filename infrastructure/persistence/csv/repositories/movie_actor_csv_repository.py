@@ -1,9 +1,10 @@
 import csv
 import os
 import threading
-from typing import List
+from typing import List, Optional
 from domain.models.movie_actor import MovieActor
 from domain.repositories.movie_actor_repository import MovieActorRepository
+from infrastructure.persistence.csv.buffered_csv_writer import BufferedCsvWriter, replace_csv_rows, _csv_row
 
 MOVIE_ACTOR_CSV = "data/movie_actor.csv"
 MOVIE_ACTOR_HEADERS = ["movie_id", "actor_id"]
@@ -12,11 +13,14 @@ relation_lock = threading.Lock()
 class MovieActorCsvRepository(MovieActorRepository):
     """
     Implementación del repositorio para guardar relaciones N:M en un archivo CSV.
+    Si recibe un `BufferedCsvWriter`, escribe a través de su buffer.
     """
-    def __init__(self):
-        os.makedirs(os.path.dirname(MOVIE_ACTOR_CSV), exist_ok=True)
-        if not os.path.exists(MOVIE_ACTOR_CSV):
-            with open(MOVIE_ACTOR_CSV, "w", newline="", encoding="utf-8") as f:
+    def __init__(self, path: str = MOVIE_ACTOR_CSV, writer: Optional[BufferedCsvWriter] = None):
+        self.path = path
+        self.writer = writer
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        if not os.path.exists(self.path):
+            with open(self.path, "w", newline="", encoding="utf-8") as f:
                 writer = csv.writer(f)
                 writer.writerow(MOVIE_ACTOR_HEADERS)
 
@@ -24,8 +28,11 @@ class MovieActorCsvRepository(MovieActorRepository):
         """
         Guarda una única relación película-actor en el archivo CSV.
         """
+        if self.writer:
+            self.writer.writerow([relation.movie_id, relation.actor_id])
+            return
         with relation_lock:
-            with open(MOVIE_ACTOR_CSV, "a", newline="", encoding="utf-8") as f:
+            with open(self.path, "a", newline="", encoding="utf-8") as f:
                 writer = csv.writer(f)
                 writer.writerow([relation.movie_id, relation.actor_id])
 
@@ -33,8 +40,25 @@ class MovieActorCsvRepository(MovieActorRepository):
         """
         Guarda una lista de relaciones película-actor de forma eficiente usando writerows.
         """
+        rows_to_write = [(rel.movie_id, rel.actor_id) for rel in relations]
+        if self.writer:
+            self.writer.writerows(rows_to_write)
+            return
         with relation_lock:
-            with open(MOVIE_ACTOR_CSV, "a", newline="", encoding="utf-8") as f:
+            with open(self.path, "a", newline="", encoding="utf-8") as f:
                 writer = csv.writer(f)
-                rows_to_write = [(rel.movie_id, rel.actor_id) for rel in relations]
-                writer.writerows(rows_to_write)
\ No newline at end of file
+                writer.writerows(rows_to_write)
+
+    def replace_for_movies(self, movie_ids: List[int], relations: List[MovieActor]) -> None:
+        """
+        Sustituye el reparto de las películas indicadas por `relations`. Con un
+        `BufferedCsvWriter` el reemplazo se aplica al compactar el archivo al cerrar.
+        """
+        replacements = {str(movie_id): [] for movie_id in movie_ids}
+        for rel in relations:
+            replacements.setdefault(str(rel.movie_id), []).append([rel.movie_id, rel.actor_id])
+        if self.writer:
+            self.writer.replace_rows(replacements)
+            return
+        with relation_lock:
+            replace_csv_rows(self.path, {key: [_csv_row(row) for row in rows] for key, rows in replacements.items()})
@@ -1,9 +1,11 @@
 import csv
 import os
 import threading
-from typing import Optional
+from typing import Optional, Set
 from domain.models.movie import Movie
 from domain.repositories.movie_repository import MovieRepository
+from infrastructure.persistence.csv.csv_index import get_csv_index
+from infrastructure.persistence.csv.buffered_csv_writer import BufferedCsvWriter, replace_csv_rows, _csv_row
 
 MOVIES_CSV = "data/movies.csv"
 MOVIE_HEADERS = ["id", "imdb_id", "title", "year", "rating", "duration_minutes", "metascore"]
@@ -12,65 +14,87 @@ movie_lock = threading.Lock()
 class MovieCsvRepository(MovieRepository):
     """
     Implementación del repositorio de películas que persiste datos en formato CSV.
+
+    El archivo se carga una sola vez en un índice en memoria (imdb_id → fila) con el
+    ID máximo; las búsquedas y la asignación de IDs no vuelven a leer el archivo.
+    Si recibe un `BufferedCsvWriter`, las filas se escriben a través de su buffer
+    en lugar de abrir el archivo en cada guardado.
     """
-    def __init__(self):
-        os.makedirs(os.path.dirname(MOVIES_CSV), exist_ok=True)
-        if not os.path.exists(MOVIES_CSV):
-            with open(MOVIES_CSV, "w", newline="", encoding="utf-8") as f:
+    def __init__(self, path: str = MOVIES_CSV, writer: Optional[BufferedCsvWriter] = None):
+        self.path = path
+        self.writer = writer
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        if not os.path.exists(self.path):
+            with open(self.path, "w", newline="", encoding="utf-8") as f:
                 writer = csv.writer(f)
                 writer.writerow(MOVIE_HEADERS)
+        self._index = get_csv_index(self.path, "imdb_id")
 
     def _get_next_id(self) -> int:
-        """Lee el CSV para determinar el siguiente ID disponible."""
-        with open(MOVIES_CSV, "r", newline="", encoding="utf-8") as f:
-            reader = csv.reader(f)
-            next(reader) # Saltar encabezados
-            last_id = 0
-            for row in reader:
-                if row:
-                    last_id = int(row[0])
-            return last_id + 1
+        """Siguiente ID disponible según el índice en memoria."""
+        return self._index.next_id()
 
     def save(self, movie: Movie) -> Movie:
         """
         Guarda una película en CSV, asignándole un nuevo ID si no lo tiene,
-        y retorna el objeto Movie con el ID asignado.
+        y retorna el objeto Movie con el ID asignado. Si el imdb_id ya estaba en el
+        CSV, su fila se actualiza conservando el ID.
         """
         with movie_lock:
-            if movie.id is None:
+            existing = self._index.get(movie.imdb_id)
+            if existing is not None:
+                movie.id = int(existing["id"])
+            elif movie.id is None:
                 movie.id = self._get_next_id()
-            
-            with open(MOVIES_CSV, "a", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow([
-                    movie.id,
-                    movie.imdb_id,
-                    movie.title,
-                    movie.year,
-                    movie.rating,
-                    movie.duration_minutes or "",
-                    movie.metascore or ""
-                ])
+
+            row = [
+                movie.id,
+                movie.imdb_id,
+                movie.title,
+                movie.year,
+                movie.rating,
+                movie.duration_minutes or "",
+                movie.metascore or ""
+            ]
+            indexed_row = dict(zip(MOVIE_HEADERS, _csv_row(row)))
+            if existing is not None:
+                if self.writer:
+                    self.writer.replace_rows({movie.id: [row]})
+                else:
+                    replace_csv_rows(self.path, {str(movie.id): [_csv_row(row)]})
+                self._index.replace(indexed_row)
+                return movie
+
+            if self.writer:
+                self.writer.writerow(row)
+            else:
+                with open(self.path, "a", newline="", encoding="utf-8") as f:
+                    writer = csv.writer(f)
+                    writer.writerow(row)
+            self._index.add(indexed_row)
             return movie
 
     def find_by_imdb_id(self, imdb_id: str) -> Optional[Movie]:
         """
-        Busca una película por su ID de IMDb en el archivo CSV.
+        Busca una película por su ID de IMDb en el índice en memoria del CSV.
         """
         with movie_lock:
-            with open(MOVIES_CSV, "r", newline="", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    if row["imdb_id"] == imdb_id:
-                        # Reconstruye el objeto Movie a partir de la fila del CSV
-                        return Movie(
-                            id=int(row["id"]),
-                            imdb_id=row["imdb_id"],
-                            title=row["title"],
-                            year=int(row["year"]),
-                            rating=float(row["rating"]),
-                            duration_minutes=int(row["duration_minutes"]) if row["duration_minutes"] else None,
-                            metascore=int(row["metascore"]) if row["metascore"] else None,
-                            actors=[] # La lista de actores se carga por separado en el caso de uso
-                        )
-        return None
\ No newline at end of file
+            row = self._index.get(imdb_id)
+        if row is None:
+            return None
+        # Reconstruye el objeto Movie a partir de la fila del CSV
+        return Movie(
+            id=int(row["id"]),
+            imdb_id=row["imdb_id"],
+            title=row["title"],
+            year=int(row["year"]),
+            rating=float(row["rating"]),
+            duration_minutes=int(row["duration_minutes"]) if row["duration_minutes"] else None,
+            metascore=int(row["metascore"]) if row["metascore"] else None,
+            actors=[] # La lista de actores se carga por separado en el caso de uso
+        )
+
+    def find_all_imdb_ids(self) -> Set[str]:
+        """IDs de IMDb de todas las películas del índice en memoria."""
+        with movie_lock:
+            return {imdb_id for imdb_id, _ in self._index.items()}
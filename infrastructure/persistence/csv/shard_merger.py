@@ -0,0 +1,133 @@
+import csv
+import logging
+import os
+import shutil
+from typing import Dict, List
+
+from domain.interfaces.use_case_interface import UseCaseInterface
+from domain.models import Movie, Actor
+from infrastructure.persistence.csv.repositories.movie_csv_repository import MOVIES_CSV
+from infrastructure.persistence.csv.repositories.actor_csv_repository import ACTORS_CSV
+from infrastructure.persistence.csv.repositories.movie_actor_csv_repository import MOVIE_ACTOR_CSV
+from shared.config import config
+
+logger = logging.getLogger(__name__)
+
+
+def shard_dir(index: int) -> str:
+    """Directorio de trabajo del shard `index` en modo --workers."""
+    return os.path.join(config.SHARDS_DIR, f"shard-{index}")
+
+
+def existing_shards() -> List[int]:
+    """Índices de los directorios de shard que siguen en `SHARDS_DIR` (ej. de una ejecución fallida)."""
+    if not os.path.isdir(config.SHARDS_DIR):
+        return []
+    indexes = []
+    for name in os.listdir(config.SHARDS_DIR):
+        prefix, _, suffix = name.partition("-")
+        if prefix == "shard" and suffix.isdigit() and os.path.isdir(os.path.join(config.SHARDS_DIR, name)):
+            indexes.append(int(suffix))
+    return sorted(indexes)
+
+
+def shard_csv_paths(index: int) -> Dict[str, str]:
+    """Rutas de los tres CSV de un shard (mismos nombres que los CSV principales)."""
+    directory = shard_dir(index)
+    return {
+        "movies": os.path.join(directory, os.path.basename(MOVIES_CSV)),
+        "actors": os.path.join(directory, os.path.basename(ACTORS_CSV)),
+        "movie_actor": os.path.join(directory, os.path.basename(MOVIE_ACTOR_CSV)),
+    }
+
+
+class CsvShardMerger:
+    """
+    Fusiona los CSV escritos por un shard en los CSV principales.
+
+    Cada proceso de --workers numera películas y actores desde 1 en sus propios CSV,
+    así que sus IDs no valen fuera del shard. El merge reconstruye los `Movie` con sus
+    actores y los pasa por el caso de uso CSV principal, que asigna los IDs globales,
+    reutiliza los actores ya conocidos y actualiza las películas que ya existían
+    (títulos refrescados).
+    """
+
+    def __init__(self, use_case: UseCaseInterface):
+        self.use_case = use_case
+
+    @staticmethod
+    def _read(path: str) -> List[dict]:
+        if not os.path.exists(path):
+            return []
+        with open(path, "r", newline="", encoding="utf-8") as f:
+            return list(csv.DictReader(f))
+
+    @staticmethod
+    def _last_cast(relations: List[dict]) -> Dict[str, List[str]]:
+        """
+        IDs de actor del reparto vigente de cada película del shard.
+
+        Un refresco sin compactar (proceso muerto antes de cerrar los CSV) deja el reparto
+        anterior y el nuevo de la misma película; el vigente es el último bloque contiguo
+        de filas. Un actor que se repite dentro del bloque también abre uno nuevo.
+        """
+        cast: Dict[str, List[str]] = {}
+        previous = None
+        for row in relations:
+            movie_id, actor_id = row["movie_id"], row["actor_id"]
+            block = cast.get(movie_id)
+            if movie_id != previous or block is None or actor_id in block:
+                block = cast[movie_id] = []
+            block.append(actor_id)
+            previous = movie_id
+        return cast
+
+    def read_movies(self, index: int) -> List[Movie]:
+        """
+        Reconstruye las películas del shard con sus actores, en el orden en que se guardaron.
+        Si un imdb_id aparece varias veces (shard conservado sin compactar), vale la última fila.
+        """
+        paths = shard_csv_paths(index)
+        actor_names = {row["id"]: row["name"] for row in self._read(paths["actors"])}
+        cast = self._last_cast(self._read(paths["movie_actor"]))
+
+        latest: Dict[str, dict] = {}
+        for row in self._read(paths["movies"]):
+            latest[row["imdb_id"]] = row
+
+        movies = []
+        for row in latest.values():
+            try:
+                movies.append(Movie(
+                    id=None,
+                    imdb_id=row["imdb_id"],
+                    title=row["title"],
+                    year=int(row["year"]),
+                    rating=float(row["rating"]),
+                    duration_minutes=int(row["duration_minutes"]) if row["duration_minutes"] else None,
+                    metascore=int(row["metascore"]) if row["metascore"] else None,
+                    actors=[Actor(id=None, name=actor_names[actor_id]) for actor_id in cast.get(row["id"], []) if actor_id in actor_names]
+                ))
+            except (KeyError, ValueError) as e:
+                logger.warning(f"[Shard {index}] Fila de película inválida ({row.get('imdb_id')}): {e}")
+        return movies
+
+    def merge(self, index: int) -> bool:
+        """
+        Guarda las películas del shard a través del caso de uso principal.
+
+        Returns:
+            bool: True si se guardaron todas las películas leídas del shard.
+        """
+        movies = self.read_movies(index)
+        saved = self.use_case.execute_many(movies) if movies else []
+        if len(saved) < len(movies):
+            logger.error(f"[Shard {index}] Solo {len(saved)} de {len(movies)} películas fusionadas en los CSV principales.")
+            return False
+        logger.info(f"[Shard {index}] {len(movies)} películas fusionadas en los CSV principales.")
+        return True
+
+    @staticmethod
+    def cleanup(index: int) -> None:
+        """Borra el directorio de trabajo del shard (solo tras un merge correcto)."""
+        shutil.rmtree(shard_dir(index), ignore_errors=True)
@@ -0,0 +1,159 @@
+import csv
+import io
+import logging
+from typing import Callable, ContextManager, Dict, List, Optional, Set, TextIO
+
+from psycopg2 import DatabaseError
+
+from domain.interfaces.bulk_loader_interface import BulkLoaderInterface
+from domain.models.movie import Movie
+from infrastructure.persistence.postgres.postgres_connection import get_connection
+
+logger = logging.getLogger(__name__)
+
+# Tablas de staging temporales: guardan los IDs de origen (del CSV o del lote) para
+# poder traducir las relaciones a los IDs reales de la base de datos.
+CREATE_STAGING_SQL = """
+    CREATE TEMP TABLE stg_movies (
+        src_id INT, imdb_id TEXT, title TEXT, year INT, rating FLOAT,
+        duration_minutes INT, metascore INT
+    ) ON COMMIT DROP;
+    CREATE TEMP TABLE stg_actors (src_id INT, name TEXT) ON COMMIT DROP;
+    CREATE TEMP TABLE stg_movie_actor (src_movie_id INT, src_actor_id INT) ON COMMIT DROP;
+"""
+
+COPY_MOVIES_SQL = "COPY stg_movies FROM STDIN WITH (FORMAT csv, HEADER true)"
+COPY_ACTORS_SQL = "COPY stg_actors FROM STDIN WITH (FORMAT csv, HEADER true)"
+COPY_MOVIE_ACTOR_SQL = "COPY stg_movie_actor FROM STDIN WITH (FORMAT csv, HEADER true)"
+
+# Ante imdb_id repetidos gana la última fila (en un CSV, la versión más reciente).
+MERGE_MOVIES_SQL = """
+    INSERT INTO movies (imdb_id, title, year, rating, duration_minutes, metascore)
+    SELECT DISTINCT ON (imdb_id) imdb_id, title, year, rating, duration_minutes, metascore
+    FROM stg_movies
+    ORDER BY imdb_id, src_id DESC
+    ON CONFLICT (imdb_id) DO UPDATE SET
+        title = EXCLUDED.title,
+        year = EXCLUDED.year,
+        rating = EXCLUDED.rating,
+        duration_minutes = EXCLUDED.duration_minutes,
+        metascore = EXCLUDED.metascore
+"""
+
+MERGE_ACTORS_SQL = """
+    INSERT INTO actors (name)
+    SELECT DISTINCT name FROM stg_actors
+    ON CONFLICT (name) DO NOTHING
+"""
+
+# El reparto de las películas cargadas pasa a ser el de los datos de origen.
+DELETE_REPLACED_CAST_SQL = """
+    DELETE FROM movie_actor
+    WHERE movie_id IN (SELECT m.id FROM movies m JOIN stg_movies sm ON sm.imdb_id = m.imdb_id)
+"""
+
+# Remapeo de IDs: ID de origen → clave natural (imdb_id / nombre) → ID en la BD.
+MERGE_MOVIE_ACTOR_SQL = """
+    INSERT INTO movie_actor (movie_id, actor_id)
+    SELECT DISTINCT m.id, a.id
+    FROM stg_movie_actor r
+    JOIN stg_movies sm ON sm.src_id = r.src_movie_id
+    JOIN movies m ON m.imdb_id = sm.imdb_id
+    JOIN stg_actors sa ON sa.src_id = r.src_actor_id
+    JOIN actors a ON a.name = sa.name
+    ON CONFLICT (movie_id, actor_id) DO NOTHING
+"""
+
+
+class PostgresCopyLoader(BulkLoaderInterface):
+    """
+    Carga masiva en PostgreSQL con `COPY ... FROM STDIN` desde el cliente.
+
+    Los datos se envían por la conexión (no requiere acceso a archivos en el servidor)
+    a tablas de staging temporales y se fusionan en `movies`, `actors` y `movie_actor`
+    con INSERT ... ON CONFLICT, todo en una sola transacción. Las películas que ya
+    existían se actualizan y su reparto se reemplaza por el de los datos cargados. Sirve tanto para lotes
+    del scraper en vivo como para reprocesar los `data/*.csv` existentes.
+    Cada carga toma su propia conexión del pool y la devuelve al terminar.
+    """
+    def __init__(self, connection_factory: Callable[[], ContextManager] = get_connection):
+        self.connection_factory = connection_factory
+
+    def known_imdb_ids(self) -> Optional[Set[str]]:
+        """IDs de IMDb ya cargados en `movies`."""
+        with self.connection_factory() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT imdb_id FROM movies")
+                return {row[0] for row in cur.fetchall()}
+
+    def load_movies(self, movies: List[Movie]) -> int:
+        """
+        Carga un lote de películas del scraper con sus actores y relaciones.
+
+        Returns:
+            int: Películas insertadas o actualizadas.
+        """
+        if not movies:
+            return 0
+
+        movies_buf, actors_buf, relations_buf = io.StringIO(), io.StringIO(), io.StringIO()
+        movies_writer = csv.writer(movies_buf)
+        actors_writer = csv.writer(actors_buf)
+        relations_writer = csv.writer(relations_buf)
+        movies_writer.writerow(["src_id", "imdb_id", "title", "year", "rating", "duration_minutes", "metascore"])
+        actors_writer.writerow(["src_id", "name"])
+        relations_writer.writerow(["src_movie_id", "src_actor_id"])
+
+        # IDs de origen locales al lote: posición de la película y un ID por nombre de actor.
+        actor_src_ids: Dict[str, int] = {}
+        for src_movie_id, movie in enumerate(movies, start=1):
+            movies_writer.writerow([
+                src_movie_id, movie.imdb_id, movie.title, movie.year, movie.rating,
+                movie.duration_minutes, movie.metascore
+            ])
+            for actor in movie.actors:
+                if actor.name not in actor_src_ids:
+                    actor_src_ids[actor.name] = len(actor_src_ids) + 1
+                    actors_writer.writerow([actor_src_ids[actor.name], actor.name])
+                relations_writer.writerow([src_movie_id, actor_src_ids[actor.name]])
+
+        for buf in (movies_buf, actors_buf, relations_buf):
+            buf.seek(0)
+        return self._load(movies_buf, actors_buf, relations_buf)
+
+    def load_csv_files(self, movies_path: str, actors_path: str, movie_actor_path: str) -> int:
+        """
+        Carga los CSV generados por el scraper (con cabecera) tal cual, en streaming.
+        Los IDs de los archivos solo se usan para enlazar las relaciones.
+        """
+        with open(movies_path, "r", newline="", encoding="utf-8") as movies_file, \
+             open(actors_path, "r", newline="", encoding="utf-8") as actors_file, \
+             open(movie_actor_path, "r", newline="", encoding="utf-8") as relations_file:
+            return self._load(movies_file, actors_file, relations_file)
+
+    def _load(self, movies_file: TextIO, actors_file: TextIO, relations_file: TextIO) -> int:
+        with self.connection_factory() as conn:
+            try:
+                with conn.cursor() as cur:
+                    cur.execute(CREATE_STAGING_SQL)
+                    cur.copy_expert(COPY_MOVIES_SQL, movies_file)
+                    cur.copy_expert(COPY_ACTORS_SQL, actors_file)
+                    cur.copy_expert(COPY_MOVIE_ACTOR_SQL, relations_file)
+
+                    cur.execute(MERGE_MOVIES_SQL)
+                    new_movies = cur.rowcount
+                    cur.execute(MERGE_ACTORS_SQL)
+                    new_actors = cur.rowcount
+                    cur.execute(DELETE_REPLACED_CAST_SQL)
+                    cur.execute(MERGE_MOVIE_ACTOR_SQL)
+                    new_relations = cur.rowcount
+                conn.commit()
+            except DatabaseError as e:
+                logger.error(f"[COPY] Error en la carga masiva: {e}")
+                conn.rollback()
+                raise
+
+        logger.info(
+            f"[COPY] Guardadas {new_movies} películas (nuevas o actualizadas), {new_actors} actores nuevos y {new_relations} relaciones."
+        )
+        return new_movies
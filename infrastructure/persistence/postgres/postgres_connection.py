@@ -1,3 +1,4 @@
+import threading
 import psycopg2
 from psycopg2 import pool
 from contextlib import contextmanager
@@ -6,30 +7,45 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# ThreadedConnectionPool es seguro entre hilos, pero getconn() falla con PoolError
+# cuando no quedan conexiones libres; el semáforo hace que los hilos esperen turno.
+_pool_slots = threading.BoundedSemaphore(config.POSTGRES_POOL_SIZE)
+
 connection_pool = None
 try:
-    connection_pool = pool.SimpleConnectionPool(
+    connection_pool = pool.ThreadedConnectionPool(
         minconn=1,
-        maxconn=5,
+        maxconn=config.POSTGRES_POOL_SIZE,
         dbname=config.POSTGRES_DB,
         user=config.POSTGRES_USER,
         password=config.POSTGRES_PASSWORD,
         host=config.POSTGRES_HOST,
         port=config.POSTGRES_PORT
     )
-    logger.info("Pool de conexiones a PostgreSQL creado.")
+    logger.info(f"Pool de conexiones a PostgreSQL creado (máx. {config.POSTGRES_POOL_SIZE}).")
 except psycopg2.OperationalError as e:
     logger.error(f"Error al crear el pool de conexiones: {e}")
 
 @contextmanager
 def get_connection():
+    """
+    Toma una conexión del pool para una unidad de trabajo y la devuelve al salir.
+    Si todas están en uso, espera a que se libere una.
+    """
     if not connection_pool:
         raise ConnectionError("El pool de conexiones no está disponible.")
-    
+
     conn = None
-    try:
-        conn = connection_pool.getconn()
-        yield conn
-    finally:
-        if conn:
-            connection_pool.putconn(conn)
\ No newline at end of file
+    with _pool_slots:
+        try:
+            conn = connection_pool.getconn()
+            yield conn
+        finally:
+            if conn:
+                # Una conexión rota no vuelve al pool: se cierra y el pool abrirá otra.
+                connection_pool.putconn(conn, close=bool(conn.closed))
+
+def close_pool():
+    """Cierra todas las conexiones del pool."""
+    if connection_pool and not connection_pool.closed:
+        connection_pool.closeall()
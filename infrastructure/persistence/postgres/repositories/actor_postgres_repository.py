@@ -1,5 +1,5 @@
 import logging
-from typing import Optional
+from typing import List, Optional
 from domain.models.actor import Actor
 from domain.repositories.actor_repository import ActorRepository
 from psycopg2 import DatabaseError
@@ -7,6 +7,10 @@ from psycopg2 import DatabaseError
 logger = logging.getLogger(__name__)
 
 class ActorPostgresRepository(ActorRepository):
+    """
+    Repositorio de actores en PostgreSQL. No confirma ni revierte: trabaja dentro de la
+    transacción de la unidad de trabajo que le da la conexión, y ante un error lo propaga.
+    """
     def __init__(self, conn):
         self.conn = conn
 
@@ -18,13 +22,27 @@ class ActorPostgresRepository(ActorRepository):
             with self.conn.cursor() as cur:
                 cur.execute("SELECT * FROM upsert_actor(%s);", (actor.name,))
                 actor_data = cur.fetchone()
-                self.conn.commit()
                 return Actor(id=actor_data[0], name=actor_data[1])
         except DatabaseError as e:
             logger.error(f"Error al guardar actor '{actor.name}': {e}")
-            self.conn.rollback()
             raise 
 
+    def save_many(self, actors: List[Actor]) -> List[Actor]:
+        """
+        Guarda un lote de actores con una sola llamada a `upsert_actors` y devuelve
+        todos los del lote (nuevos y existentes) con su ID.
+        """
+        if not actors:
+            return []
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute("SELECT id, name FROM upsert_actors(%s::text[]);", ([actor.name for actor in actors],))
+                rows = cur.fetchall()
+                return [Actor(id=actor_id, name=name) for actor_id, name in rows]
+        except DatabaseError as e:
+            logger.error(f"Error al guardar lote de {len(actors)} actores: {e}")
+            raise
+
     def find_by_name(self, name: str) -> Optional[Actor]:
         """
         Busca un actor por su nombre en la base de datos.
@@ -38,5 +56,16 @@ class ActorPostgresRepository(ActorRepository):
                 return None
         except DatabaseError as e:
             logger.error(f"Error al buscar actor por nombre '{name}': {e}")
-            self.conn.rollback()
-            return None
\ No newline at end of file
+            raise
+
+    def find_all(self) -> List[Actor]:
+        """
+        Devuelve todos los actores en una sola consulta.
+        """
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute("SELECT id, name FROM actors")
+                return [Actor(id=actor_id, name=name) for actor_id, name in cur.fetchall()]
+        except DatabaseError as e:
+            logger.error(f"Error al listar actores: {e}")
+            raise
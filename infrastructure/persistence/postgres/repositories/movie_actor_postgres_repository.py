@@ -3,13 +3,13 @@ from typing import List
 from domain.models.movie_actor import MovieActor
 from domain.repositories.movie_actor_repository import MovieActorRepository
 from psycopg2 import DatabaseError
-from psycopg2.extras import execute_values
 
 logger = logging.getLogger(__name__)
 
 class MovieActorPostgresRepository(MovieActorRepository):
     """
     Implementación del repositorio para manejar relaciones N:M en PostgreSQL.
+    Como el resto de repositorios de PostgreSQL, no gestiona la transacción.
     """
     def __init__(self, conn):
         self.conn = conn
@@ -22,28 +22,39 @@ class MovieActorPostgresRepository(MovieActorRepository):
             with self.conn.cursor() as cur:
                 cur.execute("SELECT * from upsert_movie_actor(%s, %s);", 
                             (relation.movie_id, relation.actor_id))
-                self.conn.commit()
         except DatabaseError as e:
             logger.error(f"Error al guardar relación movie_id={relation.movie_id}, actor_id={relation.actor_id}: {e}")
-            self.conn.rollback()
             raise
 
     def save_many(self, relations: List[MovieActor]) -> None:
         """
-        Guarda una lista de relaciones película-actor de forma eficiente.
+        Guarda una lista de relaciones película-actor en una sola llamada a
+        `upsert_movie_actors`, pasando los IDs como arrays paralelos.
         """
         if not relations:
             return
         
         try:
             with self.conn.cursor() as cur:
-                values = [(r.movie_id, r.actor_id) for r in relations]
-                
-                for value in values:
-                     cur.execute("SELECT * from upsert_movie_actor(%s, %s);", value)
-
-                self.conn.commit()
+                cur.execute("SELECT upsert_movie_actors(%s::int[], %s::int[]);", (
+                    [r.movie_id for r in relations],
+                    [r.actor_id for r in relations]
+                ))
         except DatabaseError as e:
             logger.error(f"Error al guardar múltiples relaciones: {e}")
-            self.conn.rollback()
-            raise
\ No newline at end of file
+            raise
+
+    def replace_for_movies(self, movie_ids: List[int], relations: List[MovieActor]) -> None:
+        """
+        Borra el reparto actual de las películas y guarda el nuevo, en la misma
+        transacción de la unidad de trabajo.
+        """
+        if not movie_ids:
+            return
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute("DELETE FROM movie_actor WHERE movie_id = ANY(%s::int[]);", (list(movie_ids),))
+        except DatabaseError as e:
+            logger.error(f"Error al reemplazar el reparto de {len(movie_ids)} películas: {e}")
+            raise
+        self.save_many(relations)
\ No newline at end of file
@@ -1,5 +1,6 @@
 import logging
-from typing import Optional
+from dataclasses import replace
+from typing import List, Optional, Set
 from domain.models.movie import Movie
 from domain.repositories.movie_repository import MovieRepository
 from psycopg2 import DatabaseError
@@ -9,6 +10,9 @@ logger = logging.getLogger(__name__)
 class MoviePostgresRepository(MovieRepository):
     """
     Implementación del repositorio de películas utilizando PostgreSQL.
+
+    No confirma ni revierte: trabaja dentro de la transacción de la unidad de trabajo
+    que le da la conexión, y ante un error lo propaga para que esta revierta todo.
     """
     def __init__(self, conn):
         self.conn = conn
@@ -37,9 +41,68 @@ class MoviePostgresRepository(MovieRepository):
                              
         except DatabaseError as e:
             logger.error(f"Error al guardar película '{movie.title}': {e}")
-            self.conn.rollback()
             raise 
 
+    def save_with_actors(self, movie: Movie) -> Optional[Movie]:
+        """
+        Guarda la película, sus actores y las relaciones en una sola llamada a
+        `save_movie_with_actors`; si ya existía, actualiza sus datos y reemplaza su reparto.
+        No confirma: la transacción la cierra la unidad de trabajo.
+
+        Returns:
+            Optional[Movie]: Copia de la película con el ID de la BD.
+        """
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute(
+                    "SELECT saved_movie_id, inserted, actor_count "
+                    "FROM save_movie_with_actors(%s, %s, %s, %s, %s, %s, %s::text[]);",
+                    (
+                        movie.imdb_id, movie.title, movie.year, movie.rating,
+                        movie.duration_minutes, movie.metascore,
+                        [actor.name for actor in movie.actors]
+                    )
+                )
+                movie_id, _, _ = cur.fetchone()
+        except DatabaseError as e:
+            logger.error(f"Error al guardar película '{movie.title}' con sus actores: {e}")
+            raise
+
+        return replace(movie, id=movie_id)
+
+    def save_many(self, movies: List[Movie]) -> List[Movie]:
+        """
+        Guarda un lote de películas con una sola llamada a `upsert_movies`: inserta
+        las nuevas y actualiza las que ya existían.
+
+        Returns:
+            List[Movie]: Las películas del lote (sin repetir imdb_id), con el ID de la base de datos.
+        """
+        if not movies:
+            return []
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute("SELECT id, imdb_id, inserted FROM upsert_movies(%s::text[], %s::text[], %s::int[], %s::float[], %s::int[], %s::int[]);", (
+                    [m.imdb_id for m in movies],
+                    [m.title for m in movies],
+                    [m.year for m in movies],
+                    [m.rating for m in movies],
+                    [m.duration_minutes for m in movies],
+                    [m.metascore for m in movies]
+                ))
+                saved_ids = {imdb_id: movie_id for movie_id, imdb_id, _ in cur.fetchall()}
+        except DatabaseError as e:
+            logger.error(f"Error al guardar lote de {len(movies)} películas: {e}")
+            raise
+
+        # Copias con el ID de la BD: el mismo objeto Movie lo comparten otros sinks.
+        saved, seen = [], set()
+        for movie in movies:
+            if movie.imdb_id in saved_ids and movie.imdb_id not in seen:
+                seen.add(movie.imdb_id)
+                saved.append(replace(movie, id=saved_ids[movie.imdb_id]))
+        return saved
+
     def find_by_imdb_id(self, imdb_id: str) -> Optional[Movie]:
         """
         Busca una película por su ID de IMDb en la base de datos.
@@ -62,5 +125,16 @@ class MoviePostgresRepository(MovieRepository):
                 return None
         except DatabaseError as e:
             logger.error(f"Error al buscar película por imdb_id '{imdb_id}': {e}")
-            self.conn.rollback()
-            return None
\ No newline at end of file
+            raise
+
+    def find_all_imdb_ids(self) -> Set[str]:
+        """
+        Devuelve los IDs de IMDb de todas las películas en una sola consulta.
+        """
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute("SELECT imdb_id FROM movies")
+                return {row[0] for row in cur.fetchall()}
+        except DatabaseError as e:
+            logger.error(f"Error al listar imdb_ids: {e}")
+            raise
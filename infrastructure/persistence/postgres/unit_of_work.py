@@ -0,0 +1,40 @@
+from contextlib import ExitStack
+from typing import Optional
+from domain.models.movie import Movie
+from infrastructure.persistence.postgres.postgres_connection import get_connection
+from infrastructure.persistence.postgres.repositories.movie_postgres_repository import MoviePostgresRepository
+from infrastructure.persistence.postgres.repositories.actor_postgres_repository import ActorPostgresRepository
+from infrastructure.persistence.postgres.repositories.movie_actor_postgres_repository import MovieActorPostgresRepository
+from domain.interfaces.unit_of_work_interface import UnitOfWorkInterface
+
+
+class PostgresUnitOfWork(UnitOfWorkInterface):
+    """
+    Unidad de trabajo sobre PostgreSQL: toma una conexión del pool al entrar y
+    construye los repositorios sobre ella, así cada hilo trabaja con su propia
+    conexión y sus transacciones no se mezclan con las de otros hilos.
+
+    Es la única dueña de la transacción: los repositorios nunca confirman ni revierten,
+    así que todo lo escrito dentro del `with` se confirma o se revierte a la vez.
+    """
+    def __enter__(self) -> "PostgresUnitOfWork":
+        self._stack = ExitStack()
+        self.conn = self._stack.enter_context(get_connection())
+        self.movie_repository = MoviePostgresRepository(self.conn)
+        self.actor_repository = ActorPostgresRepository(self.conn)
+        self.movie_actor_repository = MovieActorPostgresRepository(self.conn)
+        return self
+
+    def save_movie_with_actors(self, movie: Movie) -> Optional[Movie]:
+        """Una sola llamada a la función `save_movie_with_actors` del servidor."""
+        return self.movie_repository.save_with_actors(movie)
+
+    def commit(self) -> None:
+        self.conn.commit()
+
+    def rollback(self) -> None:
+        self.conn.rollback()
+
+    def close(self) -> None:
+        """Devuelve la conexión al pool."""
+        self._stack.close()
@@ -0,0 +1,142 @@
+# En: infrastructure/scraper/async_imdb_scraper.py
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Union
+
+from domain.models import Movie
+from infrastructure.scraper.async_utils import AsyncHttpClient
+from infrastructure.scraper.imdb_scraper import ImdbScraper
+from infrastructure.scraper.scrape_pipeline import UNCHANGED, NOT_FOUND
+from infrastructure.scraper.utils import is_definitive_failure
+from infrastructure.scraper.scrape_scheduler import ScrapeScheduler
+from shared.config import config
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncImdbScraper(ImdbScraper):
+    """
+    Variante del scraper de IMDb basada en asyncio (motor "async").
+
+    La descarga de cada página es una corrutina, por lo que un solo proceso puede
+    mantener miles de páginas en vuelo sin un hilo por petición. El parseo (CPU) y la
+    persistencia (E/S bloqueante de CSV/PostgreSQL) se delegan a un pool de hilos
+    pequeño para no bloquear el event loop.
+    """
+
+    def scrape(self) -> None:
+        asyncio.run(self._scrape_async())
+
+    async def _scrape_async(self) -> None:
+        logger.info("Iniciando scraping asíncrono desde IMDb...")
+        loop = asyncio.get_running_loop()
+        # El pool solo atiende parseo y guardado, no red: no necesita MAX_THREADS hilos.
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=config.ASYNC_WORKER_THREADS))
+
+        async with AsyncHttpClient(self.proxy_provider, self.tor_rotator) as client:
+            if self.assigned is not None:
+                pending = list(self.assigned)
+            else:
+                movie_ids = self._resume_run_ids() or await self._get_combined_movie_ids_async(client)
+                if not movie_ids:
+                    logger.error("No se pudieron obtener IDs de películas.")
+                    return
+
+                movie_ids = movie_ids[:config.NUM_MOVIES]
+                self._start_run(movie_ids)
+                pending = self._ranked(movie_ids, await asyncio.to_thread(self._select_pending, movie_ids))
+            # Un número fijo de corrutinas toma títulos del scheduler, en vez de crear una
+            # por título de golpe; los fallos se reprograman con backoff al final de la cola.
+            scheduler = ScrapeScheduler(pending, priority=self._priority, max_in_flight=client.max_concurrency)
+            await asyncio.gather(*(
+                self._scheduler_worker_async(client, scheduler)
+                for _ in range(min(client.max_concurrency, len(pending)))
+            ))
+            self._finish_run()
+
+        logger.info("Scraping completado.")
+        logger.info(f"Tráfico total usado: {self.total_bytes_used / (1024 ** 2):.2f} MB")
+
+    async def _scheduler_worker_async(self, client: AsyncHttpClient, scheduler: ScrapeScheduler) -> None:
+        while True:
+            task = scheduler.poll()
+            if task is None:
+                if scheduler.finished:
+                    return
+                # Nada listo: o todo está en vuelo o esperando su backoff.
+                await asyncio.sleep(min(scheduler.next_ready_in() or 0.1, 1.0))
+                continue
+            fetched = await self._scrape_and_save_movie_detail_async(client, task.item)
+            scheduler.complete(task, success=fetched)
+
+    async def _scrape_and_save_movie_detail_async(self, client: AsyncHttpClient, indexed_id: tuple[int, str]) -> bool:
+        """
+        Descarga, parsea y guarda un título. Devuelve False solo si falló la descarga
+        (reintentable); un título inexistente (404) cuenta como terminado.
+        """
+        imdb_id = indexed_id[1]
+        try:
+            movie = await self._scrape_movie_detail_async(client, indexed_id)
+            if movie is None:
+                return False
+            if movie is not UNCHANGED and movie is not NOT_FOUND:
+                if await asyncio.to_thread(self.use_case.execute, movie):
+                    self._mark_saved([imdb_id])
+                else:
+                    self._discard_details(imdb_id)
+        except ValueError as e:
+            logger.warning(f"Datos inválidos para {imdb_id}: {e}. Saltando guardado.")
+        except Exception as e:
+            logger.error(f"Error inesperado al procesar y guardar {imdb_id}: {e}", exc_info=True)
+        return True
+
+    async def _scrape_movie_detail_async(self, client: AsyncHttpClient, indexed_id: tuple[int, str]) -> Union[Movie, object, None]:
+        _, imdb_id = indexed_id
+        detail_url = self.base_url + config.TITLE_DETAIL_PATH.format(id=imdb_id)
+
+        response = await client.request(detail_url, headers=self._conditional_headers(imdb_id))
+        if is_definitive_failure(response):
+            logger.warning(f"{imdb_id} no disponible ({response.status_code}). Se descarta sin reintentar.")
+            return NOT_FOUND
+        if not response:
+            logger.warning(f"No se pudo obtener respuesta para la URL: {detail_url}")
+            return None
+
+        self.total_bytes_used += len(response.content)
+        if response.status_code == 304:
+            logger.info(f"[Condicional] {imdb_id} sin cambios (304).")
+            self._mark_saved([imdb_id])
+            return UNCHANGED
+        self._remember_validators(imdb_id, response.headers)
+        return await asyncio.to_thread(self._parse_if_changed, imdb_id, response.text)
+
+    async def _get_combined_movie_ids_async(self, client: AsyncHttpClient) -> List[str]:
+        ids = set()
+        response = await client.request(self.base_url + config.CHART_TOP_PATH)
+
+        if response:
+            html_ids = await asyncio.to_thread(self._parse_chart_ids, response.text)
+            logger.info(f"[HTML] IDs obtenidos: {len(html_ids)}")
+            ids.update(html_ids)
+            ids.update(await self._fetch_graphql_ids_async(client))
+
+        return list(ids)
+
+    async def _fetch_graphql_ids_async(self, client: AsyncHttpClient) -> List[str]:
+        logger.info("Obteniendo IDs adicionales desde GraphQL...")
+        try:
+            response = await client.request(
+                config.GRAPHQL_URL,
+                method="POST",
+                json_payload=self._build_graphql_ids_payload()
+            )
+            if response:
+                ids = self._parse_graphql_ids(response.json())
+                logger.info(f"[GraphQL] IDs obtenidos: {len(ids)}")
+                return ids
+        except Exception as e:
+            logger.error(f"[GraphQL] Error al procesar la respuesta: {e}", exc_info=True)
+
+        return []
@@ -0,0 +1,234 @@
+# En: infrastructure/scraper/async_utils.py
+
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Optional, Dict
+from urllib.parse import urlsplit
+
+import aiohttp
+from aiohttp_socks import ProxyConnector
+
+from infrastructure.network.http_cache import http_cache, CachedResponse
+from infrastructure.network.rate_limiter import outbound_throttle
+from infrastructure.scraper.utils import _get_headers, _is_block, _retry_delay, _select_breaker
+from shared.config import config
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AsyncResponse:
+    """
+    Respuesta ya materializada de una petición asíncrona.
+    Expone los mismos atributos que el scraper usa de `requests.Response`.
+    """
+    status_code: int
+    url: str
+    content: bytes
+    encoding: str = "utf-8"
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.text)
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    def __bool__(self) -> bool:
+        # Igual que `requests.Response`: una respuesta de error se evalúa como falsa.
+        return self.ok
+
+
+class AsyncHttpClient:
+    """
+    Cliente HTTP asíncrono con la misma política que `make_request`:
+    estrategia proxy con fallback a TOR, reintentos y rotación de IP ante bloqueos.
+
+    Cada petición en vuelo es una corrutina. El semáforo se dimensiona por defecto con el
+    techo del `outbound_throttle` (`AIMD_MAX_CONCURRENCY`): más corrutinas solo esperarían
+    en su `async_slot`. Por debajo, el throttle aplica la tasa y la concurrencia AIMD
+    que comparte con `make_request`.
+    """
+
+    def __init__(self, proxy_provider, tor_rotator, max_concurrency: Optional[int] = None):
+        self.proxy_provider = proxy_provider
+        self.tor_rotator = tor_rotator
+        self.max_concurrency = max_concurrency or outbound_throttle.max_concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._sessions: Dict[str, aiohttp.ClientSession] = {}
+        self._tor_urls: Dict[str, Optional[str]] = {}
+
+    async def __aenter__(self) -> "AsyncHttpClient":
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Cierra todas las sesiones abiertas."""
+        for session in self._sessions.values():
+            await session.close()
+        self._sessions.clear()
+        self._tor_urls.clear()
+
+    async def _get_session(self, strategy: str, tor_url: Optional[str] = None) -> aiohttp.ClientSession:
+        """
+        Devuelve la sesión de la estrategia indicada, creándola si no existe.
+        TOR necesita un conector SOCKS propio por circuito (`tor_url`); el proxy HTTP
+        se pasa por petición.
+        """
+        key = strategy
+        if strategy == 'tor':
+            # Una sesión por circuito: al rotar cambian las credenciales y la anterior se cierra.
+            key = f"tor:{urlsplit(tor_url).username or ''}"
+            stale = self._sessions.get(key)
+            if stale is not None and self._tor_urls.get(key) != tor_url:
+                await stale.close()
+                del self._sessions[key]
+
+        session = self._sessions.get(key)
+        if session is None or session.closed:
+            timeout = aiohttp.ClientTimeout(total=config.REQUEST_TIMEOUT)
+            if strategy == 'tor':
+                # rdns=True equivale a socks5h: la resolución DNS ocurre dentro de TOR.
+                connector = ProxyConnector.from_url(
+                    tor_url.replace("socks5h://", "socks5://"),
+                    rdns=True,
+                    limit=self.max_concurrency
+                )
+            else:
+                connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+            session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+            self._sessions[key] = session
+            self._tor_urls[key] = tor_url
+        return session
+
+    async def request(
+        self,
+        url: str,
+        method: str = "GET",
+        json_payload: dict = None,
+        headers: dict = None
+    ) -> Optional[AsyncResponse]:
+        """
+        Versión asíncrona de `make_request`. Devuelve la respuesta 200 (o 304), la respuesta
+        definitiva de `NON_RETRYABLE_CODES` (falsa, ver `is_definitive_failure`) o None
+        si todas las estrategias y reintentos fallaron. Comparte la caché HTTP en disco
+        con `make_request`.
+        """
+        if http_cache.enabled:
+            # Lectura de disco pequeña: no compensa delegarla a un hilo.
+            cached = http_cache.get(method, url, json_payload)
+            if cached is not None:
+                logger.info(f"Respuesta desde caché: {cached.status_code} | {method.upper()} {url}")
+                return AsyncResponse(
+                    status_code=cached.status_code,
+                    url=cached.url,
+                    content=cached.content,
+                    encoding=cached.encoding or "utf-8",
+                    headers=cached.headers
+                )
+            if http_cache.replay:
+                logger.warning(f"Modo replay: {method.upper()} {url} no está en la caché.")
+                return None
+
+        strategies = ['tor'] if config.USE_TOR else ['proxy', 'tor']
+
+        for position, strategy in enumerate(strategies):
+            has_fallback = position < len(strategies) - 1
+            logger.info(f"Iniciando peticiones con estrategia: {strategy.upper()}")
+            for attempt in range(1, config.MAX_RETRIES + 1):
+                # Con TOR, elegir circuito puede esperar a que termine una rotación: fuera del event loop.
+                breaker, tor_proxies, allowed = await asyncio.to_thread(_select_breaker, strategy, url, self.tor_rotator)
+                if not allowed:
+                    if has_fallback:
+                        logger.warning(f"Circuito abierto para {breaker.name}. Se omite la estrategia {strategy.upper()}.")
+                        break
+                    logger.warning(f"Circuito abierto para {breaker.name} y sin estrategia de respaldo. Se intenta igualmente.")
+                proxies = None
+                proxy_url = None
+                log_ip_info = "Conexión Directa (VPN)"
+
+                try:
+                    if strategy == 'proxy':
+                        proxies = self.proxy_provider.get_proxy()
+                        proxy_url = proxies.get("https") if proxies else None
+                        # Los proxies SOCKS de la lista no los soporta aiohttp por petición.
+                        if proxy_url and proxy_url.startswith("socks"):
+                            proxy_url = None
+                        log_ip_info = f"Proxy: {proxy_url}" if proxy_url else log_ip_info
+                    elif strategy == 'tor':
+                        log_ip_info = f"TOR: {tor_proxies['https']}"
+
+                    logger.info(f"Intento {attempt}/{config.MAX_RETRIES} | {method.upper()} {url} | Usando: {log_ip_info}")
+
+                    session = await self._get_session(strategy, tor_proxies["https"] if tor_proxies else None)
+                    # Los reintentos esperan fuera del slot, igual que en `make_request`.
+                    async with self._semaphore, outbound_throttle.async_slot():
+                        started = time.monotonic()
+                        async with session.request(
+                            method.upper(),
+                            url,
+                            headers=_get_headers(headers),
+                            json=json_payload if method.upper() == 'POST' else None,
+                            proxy=proxy_url
+                        ) as resp:
+                            content = await resp.read()
+                            response = AsyncResponse(
+                                status_code=resp.status,
+                                url=str(resp.url),
+                                content=content,
+                                encoding=resp.charset or "utf-8",
+                                headers=dict(resp.headers)
+                            )
+
+                    logger.info(f"Respuesta: {response.status_code} | URL Final: {response.url}")
+                    outbound_throttle.record_status(response.status_code)
+                    breaker.record_status(response.status_code)
+                    if proxy_url:
+                        self.proxy_provider.report_result(proxies, response.status_code, time.monotonic() - started)
+
+                    if response.status_code in config.SUCCESS_CODES:
+                        if http_cache.enabled and response.status_code == 200:
+                            await asyncio.to_thread(http_cache.put, method, url, json_payload, CachedResponse(
+                                status_code=response.status_code,
+                                url=response.url,
+                                content=response.content,
+                                encoding=response.encoding,
+                                headers=response.headers
+                            ))
+                        return response
+
+                    if response.status_code in config.NON_RETRYABLE_CODES:
+                        logger.warning(f"Respuesta definitiva {response.status_code} para {url}. No se reintenta.")
+                        return response
+
+                    if strategy == 'tor' and _is_block(response.status_code, response.text):
+                        logger.warning(f"Código de bloqueo {response.status_code} con TOR. Rotando IP...")
+                        # La rotación (o la espera a la que ya está en curso) bloquea: se delega a un hilo.
+                        await asyncio.to_thread(self.tor_rotator.report_block, tor_proxies)
+
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    outbound_throttle.record_failure()
+                    breaker.record_failure()
+                    if proxy_url:
+                        self.proxy_provider.report_result(proxies)
+                    logger.warning(f"Error de red en intento {attempt} con {strategy.upper()}: {e}")
+
+                if attempt < config.MAX_RETRIES:
+                    await asyncio.sleep(_retry_delay(attempt))
+
+            if strategy != strategies[-1]:
+                logger.warning(f"La estrategia {strategy.upper()} falló. Pasando a la siguiente...")
+
+        logger.error(f"Todos los intentos y estrategias fallaron para la URL: {url}")
+        return None
@@ -0,0 +1,100 @@
+# En: infrastructure/scraper/graphql_title_fetcher.py
+
+import logging
+import threading
+from typing import Dict, List
+
+from domain.interfaces.proxy_interface import ProxyProviderInterface
+from domain.interfaces.tor_interface import TorInterface
+from domain.models import Movie
+from infrastructure.scraper.title_parsers import movie_from_title_node, dig
+from infrastructure.scraper.utils import make_request
+from shared.config import config
+
+logger = logging.getLogger(__name__)
+
+
+class GraphqlTitleFetcher:
+    """
+    Obtiene el detalle de varias películas por petición usando la API GraphQL de IMDb.
+
+    Una consulta `titles(ids: [...])` devuelve título, año, rating, duración, metascore
+    y reparto principal de hasta `GRAPHQL_DETAIL_BATCH_SIZE` títulos, en lugar de
+    descargar una página HTML de cientos de KB por película.
+    """
+
+    def __init__(
+        self,
+        proxy_provider: ProxyProviderInterface,
+        tor_rotator: TorInterface,
+        batch_size: int = config.GRAPHQL_DETAIL_BATCH_SIZE
+    ):
+        self.proxy_provider = proxy_provider
+        self.tor_rotator = tor_rotator
+        self.batch_size = batch_size
+        self.total_bytes_used = 0
+        self._bytes_lock = threading.Lock()
+
+    def chunk(self, imdb_ids: List[str]) -> List[List[str]]:
+        """Divide la lista de IDs en lotes de `batch_size`."""
+        return [imdb_ids[i:i + self.batch_size] for i in range(0, len(imdb_ids), self.batch_size)]
+
+    def fetch_batch(self, imdb_ids: List[str]) -> Dict[str, Movie]:
+        """
+        Descarga un lote de títulos.
+
+        Returns:
+            Dict[str, Movie]: Películas obtenidas y válidas, por imdb_id. Los IDs que no
+                              aparezcan (error de red, dato incompleto o inválido) deben
+                              reintentarse por la vía HTML.
+        """
+        payload = {
+            "operationName": "TitleDetailsBatch",
+            "query": config.GRAPHQL_DETAIL_QUERY,
+            "variables": {"ids": imdb_ids, "castLimit": 3}
+        }
+        response = make_request(
+            url=config.GRAPHQL_DETAIL_URL,
+            proxy_provider=self.proxy_provider,
+            tor_rotator=self.tor_rotator,
+            method="POST",
+            json_payload=payload,
+            headers={"Content-Type": "application/json", "x-imdb-user-language": config.GRAPHQL_LOCALE}
+        )
+        if not response:
+            logger.warning(f"[GraphQL] Lote de {len(imdb_ids)} títulos sin respuesta.")
+            return {}
+
+        with self._bytes_lock:
+            self.total_bytes_used += len(response.content)
+
+        try:
+            data = response.json()
+        except ValueError as e:
+            logger.error(f"[GraphQL] Respuesta no es JSON: {e}")
+            return {}
+
+        if data.get("errors"):
+            logger.warning(f"[GraphQL] Errores en la respuesta del lote: {data['errors'][:1]}")
+
+        movies: Dict[str, Movie] = {}
+        for node in dig(data, "data", "titles") or []:
+            imdb_id = dig(node, "id")
+            if not imdb_id:
+                continue
+            credits = [
+                credit
+                for group in (dig(node, "principalCredits") or [])
+                for credit in (dig(group, "credits") or [])
+            ]
+            names = [dig(credit, "name", "nameText", "text") for credit in credits]
+            try:
+                movie = movie_from_title_node(imdb_id, node, names)
+            except ValueError as e:
+                logger.warning(f"[GraphQL] Datos inválidos para {imdb_id}: {e}. Se usará la página HTML.")
+                continue
+            if movie:
+                movies[imdb_id] = movie
+
+        logger.info(f"[GraphQL] Lote: {len(movies)}/{len(imdb_ids)} títulos obtenidos.")
+        return movies
@@ -1,8 +1,10 @@
 # En: infrastructure/scraper/imdb_scraper.py
 
+import hashlib
+import json
 import logging
-import re
-from typing import List, Optional
+import threading
+from typing import Dict, List, Optional, Set, Union
 from concurrent.futures import ThreadPoolExecutor
 from bs4 import BeautifulSoup
 import requests
@@ -12,8 +14,13 @@ from domain.interfaces.use_case_interface import UseCaseInterface
 from domain.interfaces.proxy_interface import ProxyProviderInterface
 from domain.interfaces.tor_interface import TorInterface
 
-from domain.models import Movie, Actor
-from infrastructure.scraper.utils import make_request
+from domain.models import Movie
+from infrastructure.scraper.utils import make_request, is_definitive_failure
+from infrastructure.scraper.title_parsers import TitlePageParser, build_title_parser, get_soup_features
+from infrastructure.scraper.graphql_title_fetcher import GraphqlTitleFetcher
+from infrastructure.scraper.scrape_pipeline import ScrapePipeline, UNCHANGED, NOT_FOUND
+from infrastructure.scraper.scrape_checkpoint import ScrapeCheckpoint
+from infrastructure.network.rate_limiter import outbound_throttle
 from shared.config import config
 
 logger = logging.getLogger(__name__)
@@ -28,106 +35,279 @@ class ImdbScraper(ScraperInterface):
         proxy_provider: ProxyProviderInterface,
         tor_rotator: TorInterface,
         engine: str,
-        base_url: str = config.BASE_URL
+        base_url: str = config.BASE_URL,
+        title_parser: Optional[TitlePageParser] = None,
+        graphql_fetcher: Optional[GraphqlTitleFetcher] = None,
+        checkpoint: Optional[ScrapeCheckpoint] = None,
+        incremental: bool = config.SCRAPE_INCREMENTAL,
+        assigned: Optional[List[tuple[int, str]]] = None,
+        sinks: Optional[List[UseCaseInterface]] = None,
+        refresh_ids: Optional[Set[str]] = None
     ):
         self.use_case = use_case
+        # Persistencias por separado (CSV, PostgreSQL...) para el pipeline: cada una con
+        # su propio escritor. Sin ellas, el pipeline escribe en `use_case`.
+        self.sinks = sinks
         self.proxy_provider = proxy_provider
         self.tor_rotator = tor_rotator
         self.engine = engine
         self.base_url = base_url
         self.total_bytes_used = 0
+        self._bytes_lock = threading.Lock()
+        self.title_parser = title_parser or build_title_parser()
+        # Opcional: detalle por lotes vía GraphQL; la página HTML queda como fallback.
+        self.graphql_fetcher = graphql_fetcher
+        # Scraping incremental: títulos ya persistidos no se descargan; el checkpoint
+        # permite reanudar una ejecución interrumpida y aplicar la política de refresco.
+        self.checkpoint = checkpoint
+        self.incremental = incremental
+        # Modo --workers: pares (puesto, imdb_id) ya seleccionados por el proceso padre;
+        # el shard no vuelve a pedir el chart ni a filtrar pendientes.
+        self.assigned = assigned
+        # Títulos que ya están en todas las persistencias y solo se refrescan por caducados:
+        # únicamente a estos se les envían validadores y se les omite el guardado por hash.
+        # Un título que falta en algún sink se descarga sin condiciones y se escribe.
+        # En un shard los calcula el proceso padre (`_select_pending`).
+        self.refresh_ids: Set[str] = set(refresh_ids or ())
+        # Validadores HTTP y hash de cada título en curso; pasan al checkpoint solo tras guardarse.
+        self.conditional_requests = config.SCRAPE_CONDITIONAL_REQUESTS and checkpoint is not None
+        self._pending_details: Dict[str, dict] = {}
+        self._details_lock = threading.Lock()
 
     def scrape(self) -> None:
         logger.info("Iniciando scraping desde IMDb...")
-        movie_ids = self._get_combined_movie_ids()
-        if not movie_ids:
-            logger.error("No se pudieron obtener IDs de películas.")
+        pending = list(self.assigned) if self.assigned is not None else self.plan_run()
+        if pending is None:
             return
+        resolved: List[Movie] = []
+        if self.graphql_fetcher:
+            resolved, pending = self._fetch_graphql_batches(pending)
 
-        with ThreadPoolExecutor(max_workers=config.MAX_THREADS) as executor:
-            executor.map(
-                self._scrape_and_save_movie_detail,
-                enumerate(movie_ids[:config.NUM_MOVIES], start=1)
-            )
+        # Etapas desacopladas: los hilos de red solo descargan; el parseo y la escritura
+        # por lotes en cada sink corren en sus propios hilos con colas acotadas.
+        # MAX_THREADS es el techo de hilos de descarga; el número real de peticiones en
+        # vuelo lo decide el controlador AIMD (outbound_throttle) según la tasa de bloqueos.
+        pipeline = ScrapePipeline(
+            fetch=self._fetch_movie_page,
+            parse=self._parse_if_changed,
+            sinks=self._get_sinks(),
+            fetch_workers=outbound_throttle.max_concurrency,
+            on_saved=self._mark_saved,
+            priority=self._priority
+        )
+        pipeline.run(pending, movies=resolved)
+        self._finish_run()
 
+        if self.graphql_fetcher:
+            self.total_bytes_used += self.graphql_fetcher.total_bytes_used
         logger.info("Scraping completado.")
         logger.info(f"Tráfico total usado: {self.total_bytes_used / (1024 ** 2):.2f} MB")
+        logger.info(f"Estado final del throttle: {outbound_throttle.stats()}")
 
-    def _scrape_and_save_movie_detail(self, indexed_id: tuple[int, str]) -> None:
-        imdb_id = indexed_id[1]
-        try:
-            movie = self._scrape_movie_detail(indexed_id)
-            if movie:
-                self.use_case.execute(movie)
-        except ValueError as e:
-            logger.warning(f"Datos inválidos para {imdb_id}: {e}. Saltando guardado.")
-        except Exception as e:
-            logger.error(f"Error inesperado al procesar y guardar {imdb_id}: {e}", exc_info=True)
+    def plan_run(self) -> Optional[List[tuple[int, str]]]:
+        """
+        Obtiene los IDs de la ejecución (reanudando la anterior si quedó a medias), la
+        registra en el checkpoint y devuelve los pares (puesto, imdb_id) por descargar.
+        Devuelve None si no se pudieron obtener IDs.
+        """
+        movie_ids = self._resume_run_ids() or self._get_combined_movie_ids()
+        if not movie_ids:
+            logger.error("No se pudieron obtener IDs de películas.")
+            return None
+
+        movie_ids = movie_ids[:config.NUM_MOVIES]
+        self._start_run(movie_ids)
+        return self._ranked(movie_ids, self._select_pending(movie_ids))
+
+    def _resume_run_ids(self) -> Optional[List[str]]:
+        """IDs de una ejecución anterior interrumpida, si el checkpoint la tiene."""
+        if not self.checkpoint:
+            return None
+        resumed = self.checkpoint.pending_run_ids()
+        if resumed:
+            logger.info(f"[Checkpoint] Reanudando ejecución interrumpida ({len(resumed)} títulos).")
+        return resumed
+
+    def _start_run(self, movie_ids: List[str]) -> None:
+        if self.checkpoint:
+            self.checkpoint.start_run(movie_ids)
+
+    def _finish_run(self) -> None:
+        if self.checkpoint:
+            self.checkpoint.finish_run()
+
+    def _mark_saved(self, imdb_ids: List[str]) -> None:
+        if not self.checkpoint:
+            return
+        with self._details_lock:
+            details = {imdb_id: self._pending_details.pop(imdb_id) for imdb_id in imdb_ids if imdb_id in self._pending_details}
+        self.checkpoint.mark_saved(imdb_ids, details)
+
+    def _discard_details(self, imdb_id: str) -> None:
+        """Olvida los validadores y el hash de un título que no llegó a guardarse."""
+        with self._details_lock:
+            self._pending_details.pop(imdb_id, None)
+
+    def _is_refresh(self, imdb_id: str) -> bool:
+        """True si el título está en todos los sinks y puede omitirse si no cambió."""
+        return self.conditional_requests and imdb_id in self.refresh_ids
+
+    def _conditional_headers(self, imdb_id: str) -> Optional[dict]:
+        """
+        If-None-Match / If-Modified-Since con los validadores de la última descarga guardada,
+        solo para títulos que se refrescan (ver `refresh_ids`).
+        """
+        if not self._is_refresh(imdb_id):
+            return None
+        title = self.checkpoint.get_title(imdb_id)
+        headers = {}
+        if title.get("etag"):
+            headers["If-None-Match"] = title["etag"]
+        if title.get("last_modified"):
+            headers["If-Modified-Since"] = title["last_modified"]
+        return headers or None
+
+    def _remember_validators(self, imdb_id: str, response_headers) -> None:
+        if not self.conditional_requests:
+            return
+        normalized = {key.lower(): value for key, value in response_headers.items()}
+        with self._details_lock:
+            details = self._pending_details.setdefault(imdb_id, {})
+            details["etag"] = normalized.get("etag")
+            details["last_modified"] = normalized.get("last-modified")
+
+    @staticmethod
+    def _content_hash(movie: Movie) -> str:
+        """Hash de los campos extraídos (sin el ID interno, que depende de la persistencia)."""
+        fields = [
+            movie.imdb_id, movie.title, movie.year, movie.rating,
+            movie.duration_minutes, movie.metascore, [actor.name for actor in movie.actors]
+        ]
+        return hashlib.sha256(json.dumps(fields, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+    def _parse_if_changed(self, imdb_id: str, html: str) -> Union[Movie, object]:
+        """
+        Parsea la página y devuelve UNCHANGED si el título se refresca y los datos extraídos
+        son idénticos a los de la última vez (mismo hash): así se evitan escrituras en
+        CSV/PostgreSQL. El hash se registra siempre, para comparar en el siguiente refresco.
+        """
+        return self._skip_if_unchanged(self._parse_movie_detail(imdb_id, html))
+
+    def _skip_if_unchanged(self, movie: Movie) -> Union[Movie, object]:
+        """Compara el hash de la película con el guardado (ver `_parse_if_changed`)."""
+        if not self.conditional_requests:
+            return movie
+
+        imdb_id = movie.imdb_id
+        content_hash = self._content_hash(movie)
+        if self._is_refresh(imdb_id) and self.checkpoint.get_title(imdb_id).get("content_hash") == content_hash:
+            logger.info(f"[Condicional] {imdb_id} sin cambios en los datos. Saltando guardado.")
+            self._mark_saved([imdb_id])
+            return UNCHANGED
+        with self._details_lock:
+            self._pending_details.setdefault(imdb_id, {})["content_hash"] = content_hash
+        return movie
+
+    def _select_pending(self, movie_ids: List[str]) -> List[str]:
+        """
+        Filtra los IDs que hay que descargar: los que falten en alguna persistencia
+        y, con `SCRAPE_REFRESH_MAX_AGE`, los guardados hace demasiado tiempo.
+        """
+        if not self.incremental:
+            return movie_ids
+
+        known = self.use_case.known_imdb_ids() or set()
+        max_age = config.SCRAPE_REFRESH_MAX_AGE
+        selected = [
+            imdb_id for imdb_id in movie_ids
+            if imdb_id not in known or (self.checkpoint and self.checkpoint.is_stale(imdb_id, max_age))
+        ]
+        self.refresh_ids = {imdb_id for imdb_id in selected if imdb_id in known}
+        logger.info(f"[Incremental] {len(movie_ids) - len(selected)} títulos ya guardados se omiten; {len(selected)} por descargar.")
+        return selected
+
+    @staticmethod
+    def _ranked(movie_ids: List[str], selected: List[str]) -> List[tuple[int, str]]:
+        """Pares (puesto en el chart, imdb_id) de los títulos seleccionados."""
+        ranks = {imdb_id: rank for rank, imdb_id in enumerate(movie_ids, start=1)}
+        return [(ranks[imdb_id], imdb_id) for imdb_id in selected]
+
+    def _priority(self, indexed_id: tuple[int, str]) -> tuple:
+        """
+        Orden de descarga: primero los títulos nunca guardados, por puesto en el chart;
+        después los que se refrescan por caducados, del guardado más antiguo al más reciente.
+        """
+        rank, imdb_id = indexed_id
+        saved_at = self.checkpoint.get_title(imdb_id).get("saved_at") if self.checkpoint else None
+        return (0, rank) if saved_at is None else (1, saved_at)
+
+    def _get_sinks(self) -> List[UseCaseInterface]:
+        """Sinks del pipeline: las persistencias inyectadas o, si no hay, el caso de uso principal."""
+        return list(self.sinks) if self.sinks else [self.use_case]
+
+    def _fetch_graphql_batches(
+        self,
+        pending: List[tuple[int, str]]
+    ) -> tuple[List[Movie], List[tuple[int, str]]]:
+        """
+        Descarga el detalle por lotes GraphQL.
 
-    def _scrape_movie_detail(self, indexed_id: tuple[int, str]) -> Optional[Movie]:
-        movie_id_counter, imdb_id = indexed_id
+        Returns:
+            tuple: (películas obtenidas y por guardar, IDs que el lote no resolvió y van por la vía HTML).
+        """
+        batches = self.graphql_fetcher.chunk([imdb_id for _, imdb_id in pending])
+        logger.info(f"[GraphQL] Obteniendo detalle de {len(pending)} títulos en {len(batches)} lotes...")
+
+        resolved = {}
+        with ThreadPoolExecutor(max_workers=min(len(batches), outbound_throttle.max_concurrency) or 1) as executor:
+            for batch_movies in executor.map(self.graphql_fetcher.fetch_batch, batches):
+                resolved.update(batch_movies)
+
+        remaining = [indexed_id for indexed_id in pending if indexed_id[1] not in resolved]
+        if remaining:
+            logger.info(f"[GraphQL] {len(remaining)} títulos sin resolver. Usando páginas HTML.")
+        # Igual que en la vía HTML: se registra el hash y se omiten los refrescos sin cambios.
+        movies = [self._skip_if_unchanged(movie) for movie in resolved.values()]
+        return [movie for movie in movies if movie is not UNCHANGED], remaining
+
+    def _fetch_movie_page(self, indexed_id: tuple[int, str]) -> Union[str, object, None]:
+        """
+        Descarga la página de detalle y devuelve su HTML (None si falló, UNCHANGED si 304,
+        NOT_FOUND si el título no existe).
+        """
+        _, imdb_id = indexed_id
         detail_url = self.base_url + config.TITLE_DETAIL_PATH.format(id=imdb_id)
 
         response = make_request(
             url=detail_url,
             proxy_provider=self.proxy_provider,
-            tor_rotator=self.tor_rotator
+            tor_rotator=self.tor_rotator,
+            headers=self._conditional_headers(imdb_id)
         )
 
+        if is_definitive_failure(response):
+            logger.warning(f"{imdb_id} no disponible ({response.status_code}). Se descarta sin reintentar.")
+            return NOT_FOUND
         if not response:
             logger.warning(f"No se pudo obtener respuesta para la URL: {detail_url}")
             return None
 
-        self.total_bytes_used += len(response.content)
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        # Lógica de parsing segura
-        title_tag = soup.select_one(config.SELECTORS.get("title", ""))
-        title = title_tag.text.strip() if title_tag else ""
-
-        year_tag = soup.select_one(config.SELECTORS.get("year", ""))
-        year_str = year_tag.text.strip("()") if year_tag else "0"
-        year_match = re.search(r'\d{4}', year_str)
-        year = int(year_match.group()) if year_match else 0
-        
-        rating_tag = soup.select_one(config.SELECTORS.get("rating", ""))
-        rating = float(rating_tag.text.strip()) if rating_tag else 0.0
-
-        metascore_tag = soup.select_one(config.SELECTORS.get("metascore", ""))
-        metascore = int(metascore_tag.text.strip()) if metascore_tag else None
-
-        # Duración en minutos
-        duration = None
-        ul_list = soup.select(config.SELECTORS.get("duration_container", ""))
-        for ul in ul_list:
-            for li in ul.find_all("li"):
-                text = li.get_text(strip=True).lower()
-                if re.search(r"(\d+h|\d+m)", text):
-                    hours_match = re.search(r"(\d+)h", text)
-                    minutes_match = re.search(r"(\d+)m", text)
-                    h = int(hours_match.group(1)) if hours_match else 0
-                    m = int(minutes_match.group(1)) if minutes_match else 0
-                    duration = (h * 60) + m
-                    break
-            if duration:
-                break
-
-        cast_tags = soup.select(config.SELECTORS.get("actors", ""))[:3]
-        actors = [
-            Actor(id=None, name=cast.text.strip())
-            for cast in cast_tags if cast.text.strip()
-        ]
+        with self._bytes_lock:
+            self.total_bytes_used += len(response.content)
 
-        return Movie(
-            id=None,
-            imdb_id=imdb_id,
-            title=title,
-            year=year,
-            rating=rating,
-            duration_minutes=duration,
-            metascore=metascore,
-            actors=actors
-        )
+        if response.status_code == 304:
+            logger.info(f"[Condicional] {imdb_id} sin cambios (304).")
+            self._mark_saved([imdb_id])
+            return UNCHANGED
+        self._remember_validators(imdb_id, response.headers)
+        return response.text
+
+    def _parse_movie_detail(self, imdb_id: str, html: str) -> Movie:
+        """
+        Construye el objeto Movie a partir del HTML de la página de detalle.
+        Separado de la descarga para poder reutilizarlo desde otros motores (ej. async).
+        """
+        return self.title_parser.parse(imdb_id, html)
 
     def _get_combined_movie_ids(self) -> List[str]:
         ids = set()
@@ -141,12 +321,7 @@ class ImdbScraper(ScraperInterface):
 
         if response:
             cookies = response.cookies
-            soup = BeautifulSoup(response.text, "html.parser")
-            html_ids = [
-                a["href"].split("/")[2]
-                for a in soup.select("td.titleColumn a")
-                if "/title/" in a["href"]
-            ]
+            html_ids = self._parse_chart_ids(response.text)
             logger.info(f"[HTML] IDs obtenidos: {len(html_ids)}")
             ids.update(html_ids)
             
@@ -155,14 +330,35 @@ class ImdbScraper(ScraperInterface):
 
         return list(ids)
 
+    @staticmethod
+    def _parse_chart_ids(html: str) -> List[str]:
+        """Extrae los IDs de IMDb desde el HTML del chart."""
+        soup = BeautifulSoup(html, get_soup_features())
+        return [
+            a["href"].split("/")[2]
+            for a in soup.select("td.titleColumn a")
+            if "/title/" in a["href"]
+        ]
+
+    @staticmethod
+    def _build_graphql_ids_payload() -> dict:
+        """Payload de la consulta persistida de GraphQL para el Top 250."""
+        return {
+            "operationName": config.GRAPHQL_OPERATION,
+            "variables": { "first": config.NUM_MOVIES, "isInPace": False, "locale": config.GRAPHQL_LOCALE },
+            "extensions": { "persistedQuery": { "sha256Hash": config.GRAPHQL_HASH, "version": config.GRAPHQL_VERSION } }
+        }
+
+    @staticmethod
+    def _parse_graphql_ids(data: dict) -> List[str]:
+        """Extrae los IDs de la respuesta JSON de GraphQL."""
+        edges = data.get("data", {}).get("chartTitles", {}).get("edges", [])
+        return [edge["node"]["id"] for edge in edges if edge.get("node", {}).get("id")]
+
     def _fetch_graphql_ids(self, cookies: Optional[requests.cookies.RequestsCookieJar]) -> List[str]:
         logger.info("Obteniendo IDs adicionales desde GraphQL...")
         try:
-            payload = {
-                "operationName": config.GRAPHQL_OPERATION,
-                "variables": { "first": config.NUM_MOVIES, "isInPace": False, "locale": config.GRAPHQL_LOCALE },
-                "extensions": { "persistedQuery": { "sha256Hash": config.GRAPHQL_HASH, "version": config.GRAPHQL_VERSION } }
-            }
+            payload = self._build_graphql_ids_payload()
 
             response = make_request(
                 url=config.GRAPHQL_URL,
@@ -173,9 +369,7 @@ class ImdbScraper(ScraperInterface):
             )
 
             if response:
-                data = response.json()
-                edges = data.get("data", {}).get("chartTitles", {}).get("edges", [])
-                ids = [edge["node"]["id"] for edge in edges if edge.get("node", {}).get("id")]
+                ids = self._parse_graphql_ids(response.json())
                 logger.info(f"[GraphQL] IDs obtenidos: {len(ids)}")
                 return ids
         except Exception as e:
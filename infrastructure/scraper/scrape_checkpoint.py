@@ -0,0 +1,141 @@
+# En: infrastructure/scraper/scrape_checkpoint.py
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from shared.config import config
+
+logger = logging.getLogger(__name__)
+
+
+class ScrapeCheckpoint:
+    """
+    Estado persistente del scraping incremental, en un archivo JSON:
+
+    - `titles`: por imdb_id, cuándo se guardó por última vez (para la política de refresco),
+      los validadores HTTP de su página (ETag, Last-Modified) y el hash de los datos extraídos.
+    - `run`: IDs de la ejecución en curso y si terminó. Si el proceso se cae, la
+      siguiente ejecución reutiliza esa lista (sin volver a pedir el chart) y solo
+      descarga los títulos que aún no se completaron.
+
+    Las escrituras son atómicas (archivo temporal + os.replace): un corte a mitad de
+    escritura nunca deja un checkpoint corrupto.
+    """
+
+    def __init__(self, path: str = config.SCRAPE_CHECKPOINT_PATH, save_every: int = config.SCRAPE_CHECKPOINT_EVERY):
+        self.path = path
+        self.save_every = save_every
+        self._lock = threading.Lock()
+        self._unsaved = 0
+        self._state = self._load()
+
+    def _load(self) -> dict:
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    state = json.load(f)
+                state.setdefault("titles", {})
+                state.setdefault("run", None)
+                return state
+            except (OSError, ValueError) as e:
+                logger.warning(f"[Checkpoint] No se pudo leer {self.path}: {e}. Se empieza de cero.")
+        return {"titles": {}, "run": None}
+
+    def pending_run_ids(self) -> Optional[List[str]]:
+        """IDs de una ejecución anterior que no llegó a terminar, o None."""
+        run = self._state.get("run")
+        if run and not run.get("finished"):
+            return list(run.get("ids", []))
+        return None
+
+    def start_run(self, imdb_ids: List[str]) -> None:
+        """Registra la lista de IDs de la ejecución que comienza."""
+        with self._lock:
+            self._state["run"] = {"started_at": time.time(), "ids": list(imdb_ids), "finished": False}
+            self._save_locked()
+
+    def finish_run(self) -> None:
+        with self._lock:
+            if self._state.get("run"):
+                self._state["run"]["finished"] = True
+            self._save_locked()
+
+    def is_stale(self, imdb_id: str, max_age: Optional[float]) -> bool:
+        """
+        True si el título se guardó hace más de `max_age` segundos. Sin política de
+        refresco (max_age None) o sin registro previo, no se considera caducado.
+        """
+        if max_age is None:
+            return False
+        with self._lock:
+            entry = self._state["titles"].get(imdb_id)
+        return bool(entry) and time.time() - entry.get("saved_at", 0) > max_age
+
+    def get_title(self, imdb_id: str) -> Dict:
+        """Copia de lo registrado para un título (vacío si no hay nada)."""
+        with self._lock:
+            return dict(self._state["titles"].get(imdb_id, {}))
+
+    def mark_saved(self, imdb_ids: Iterable[str], details: Optional[Dict[str, dict]] = None) -> None:
+        """
+        Marca títulos como guardados; el archivo se reescribe cada `save_every` marcas.
+
+        Args:
+            details: Por imdb_id, campos a registrar junto con la marca (etag, last_modified,
+                     content_hash). Solo se guardan tras persistir, para que un fallo de
+                     escritura nunca haga que la próxima ejecución dé el título por vigente.
+        """
+        now = time.time()
+        details = details or {}
+        with self._lock:
+            for imdb_id in imdb_ids:
+                entry = self._state["titles"].setdefault(imdb_id, {})
+                entry.update(details.get(imdb_id, {}))
+                entry["saved_at"] = now
+                self._unsaved += 1
+            if self._unsaved >= self.save_every:
+                self._save_locked()
+
+    def export_titles(self, path: str, imdb_ids: Iterable[str]) -> None:
+        """
+        Escribe en `path` un checkpoint con solo los títulos indicados (modo --workers):
+        cada shard arranca con los validadores HTTP y hashes de sus títulos.
+        """
+        with self._lock:
+            titles = {i: dict(self._state["titles"][i]) for i in imdb_ids if i in self._state["titles"]}
+        shard = ScrapeCheckpoint(path, self.save_every)
+        shard._state = {"titles": titles, "run": None}
+        shard.save()
+
+    def merge(self, path: str) -> int:
+        """
+        Incorpora los títulos guardados por otro checkpoint (el de un shard) y lo guarda.
+
+        Returns:
+            int: Número de títulos incorporados.
+        """
+        other = ScrapeCheckpoint(path, self.save_every)
+        with self._lock:
+            for imdb_id, entry in other._state["titles"].items():
+                self._state["titles"].setdefault(imdb_id, {}).update(entry)
+            self._save_locked()
+        return len(other._state["titles"])
+
+    def save(self) -> None:
+        with self._lock:
+            self._save_locked()
+
+    def _save_locked(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._state, f)
+            os.replace(tmp_path, self.path)
+            self._unsaved = 0
+        except OSError as e:
+            logger.error(f"[Checkpoint] No se pudo guardar {self.path}: {e}")
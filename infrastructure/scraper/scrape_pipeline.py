@@ -0,0 +1,256 @@
+# En: infrastructure/scraper/scrape_pipeline.py
+
+import logging
+import queue
+import threading
+import time
+from typing import Callable, Hashable, Iterable, List, Optional
+
+from domain.interfaces.use_case_interface import UseCaseInterface
+from domain.models import Movie
+from infrastructure.scraper.scrape_scheduler import ScrapeScheduler
+from shared.config import config
+
+logger = logging.getLogger(__name__)
+
+# Marca de fin de trabajo que cada etapa propaga a la siguiente.
+_STOP = object()
+# Valor que `fetch` o `parse` devuelven cuando el título no cambió (304 o mismo hash):
+# se descarta sin pasar por las etapas siguientes.
+UNCHANGED = object()
+# Valor que `fetch` devuelve cuando el título no existe (404): fallo definitivo, la tarea
+# se da por terminada sin reintentos.
+NOT_FOUND = object()
+
+
+class ScrapePipeline:
+    """
+    Pipeline por etapas para scraping y persistencia:
+
+        scheduler → fetch workers → cola → parse workers → cola por sink → sink writer (por lotes)
+
+    Los fetch workers toman los títulos de un `ScrapeScheduler` (cola de prioridad con
+    reintentos diferidos): una descarga fallida vuelve a la cola en lugar de perderse.
+    Las demás colas están acotadas, así que una etapa lenta frena a la anterior
+    (backpressure) sin acumular memoria. Cada sink (CSV, PostgreSQL...) tiene su
+    propio hilo escritor y su propia cola: un sink lento nunca ocupa los hilos de red,
+    y el resto de sinks sigue escribiendo lo que ya tiene encolado. Cuando la cola del
+    sink lento se llena, los parse workers esperan en ella, de modo que el ritmo global
+    del pipeline lo marca el sink más lento.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[tuple[int, str]], Optional[str]],
+        parse: Callable[[str, str], Movie],
+        sinks: List[UseCaseInterface],
+        fetch_workers: int = config.MAX_THREADS,
+        parse_workers: int = config.PIPELINE_PARSE_WORKERS,
+        queue_size: int = config.PIPELINE_QUEUE_SIZE,
+        sink_batch_size: int = config.PIPELINE_SINK_BATCH_SIZE,
+        sink_flush_interval: float = config.PIPELINE_SINK_FLUSH_INTERVAL,
+        on_saved: Optional[Callable[[List[str]], None]] = None,
+        priority: Optional[Callable[[tuple[int, str]], Hashable]] = None,
+        max_attempts: int = config.SCRAPE_MAX_ATTEMPTS
+    ):
+        """
+        Args:
+            fetch: Descarga la página de un (índice, imdb_id); devuelve el HTML, None (fallo
+                   reintentable), UNCHANGED o NOT_FOUND.
+            parse: Convierte (imdb_id, html) en Movie (o UNCHANGED); puede lanzar ValueError.
+            sinks: Casos de uso de persistencia; cada uno recibe lotes vía `execute_many`.
+            on_saved: Se llama con los imdb_id que todos los sinks persistieron (ej. checkpoint).
+                      Un título que falla en algún sink no se notifica.
+            priority: Clave de orden de cada (índice, imdb_id); por defecto, el índice.
+            max_attempts: Descargas como máximo por título antes de darlo por fallido.
+        """
+        self.fetch = fetch
+        self.parse = parse
+        self.sinks = sinks
+        self.fetch_workers = fetch_workers
+        self.parse_workers = parse_workers
+        self.sink_batch_size = sink_batch_size
+        self.sink_flush_interval = sink_flush_interval
+        self.on_saved = on_saved
+        self.priority = priority
+        self.max_attempts = max_attempts
+        self._sink_deliveries: dict = {}
+        self._scheduler: Optional[ScrapeScheduler] = None
+
+        self._parse_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._sink_queues: List[queue.Queue] = [queue.Queue(maxsize=queue_size) for _ in sinks]
+
+        self.stats = {"fetched": 0, "fetch_failed": 0, "requeued": 0, "not_found": 0, "unchanged": 0, "parsed": 0, "parse_failed": 0, "saved_batches": 0, "save_failed": 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, key: str) -> None:
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def run(self, items: Iterable[tuple[int, str]], movies: Iterable[Movie] = ()) -> None:
+        """
+        Ejecuta el pipeline completo y espera a que todas las etapas terminen.
+
+        Args:
+            items: Pares (índice, imdb_id) que deben descargarse y parsearse.
+            movies: Películas ya obtenidas por otra vía (ej. GraphQL) que van directo a los sinks.
+        """
+        self._scheduler = ScrapeScheduler(
+            items,
+            priority=self.priority,
+            max_attempts=self.max_attempts,
+            max_in_flight=self.fetch_workers
+        )
+        sink_threads = [
+            threading.Thread(target=self._sink_writer, args=(sink, q), name=f"sink-{type(sink).__name__}", daemon=True)
+            for sink, q in zip(self.sinks, self._sink_queues)
+        ]
+        parse_threads = [
+            threading.Thread(target=self._parse_worker, name=f"parse-{i}", daemon=True)
+            for i in range(self.parse_workers)
+        ]
+        fetch_threads = [
+            threading.Thread(target=self._fetch_worker, name=f"fetch-{i}", daemon=True)
+            for i in range(self.fetch_workers)
+        ]
+        for thread in sink_threads + parse_threads + fetch_threads:
+            thread.start()
+
+        for movie in movies:
+            self._publish(movie)
+
+        # Cierre ordenado: los fetch workers terminan cuando el scheduler se vacía
+        # (reintentos incluidos); después, cada etapa cuando la anterior ya no produce nada.
+        for thread in fetch_threads:
+            thread.join()
+        self._stop_stage(self._parse_queue, parse_threads)
+        for q in self._sink_queues:
+            q.put(_STOP)
+        for thread in sink_threads:
+            thread.join()
+
+        logger.info(f"[PIPELINE] Finalizado: {self.stats}")
+
+    @staticmethod
+    def _stop_stage(stage_queue: queue.Queue, threads: List[threading.Thread]) -> None:
+        for _ in threads:
+            stage_queue.put(_STOP)
+        for thread in threads:
+            thread.join()
+
+    def _publish(self, movie: Movie) -> None:
+        """
+        Entrega la película a la cola de cada sink. Bloquea si alguna está llena: es el
+        backpressure que limita la memoria al ritmo del sink más lento.
+        """
+        for q in self._sink_queues:
+            q.put(movie)
+
+    def _fetch_worker(self) -> None:
+        while True:
+            task = self._scheduler.get()
+            if task is None:
+                return
+            imdb_id = task.item[1]
+            try:
+                html = self.fetch(task.item)
+            except Exception as e:
+                logger.error(f"Error inesperado al descargar {imdb_id}: {e}", exc_info=True)
+                html = None
+            # El reintento se difiere en el scheduler: este hilo queda libre para otro título.
+            requeued = self._scheduler.complete(task, success=html is not None)
+            if html is None:
+                self._count("requeued" if requeued else "fetch_failed")
+                continue
+            if html is NOT_FOUND:
+                self._count("not_found")
+                continue
+            if html is UNCHANGED:
+                self._count("unchanged")
+                continue
+            self._count("fetched")
+            self._parse_queue.put((imdb_id, html))
+
+    def _parse_worker(self) -> None:
+        while True:
+            item = self._parse_queue.get()
+            if item is _STOP:
+                return
+            imdb_id, html = item
+            try:
+                movie = self.parse(imdb_id, html)
+            except ValueError as e:
+                logger.warning(f"Datos inválidos para {imdb_id}: {e}. Saltando guardado.")
+                self._count("parse_failed")
+                continue
+            except Exception as e:
+                logger.error(f"Error inesperado al parsear {imdb_id}: {e}", exc_info=True)
+                self._count("parse_failed")
+                continue
+            if movie is UNCHANGED:
+                self._count("unchanged")
+                continue
+            self._count("parsed")
+            self._publish(movie)
+
+    def _sink_writer(self, sink: UseCaseInterface, sink_queue: queue.Queue) -> None:
+        """
+        Acumula películas hasta `sink_batch_size` o hasta que pasen `sink_flush_interval`
+        segundos desde la primera del lote, y las entrega al sink de una vez.
+        """
+        batch: List[Movie] = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = sink_queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is not None and item is not _STOP:
+                if not batch:
+                    deadline = time.monotonic() + self.sink_flush_interval
+                batch.append(item)
+
+            full = len(batch) >= self.sink_batch_size
+            expired = deadline is not None and time.monotonic() >= deadline
+            if batch and (full or expired or item is _STOP):
+                self._flush(sink, batch)
+                batch = []
+                deadline = None
+
+            if item is _STOP:
+                return
+
+    def _flush(self, sink: UseCaseInterface, batch: List[Movie]) -> None:
+        try:
+            saved = sink.execute_many(batch)
+        except Exception as e:
+            logger.error(f"Error en el sink {type(sink).__name__} al guardar {len(batch)} películas: {e}", exc_info=True)
+            saved = []
+        if saved:
+            self._count("saved_batches")
+        failed = len(batch) - len(saved)
+        if failed:
+            with self._stats_lock:
+                self.stats["save_failed"] += failed
+            logger.warning(f"[PIPELINE] El sink {type(sink).__name__} no guardó {failed} de {len(batch)} películas.")
+        if self.on_saved and saved:
+            self._notify_saved(saved)
+
+    def _notify_saved(self, batch: List[Movie]) -> None:
+        """Avisa de los títulos que ya persistieron todos los sinks."""
+        completed = []
+        with self._stats_lock:
+            for movie in batch:
+                deliveries = self._sink_deliveries.get(movie.imdb_id, 0) + 1
+                if deliveries >= len(self.sinks):
+                    self._sink_deliveries.pop(movie.imdb_id, None)
+                    completed.append(movie.imdb_id)
+                else:
+                    self._sink_deliveries[movie.imdb_id] = deliveries
+        if completed:
+            try:
+                self.on_saved(completed)
+            except Exception as e:
+                logger.error(f"Error al registrar títulos guardados: {e}", exc_info=True)
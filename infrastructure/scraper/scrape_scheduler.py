@@ -0,0 +1,134 @@
+# En: infrastructure/scraper/scrape_scheduler.py
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Hashable, Iterable, List, Optional
+
+from shared.config import config
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ScrapeTask:
+    """Un título por descargar: `item` es el par (índice, imdb_id) y `attempts` los fallos previos."""
+    item: tuple
+    priority: Hashable
+    attempts: int = 0
+
+
+class ScrapeScheduler:
+    """
+    Cola de prioridad de títulos por descargar, compartida por los workers de descarga.
+
+    - Orden: primero los que aún no han fallado; dentro de cada ronda, por `priority(item)`
+      (ej. títulos nuevos por puesto en el chart y después los caducados, del más antiguo al
+      más reciente).
+    - Un título cuya descarga falla no se descarta: vuelve a la cola tras un backoff
+      (`retry_backoff · 2^(intento-1)`), sin ocupar un worker mientras espera, hasta
+      `max_attempts` intentos. Como los reintentos van detrás de la primera ronda, la cola
+      larga de fallos queda al final de la ejecución.
+    - Como mucho `max_in_flight` títulos se procesan a la vez.
+
+    `get` es bloqueante (workers en hilos); `poll` + `next_ready_in` sirven para corrutinas.
+    """
+
+    def __init__(
+        self,
+        items: Iterable[tuple],
+        priority: Optional[Callable[[tuple], Hashable]] = None,
+        max_attempts: int = config.SCRAPE_MAX_ATTEMPTS,
+        max_in_flight: int = config.MAX_THREADS,
+        retry_backoff: float = config.SCRAPE_RETRY_BACKOFF
+    ):
+        self.priority = priority or (lambda item: item[0])
+        self.max_attempts = max_attempts
+        self.max_in_flight = max_in_flight
+        self.retry_backoff = retry_backoff
+        self.failed: List[tuple] = []
+        self._seq = itertools.count()
+        self._ready: list = []
+        self._deferred: list = []
+        self._in_flight = 0
+        self._cond = threading.Condition()
+        for item in items:
+            self._push_ready_locked(ScrapeTask(item=item, priority=self.priority(item)))
+
+    def _push_ready_locked(self, task: ScrapeTask) -> None:
+        heapq.heappush(self._ready, (task.attempts, task.priority, next(self._seq), task))
+
+    def _promote_locked(self, now: float) -> None:
+        """Pasa a la cola de listos los reintentos cuyo backoff ya venció."""
+        while self._deferred and self._deferred[0][0] <= now:
+            _, _, task = heapq.heappop(self._deferred)
+            self._push_ready_locked(task)
+
+    @property
+    def finished(self) -> bool:
+        """True cuando no queda nada pendiente, diferido ni en vuelo."""
+        with self._cond:
+            return not self._ready and not self._deferred and self._in_flight == 0
+
+    def poll(self) -> Optional[ScrapeTask]:
+        """Devuelve la siguiente tarea lista sin bloquear, o None si ahora no hay ninguna."""
+        with self._cond:
+            return self._take_locked()
+
+    def _take_locked(self) -> Optional[ScrapeTask]:
+        self._promote_locked(time.monotonic())
+        if self._ready and self._in_flight < self.max_in_flight:
+            self._in_flight += 1
+            return heapq.heappop(self._ready)[-1]
+        return None
+
+    def next_ready_in(self) -> Optional[float]:
+        """Segundos hasta que venza el próximo reintento diferido (None si no hay)."""
+        with self._cond:
+            if not self._deferred:
+                return None
+            return max(0.0, self._deferred[0][0] - time.monotonic())
+
+    def get(self) -> Optional[ScrapeTask]:
+        """
+        Bloquea hasta que haya una tarea lista y la devuelve. Devuelve None cuando ya no
+        queda trabajo (ni siquiera reintentos posibles de las tareas en vuelo).
+        """
+        with self._cond:
+            while True:
+                task = self._take_locked()
+                if task is not None:
+                    return task
+                if not self._ready and not self._deferred and self._in_flight == 0:
+                    self._cond.notify_all()
+                    return None
+                timeout = None
+                if self._deferred:
+                    timeout = max(0.0, self._deferred[0][0] - time.monotonic())
+                self._cond.wait(timeout)
+
+    def complete(self, task: ScrapeTask, success: bool) -> bool:
+        """
+        Cierra una tarea. Si falló y le quedan intentos, la difiere con backoff.
+
+        Returns:
+            bool: True si la tarea se volvió a encolar.
+        """
+        with self._cond:
+            self._in_flight -= 1
+            requeued = False
+            if not success:
+                task.attempts += 1
+                if task.attempts < self.max_attempts:
+                    delay = self.retry_backoff * 2 ** (task.attempts - 1)
+                    heapq.heappush(self._deferred, (time.monotonic() + delay, next(self._seq), task))
+                    requeued = True
+                    logger.info(f"[Scheduler] {task.item[1]} reprogramado en {delay:.0f}s (intento {task.attempts + 1}/{self.max_attempts}).")
+                else:
+                    self.failed.append(task.item)
+                    logger.warning(f"[Scheduler] {task.item[1]} descartado tras {task.attempts} intentos.")
+            self._cond.notify_all()
+            return requeued
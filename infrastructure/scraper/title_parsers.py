@@ -0,0 +1,361 @@
+# En: infrastructure/scraper/title_parsers.py
+
+import html as html_lib
+import json
+import logging
+import re
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+from bs4 import BeautifulSoup
+
+from domain.models import Movie, Actor
+from shared.config import config
+
+logger = logging.getLogger(__name__)
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxHTMLParser
+except ImportError:  # selectolax es opcional
+    SelectolaxHTMLParser = None
+
+try:
+    import lxml  # noqa: F401  (solo se comprueba que el backend de BeautifulSoup existe)
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+
+def get_soup_features() -> str:
+    """Backend más rápido disponible para BeautifulSoup ('lxml' en C o 'html.parser')."""
+    return "lxml" if LXML_AVAILABLE else "html.parser"
+
+
+class TitlePageParser(ABC):
+    """
+    Extrae un objeto Movie del HTML de una página de detalle (/title/{id}/).
+    """
+    name = "base"
+
+    @abstractmethod
+    def parse(self, imdb_id: str, html: str) -> Movie:
+        """
+        Args:
+            imdb_id (str): ID de IMDb de la página.
+            html (str): HTML completo de la página de detalle.
+
+        Returns:
+            Movie: Película extraída (la validación la hace el propio modelo).
+        """
+        pass
+
+
+class SelectorTitlePageParser(TitlePageParser):
+    """
+    Extracción por selectores CSS (`config.SELECTORS`) sobre el árbol DOM.
+
+    La lógica de extracción (qué selector y cómo interpretar su texto) es común;
+    cada backend solo implementa cómo cargar el documento y consultar selectores CSS.
+    """
+
+    @abstractmethod
+    def _load(self, html: str) -> Any:
+        """Construye el documento del backend a partir del HTML."""
+        pass
+
+    @abstractmethod
+    def _first_text(self, doc: Any, selector: str) -> Optional[str]:
+        """Texto completo del primer nodo que cumple el selector, o None."""
+        pass
+
+    @abstractmethod
+    def _all_texts(self, doc: Any, selector: str, limit: int) -> List[str]:
+        """Textos de los primeros `limit` nodos que cumplen el selector."""
+        pass
+
+    @abstractmethod
+    def _list_item_texts(self, doc: Any, container_selector: str) -> List[str]:
+        """Textos (sin espacios) de cada <li> dentro de los contenedores indicados."""
+        pass
+
+    def parse(self, imdb_id: str, html: str) -> Movie:
+        doc = self._load(html)
+
+        title = (self._first_text(doc, config.SELECTORS.get("title", "")) or "").strip()
+
+        year_text = self._first_text(doc, config.SELECTORS.get("year", ""))
+        year_str = year_text.strip("()") if year_text is not None else "0"
+        year_match = re.search(r'\d{4}', year_str)
+        year = int(year_match.group()) if year_match else 0
+
+        rating_text = self._first_text(doc, config.SELECTORS.get("rating", ""))
+        rating = float(rating_text.strip()) if rating_text is not None else 0.0
+
+        metascore_text = self._first_text(doc, config.SELECTORS.get("metascore", ""))
+        metascore = int(metascore_text.strip()) if metascore_text is not None else None
+
+        duration = parse_duration(self._list_item_texts(doc, config.SELECTORS.get("duration_container", "")))
+
+        actors = [
+            Actor(id=None, name=name.strip())
+            for name in self._all_texts(doc, config.SELECTORS.get("actors", ""), limit=3)
+            if name.strip()
+        ]
+
+        return Movie(
+            id=None,
+            imdb_id=imdb_id,
+            title=title,
+            year=year,
+            rating=rating,
+            duration_minutes=duration,
+            metascore=metascore,
+            actors=actors
+        )
+
+
+def parse_duration(item_texts: List[str]) -> Optional[int]:
+    """Convierte el primer texto tipo '2h 22m' / '2h' / '45m' en minutos."""
+    for text in item_texts:
+        text = text.lower()
+        if re.search(r"(\d+h|\d+m)", text):
+            hours_match = re.search(r"(\d+)h", text)
+            minutes_match = re.search(r"(\d+)m", text)
+            h = int(hours_match.group(1)) if hours_match else 0
+            m = int(minutes_match.group(1)) if minutes_match else 0
+            duration = (h * 60) + m
+            if duration:
+                return duration
+    return None
+
+
+class SoupTitlePageParser(SelectorTitlePageParser):
+    """Backend BeautifulSoup; con 'lxml' el árbol se construye en C."""
+
+    def __init__(self, features: str = "html.parser"):
+        self.features = features
+        self.name = f"bs4[{features}]"
+
+    def _load(self, html: str) -> BeautifulSoup:
+        return BeautifulSoup(html, self.features)
+
+    def _first_text(self, doc: BeautifulSoup, selector: str) -> Optional[str]:
+        tag = doc.select_one(selector)
+        return tag.text if tag else None
+
+    def _all_texts(self, doc: BeautifulSoup, selector: str, limit: int) -> List[str]:
+        return [tag.text for tag in doc.select(selector, limit=limit)]
+
+    def _list_item_texts(self, doc: BeautifulSoup, container_selector: str) -> List[str]:
+        return [
+            li.get_text(strip=True)
+            for ul in doc.select(container_selector)
+            for li in ul.find_all("li")
+        ]
+
+
+class SelectolaxTitlePageParser(SelectorTitlePageParser):
+    """
+    Ruta rápida con selectolax (motor Lexbor en C): parsea y resuelve selectores CSS
+    sin construir un objeto Python por cada nodo del árbol.
+    """
+    name = "selectolax"
+
+    def _load(self, html: str) -> Any:
+        return SelectolaxHTMLParser(html)
+
+    def _first_text(self, doc: Any, selector: str) -> Optional[str]:
+        node = doc.css_first(selector)
+        return node.text() if node is not None else None
+
+    def _all_texts(self, doc: Any, selector: str, limit: int) -> List[str]:
+        return [node.text() for node in doc.css(selector)[:limit]]
+
+    def _list_item_texts(self, doc: Any, container_selector: str) -> List[str]:
+        return [
+            li.text(strip=True)
+            for ul in doc.css(container_selector)
+            for li in ul.css("li")
+        ]
+
+
+class EmbeddedJsonTitlePageParser(TitlePageParser):
+    """
+    Extrae la película desde el JSON que IMDb incrusta en la página, sin construir el árbol DOM.
+
+    1. `<script id="__NEXT_DATA__">`: datos completos (incluye metascore y reparto principal).
+    2. `<script type="application/ld+json">`: título, año, rating, duración y actores.
+    3. Si no hay bloque JSON utilizable, delega en el parser DOM (`config.SELECTORS`).
+
+    Los bloques se localizan con una búsqueda de subcadenas y solo se decodifica ese JSON.
+    """
+
+    NEXT_DATA_MARKER = 'id="__NEXT_DATA__"'
+    JSON_LD_MARKER = 'type="application/ld+json"'
+    # El JSON-LD no trae metascore: se toma del HTML con una búsqueda puntual.
+    METASCORE_PATTERN = re.compile(r'metacritic-score-box[^>]*>\s*(\d{1,3})\s*<')
+    DURATION_PATTERN = re.compile(r'^PT(?:(\d+)H)?(?:(\d+)M)?')
+
+    def __init__(self, fallback: SelectorTitlePageParser):
+        self.fallback = fallback
+        self.name = f"json+{fallback.name}"
+
+    @staticmethod
+    def _extract_script(html: str, marker: str) -> Optional[str]:
+        """Devuelve el contenido del primer <script> cuya etiqueta contiene `marker`."""
+        marker_pos = html.find(marker)
+        if marker_pos == -1:
+            return None
+        start = html.find(">", marker_pos)
+        end = html.find("</script>", start)
+        if start == -1 or end == -1:
+            return None
+        return html[start + 1:end]
+
+    def parse(self, imdb_id: str, html: str) -> Movie:
+        movie = self._parse_next_data(imdb_id, html) or self._parse_json_ld(imdb_id, html)
+        if movie is None:
+            logger.info(f"[PARSER] {imdb_id} sin JSON embebido utilizable. Usando selectores DOM.")
+            return self.fallback.parse(imdb_id, html)
+        return movie
+
+    def _parse_next_data(self, imdb_id: str, html: str) -> Optional[Movie]:
+        raw = self._extract_script(html, self.NEXT_DATA_MARKER)
+        if not raw:
+            return None
+        try:
+            page_props = json.loads(raw)["props"]["pageProps"]
+            above = page_props["aboveTheFoldData"]
+        except (ValueError, KeyError, TypeError):
+            return None
+
+        cast_edges = (
+            dig(above, "castPageTitle", "edges")
+            or dig(page_props, "mainColumnData", "cast", "edges")
+            or []
+        )
+        names = [dig(edge, "node", "name", "nameText", "text") for edge in cast_edges]
+        return movie_from_title_node(imdb_id, above, names)
+
+    def _parse_json_ld(self, imdb_id: str, html: str) -> Optional[Movie]:
+        raw = self._extract_script(html, self.JSON_LD_MARKER)
+        if not raw:
+            return None
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            return None
+
+        # IMDb escapa entidades HTML dentro del JSON-LD (ej. "Schindler&apos;s List").
+        title = html_lib.unescape(data.get("name") or "")
+        year_match = re.match(r"\d{4}", data.get("datePublished") or "")
+        rating = dig(data, "aggregateRating", "ratingValue")
+        if not title or not year_match or rating is None:
+            return None
+
+        duration = None
+        duration_match = self.DURATION_PATTERN.match(data.get("duration") or "")
+        if duration_match and any(duration_match.groups()):
+            duration = int(duration_match.group(1) or 0) * 60 + int(duration_match.group(2) or 0)
+
+        metascore_match = self.METASCORE_PATTERN.search(html)
+        actors = data.get("actor") or []
+        if isinstance(actors, dict):
+            actors = [actors]
+
+        return Movie(
+            id=None,
+            imdb_id=imdb_id,
+            title=title,
+            year=int(year_match.group()),
+            rating=float(rating),
+            duration_minutes=duration or None,
+            metascore=int(metascore_match.group(1)) if metascore_match else None,
+            actors=_build_actors([html_lib.unescape(actor.get("name") or "") for actor in actors if isinstance(actor, dict)])
+        )
+
+
+def movie_from_title_node(imdb_id: str, node: Dict[str, Any], cast_names: List[Optional[str]]) -> Optional[Movie]:
+    """
+    Construye un Movie a partir de un nodo `Title` del esquema GraphQL de IMDb
+    (mismo formato que `aboveTheFoldData` en __NEXT_DATA__).
+
+    Returns:
+        Optional[Movie]: None si faltan título, año o rating.
+    """
+    title = dig(node, "titleText", "text")
+    year = dig(node, "releaseYear", "year")
+    rating = dig(node, "ratingsSummary", "aggregateRating")
+    if not title or not year or rating is None:
+        return None
+
+    runtime_seconds = dig(node, "runtime", "seconds")
+    return Movie(
+        id=None,
+        imdb_id=imdb_id,
+        title=title,
+        year=int(year),
+        rating=float(rating),
+        duration_minutes=int(runtime_seconds) // 60 if runtime_seconds else None,
+        metascore=dig(node, "metacritic", "metascore", "score"),
+        actors=_build_actors(cast_names)
+    )
+
+
+def dig(data: Any, *keys: str) -> Any:
+    """Acceso seguro a claves anidadas de un dict (None si falta cualquier nivel)."""
+    for key in keys:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+
+def _build_actors(names: List[Optional[str]]) -> List[Actor]:
+    """Los 3 primeros nombres no vacíos, igual que la extracción por selectores."""
+    return [Actor(id=None, name=name.strip()) for name in names if name and name.strip()][:3]
+
+
+def available_title_parsers() -> List[SelectorTitlePageParser]:
+    """Todos los backends DOM instalados, del más rápido al más lento (usado por el benchmark)."""
+    parsers: List[SelectorTitlePageParser] = []
+    if SelectolaxHTMLParser is not None:
+        parsers.append(SelectolaxTitlePageParser())
+    if LXML_AVAILABLE:
+        parsers.append(SoupTitlePageParser("lxml"))
+    parsers.append(SoupTitlePageParser("html.parser"))
+    return parsers
+
+
+def build_title_parser(
+    backend: str = config.HTML_PARSER_BACKEND,
+    strategy: str = config.TITLE_EXTRACTION_STRATEGY
+) -> TitlePageParser:
+    """
+    Devuelve el parser de páginas de detalle.
+
+    `HTML_PARSER_BACKEND` elige el backend DOM:
+    - "auto": el más rápido disponible (selectolax → bs4+lxml → bs4+html.parser).
+    - "selectolax", "lxml", "html.parser": fuerza un backend; si no está instalado
+      se usa "html.parser" (el comportamiento original).
+
+    `TITLE_EXTRACTION_STRATEGY` = "json" antepone la extracción desde el JSON embebido
+    y deja el backend DOM como fallback; "dom" usa solo selectores.
+    """
+    backend = backend.lower()
+    if backend == "auto":
+        parser = available_title_parsers()[0]
+    elif backend == "selectolax" and SelectolaxHTMLParser is not None:
+        parser = SelectolaxTitlePageParser()
+    elif backend == "lxml" and LXML_AVAILABLE:
+        parser = SoupTitlePageParser("lxml")
+    else:
+        if backend not in ("html.parser", "html"):
+            logger.warning(f"[PARSER] Backend '{backend}' no disponible. Usando html.parser.")
+        parser = SoupTitlePageParser("html.parser")
+
+    if strategy.lower() == "json":
+        parser = EmbeddedJsonTitlePageParser(fallback=parser)
+
+    logger.info(f"[PARSER] Parser de páginas de detalle: {parser.name}")
+    return parser
@@ -5,7 +5,12 @@ import time
 import requests
 from typing import Optional
 from requests.exceptions import RequestException
+from requests.structures import CaseInsensitiveDict
 
+from infrastructure.network.session_manager import session_manager
+from infrastructure.network.http_cache import http_cache, CachedResponse
+from infrastructure.network.circuit_breaker import CircuitBreaker, circuit_breakers, tor_circuit_generation, tor_circuit_route
+from infrastructure.network.rate_limiter import outbound_throttle
 from shared.config import config
 from shared.logger.logging_config import setup_logger
 
@@ -18,6 +23,52 @@ def _get_headers(custom_headers: Optional[dict] = None) -> dict:
         base_headers.update(custom_headers)
     return base_headers
 
+def _is_block(status_code: int, body: str) -> bool:
+    """True si una respuesta no exitosa es un bloqueo real: 403/429 o una página de captcha."""
+    if status_code in config.ROTATE_ON_CODES:
+        return True
+    body = (body or "").lower()
+    return any(marker in body for marker in config.CAPTCHA_MARKERS)
+
+def _retry_delay(attempt: int) -> float:
+    """Backoff exponencial con full jitter: uniforme(0, base·2^(intento-1)), acotado."""
+    return random.uniform(0, min(config.RETRY_BACKOFF_MAX, config.RETRY_BACKOFF_BASE * 2 ** (attempt - 1)))
+
+def _select_breaker(strategy: str, url: str, tor_rotator) -> tuple[CircuitBreaker, Optional[dict], bool]:
+    """
+    Breaker de la ruta por la que saldrá la petición: (breaker, proxies TOR o None, permitido).
+
+    Con TOR cada puesto de circuito tiene su propio breaker (que se reinicia cuando el
+    puesto rota a un circuito nuevo): si el del circuito asignado está abierto se prueba
+    el siguiente del pool, de modo que un circuito caído no corta el paso a los demás.
+    `permitido` es False solo si todos tienen el breaker abierto.
+    """
+    if strategy != 'tor':
+        breaker = circuit_breakers.get(strategy, url)
+        return breaker, None, breaker.allow()
+    for _ in range(max(1, len(getattr(tor_rotator, "circuits", ())))):
+        proxies = tor_rotator.get_proxies()
+        breaker = circuit_breakers.get(
+            strategy, url, route=tor_circuit_route(proxies), generation=tor_circuit_generation(proxies)
+        )
+        if breaker.allow():
+            return breaker, proxies, True
+    return breaker, proxies, False
+
+def is_definitive_failure(response) -> bool:
+    """True si la respuesta es de `NON_RETRYABLE_CODES` (ej. 404): el recurso no existe y reintentar no sirve."""
+    return response is not None and response.status_code in config.NON_RETRYABLE_CODES
+
+def _response_from_cache(cached: CachedResponse) -> requests.Response:
+    """Reconstruye una `requests.Response` a partir de una entrada de la caché en disco."""
+    response = requests.Response()
+    response.status_code = cached.status_code
+    response.url = cached.url
+    response._content = cached.content
+    response.encoding = cached.encoding
+    response.headers = CaseInsensitiveDict(cached.headers)
+    return response
+
 def make_request(
     url: str,
     proxy_provider,
@@ -28,8 +79,24 @@ def make_request(
 ) -> Optional[requests.Response]:
     """
     Realiza una petición HTTP robusta con soporte para GET/POST, proxies, TOR, reintentos y fallback.
+    Si la caché HTTP en disco está activa, se consulta antes de salir a la red.
+
+    Cada estrategia pasa por un circuit breaker por host (con TOR, uno por circuito): si la
+    ruta está caída, la petición salta directamente a la siguiente estrategia. La última
+    estrategia no se omite aunque su breaker esté abierto: no queda a dónde saltar.
+    Las respuestas de `NON_RETRYABLE_CODES` (404) se devuelven sin reintentar: como toda
+    `requests.Response` no exitosa se evalúan como falsas, y `is_definitive_failure`
+    permite distinguirlas de None (todas las estrategias y reintentos fallaron).
     """
-    
+    if http_cache.enabled:
+        cached = http_cache.get(method, url, json_payload)
+        if cached is not None:
+            logger.info(f"Respuesta desde caché: {cached.status_code} | {method.upper()} {url}")
+            return _response_from_cache(cached)
+        if http_cache.replay:
+            logger.warning(f"Modo replay: {method.upper()} {url} no está en la caché.")
+            return None
+
     # Define la secuencia de estrategias a intentar
     strategies = []
     if config.USE_TOR:
@@ -38,9 +105,21 @@ def make_request(
         strategies.append('proxy')
         strategies.append('tor')  # TOR como fallback
 
-    for strategy in strategies:
+    for position, strategy in enumerate(strategies):
+        has_fallback = position < len(strategies) - 1
         logger.info(f"Iniciando peticiones con estrategia: {strategy.upper()}")
         for attempt in range(1, config.MAX_RETRIES + 1):
+            # Rotación preventiva solo al agotar el presupuesto de peticiones del circuito.
+            if strategy == 'tor' and tor_rotator.register_request():
+                logger.info(f"Presupuesto de {config.TOR_REQUESTS_PER_CIRCUIT} peticiones por circuito agotado. Rotando IP...")
+                tor_rotator.rotate_ip()
+
+            breaker, tor_proxies, allowed = _select_breaker(strategy, url, tor_rotator)
+            if not allowed:
+                if has_fallback:
+                    logger.warning(f"Circuito abierto para {breaker.name}. Se omite la estrategia {strategy.upper()}.")
+                    break
+                logger.warning(f"Circuito abierto para {breaker.name} y sin estrategia de respaldo. Se intenta igualmente.")
             proxies = None
             log_ip_info = "Conexión Directa (VPN)"
 
@@ -51,37 +130,61 @@ def make_request(
                     ip, city, country = proxy_provider.get_proxy_location()
                     log_ip_info = f"Proxy: {ip} ({city}, {country})"
                 elif strategy == 'tor':
-                    tor_rotator.rotate_ip()#BORRAR
-                    
-                    proxies = config.TOR_PROXY
+                    proxies = tor_proxies
                     ip = tor_rotator.get_current_ip()
                     log_ip_info = f"TOR: {ip}"
                 
                 request_headers = _get_headers(headers)
                 logger.info(f"Intento {attempt}/{config.MAX_RETRIES} | {method.upper()} {url} | Usando: {log_ip_info}")
 
-                # Realiza la petición GET o POST
-                if method.upper() == 'POST':
-                    response = requests.post(url, headers=request_headers, proxies=proxies, json=json_payload, timeout=config.REQUEST_TIMEOUT)
-                else:
-                    response = requests.get(url, headers=request_headers, proxies=proxies, timeout=config.REQUEST_TIMEOUT)
-                
+                # Realiza la petición GET o POST reutilizando el pool keep-alive de la ruta.
+                # El throttle global limita concurrencia y tasa; los reintentos esperan fuera del slot.
+                session = session_manager.get_session(session_manager.route_key(strategy, proxies), proxies)
+                with outbound_throttle.slot():
+                    started = time.monotonic()
+                    if method.upper() == 'POST':
+                        response = session.post(url, headers=request_headers, proxies=proxies, json=json_payload, timeout=config.REQUEST_TIMEOUT)
+                    else:
+                        response = session.get(url, headers=request_headers, proxies=proxies, timeout=config.REQUEST_TIMEOUT)
+                outbound_throttle.record_status(response.status_code)
+                breaker.record_status(response.status_code)
+                if strategy == 'proxy':
+                    proxy_provider.report_result(proxies, response.status_code, time.monotonic() - started)
+
                 logger.info(f"Respuesta: {response.status_code} | URL Final: {response.url}")
 
-                if  response.status_code==200:
+                # 304 solo llega a peticiones condicionales: el llamador decide qué hacer.
+                if response.status_code in config.SUCCESS_CODES:
+                    if http_cache.enabled and response.status_code == 200:
+                        http_cache.put(method, url, json_payload, CachedResponse(
+                            status_code=response.status_code,
+                            url=response.url,
+                            content=response.content,
+                            encoding=response.encoding,
+                            headers=dict(response.headers)
+                        ))
+                    return response
+
+                if response.status_code in config.NON_RETRYABLE_CODES:
+                    logger.warning(f"Respuesta definitiva {response.status_code} para {url}. No se reintenta.")
                     return response
                 
-                # Si estamos usando TOR y nos bloquean, rotamos la IP
-                if strategy == 'tor' and response.status_code in config.BLOCK_CODES:
+                # Si estamos usando TOR y nos bloquean, se renueva el circuito usado. Un solo
+                # hilo rota cada generación; los errores corrientes (5xx...) no rotan.
+                if strategy == 'tor' and _is_block(response.status_code, response.text):
                     logger.warning(f"Código de bloqueo {response.status_code} con TOR. Rotando IP...")
-                    tor_rotator.rotate_ip()
-                    time.sleep(config.TOR_WAIT_AFTER_ROTATION)
+                    tor_rotator.report_block(proxies)
 
             except RequestException as e:
+                outbound_throttle.record_failure()
+                breaker.record_failure()
+                if strategy == 'proxy':
+                    proxy_provider.report_result(proxies)
                 logger.warning(f"Error de red en intento {attempt} con {strategy.upper()}: {e}")
             
-            # Espera antes del siguiente reintento
-            time.sleep(config.RETRY_DELAYS[min(attempt - 1, len(config.RETRY_DELAYS) - 1)])
+            # Espera antes del siguiente reintento (no tras el último: se pasa a la siguiente estrategia)
+            if attempt < config.MAX_RETRIES:
+                time.sleep(_retry_delay(attempt))
         
         # Si se completan todos los reintentos de una estrategia y no es la última, se pasa a la siguiente (fallback)
         if strategy != strategies[-1]:
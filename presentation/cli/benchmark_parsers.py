@@ -0,0 +1,67 @@
+
+import argparse
+import sys
+import time
+from pathlib import Path
+# Define la ruta raíz del proyecto (3 niveles arriba de este archivo)
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+
+# Agrega la raíz al sys.path si no está presente, para permitir imports absolutos desde cualquier carpeta
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from infrastructure.scraper.title_parsers import available_title_parsers, EmbeddedJsonTitlePageParser
+
+
+def load_pages(pages_dir: Path) -> list[tuple[str, str]]:
+    """Carga las páginas guardadas. El nombre del archivo es el ID de IMDb (ej. tt0111161.html)."""
+    return [
+        (path.stem, path.read_text(encoding="utf-8"))
+        for path in sorted(pages_dir.glob("*.html"))
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compara los backends y estrategias de parseo de páginas de detalle sobre páginas de IMDb guardadas."
+    )
+    parser.add_argument("pages_dir", type=Path, help="Carpeta con archivos <imdb_id>.html")
+    parser.add_argument("--repeat", type=int, default=5, help="Repeticiones por página (default: 5)")
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages_dir)
+    if not pages:
+        print(f"No se encontraron archivos .html en {args.pages_dir}")
+        return
+
+    total_mb = sum(len(html.encode("utf-8")) for _, html in pages) / (1024 ** 2)
+    print(f"{len(pages)} páginas ({total_mb:.2f} MB), {args.repeat} repeticiones\n")
+
+    timings = {}
+    outputs = {}
+    dom_parsers = available_title_parsers()
+    # La estrategia JSON usa el backend DOM más rápido como fallback.
+    for title_parser in dom_parsers + [EmbeddedJsonTitlePageParser(fallback=dom_parsers[0])]:
+        results = {}
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for imdb_id, html in pages:
+                try:
+                    results[imdb_id] = title_parser.parse(imdb_id, html)
+                except ValueError as e:
+                    results[imdb_id] = f"inválido: {e}"
+        timings[title_parser.name] = (time.perf_counter() - start) * 1000 / (len(pages) * args.repeat)
+        outputs[title_parser.name] = results
+
+    # html.parser (el comportamiento original) es la referencia de velocidad y de resultados.
+    reference = outputs["bs4[html.parser]"]
+    reference_ms = timings["bs4[html.parser]"]
+    for name, ms_per_page in timings.items():
+        mismatches = [imdb_id for imdb_id, movie in outputs[name].items() if movie != reference[imdb_id]]
+        print(f"{name:<18} {ms_per_page:8.2f} ms/página  x{reference_ms / ms_per_page:5.1f}  diferencias: {len(mismatches)}")
+        for imdb_id in mismatches[:5]:
+            print(f"    {imdb_id}: {outputs[name][imdb_id]}  (referencia: {reference[imdb_id]})")
+
+
+if __name__ == "__main__":
+    main()
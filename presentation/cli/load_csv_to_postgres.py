@@ -0,0 +1,42 @@
+import argparse
+import sys
+from pathlib import Path
+# Define la ruta raíz del proyecto (3 niveles arriba de este archivo)
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+
+# Agrega la raíz al sys.path si no está presente, para permitir imports absolutos desde cualquier carpeta
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from shared.config import config
+from infrastructure.persistence.csv.repositories.movie_csv_repository import MOVIES_CSV
+from infrastructure.persistence.csv.repositories.actor_csv_repository import ACTORS_CSV
+from infrastructure.persistence.csv.repositories.movie_actor_csv_repository import MOVIE_ACTOR_CSV
+from infrastructure.persistence.postgres.postgres_connection import close_pool
+from infrastructure.persistence.postgres.copy_loader import PostgresCopyLoader
+from shared.logger.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Carga los CSV del scraper en PostgreSQL con COPY FROM STDIN (no requiere acceso al servidor)."
+    )
+    parser.add_argument("--movies", default=MOVIES_CSV, help=f"CSV de películas (default: {MOVIES_CSV})")
+    parser.add_argument("--actors", default=ACTORS_CSV, help=f"CSV de actores (default: {ACTORS_CSV})")
+    parser.add_argument("--movie-actor", default=MOVIE_ACTOR_CSV, help=f"CSV de relaciones (default: {MOVIE_ACTOR_CSV})")
+    args = parser.parse_args()
+
+    try:
+        saved = PostgresCopyLoader().load_csv_files(args.movies, args.actors, args.movie_actor)
+        logger.info(f"Carga finalizada: {saved} películas nuevas o actualizadas en {config.POSTGRES_DB}.")
+    except Exception as e:
+        logger.critical(f"No se pudo completar la carga desde CSV: {e}", exc_info=True)
+        sys.exit(1)
+    finally:
+        close_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 
+import argparse
 import os
 import sys
 from pathlib import Path
@@ -10,28 +11,40 @@ if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
     
 from infrastructure.factory.dependency_container import DependencyContainer
+from infrastructure.factory.sharded_crawl import ShardedCrawl
 from shared.config import config 
 import logging
 
 logger = logging.getLogger(__name__)
 
 def main():
+    parser = argparse.ArgumentParser(description="Scraper de películas de IMDb.")
+    parser.add_argument(
+        "--workers", type=int, default=config.SCRAPER_WORKERS,
+        help=f"Procesos de scraping en paralelo, cada uno con su propio shard de IDs (default: {config.SCRAPER_WORKERS})"
+    )
+    args = parser.parse_args()
+
     logger.info("Inicializando contenedor de dependencias...")
     container = DependencyContainer(config)
     
     try:
-        logger.info("Construyendo scraper...")
-        scraper = container.get_scraper()
-        
-        logger.info("Iniciando proceso de scraping...")
-        scraper.scrape()
+        if args.workers > 1:
+            logger.info(f"Iniciando scraping en {args.workers} procesos...")
+            ShardedCrawl(container, args.workers).run()
+        else:
+            logger.info("Construyendo scraper...")
+            scraper = container.get_scraper()
+
+            logger.info("Iniciando proceso de scraping...")
+            scraper.scrape()
         logger.info("Proceso de scraping finalizado exitosamente.")
 
     except Exception as e:
         logger.critical(f"Ha ocurrido un error fatal en la aplicación: {e}", exc_info=True)
     finally:
         logger.info("Cerrando recursos...")
-        container.close_db_connection()
+        container.shutdown()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1 +1 @@
-from .config import BASE_URL, NUM_MOVIES, USER_AGENTS, USE_TOR, TOR_PROXY, PROXY_LIST, REQUEST_TIMEOUT, RETRY_DELAYS, MAX_RETRIES, GRAPHQL_URL, GRAPHQL_HASH, GRAPHQL_OPERATION, GRAPHQL_LOCALE, GRAPHQL_VERSION, SELECTORS
+from .config import BASE_URL, NUM_MOVIES, USER_AGENTS, USE_TOR, TOR_PROXY, PROXY_LIST, REQUEST_TIMEOUT, MAX_RETRIES, GRAPHQL_URL, GRAPHQL_HASH, GRAPHQL_OPERATION, GRAPHQL_LOCALE, GRAPHQL_VERSION, SELECTORS
@@ -4,7 +4,7 @@ import os
 from dotenv import load_dotenv
 
 load_dotenv()
-SCRAPER_ENGINE="requests"  # Puede ser "playwright" o "selenium"
+SCRAPER_ENGINE="requests"  # "requests" (hilos) o "async" (asyncio). "playwright"/"selenium" pendientes
 # --- Configuración base de IMDb ---
 BASE_URL = "https://www.imdb.com"
 CHART_TOP_PATH = "/chart/top/"
@@ -17,7 +17,19 @@ GRAPHQL_OPERATION = "Top250MoviesPagination"
 GRAPHQL_LOCALE = "en-US"
 GRAPHQL_VERSION = 1
 NUM_MOVIES = 250
-TOR_WAIT_AFTER_ROTATION = 12  # segundos de espera tras rotar IP TOR
+# --- Scraping incremental / reanudable ---
+SCRAPE_INCREMENTAL = True                    # omitir títulos que ya están en todas las persistencias
+SCRAPE_REFRESH_MAX_AGE = None                # segundos; los títulos guardados hace más se vuelven a descargar y se actualizan
+SCRAPE_CHECKPOINT_PATH = "data/scrape_checkpoint.json"
+SCRAPE_CHECKPOINT_EVERY = 25                 # títulos completados entre escrituras del checkpoint
+SCRAPE_CONDITIONAL_REQUESTS = True           # If-None-Match/If-Modified-Since y hash de contenido al re-descargar
+SCRAPE_MAX_ATTEMPTS = 3                      # descargas por título; los fallos se reprograman al final de la cola
+SCRAPE_RETRY_BACKOFF = 30                    # segundos antes del primer reintento de un título (se duplica)
+TOR_WAIT_AFTER_ROTATION = 12  # tope (s) de espera al evento CIRC BUILT tras NEWNYM
+TOR_REQUESTS_PER_CIRCUIT = 100  # rota el circuito tras N peticiones (0 = solo ante bloqueos)
+# Circuitos TOR simultáneos aislados por credenciales SOCKS (IsolateSOCKSAuth).
+# 1 = un único circuito compartido que se rota con NEWNYM (TorRotator).
+TOR_CIRCUIT_POOL_SIZE = 8
 
 # --- User-Agent Rotation ---
 USER_AGENTS = [
@@ -45,18 +57,98 @@ PROXY_PORT = os.getenv("PROXY_PORT")
 PROXY_USER = os.getenv("PROXY_USER")
 PROXY_PASS = os.getenv("PROXY_PASS")
 PROXY_LIST = [ ]
+# --- Salud de proxies (selección ponderada y expulsión) ---
+PROXY_HEALTH_WINDOW = 100          # latencias recientes por proxy para p50/p95
+PROXY_EJECT_AFTER_FAILURES = 3     # fallos/bloqueos seguidos antes de expulsar un proxy
+PROXY_EJECT_SECONDS = 30           # primera expulsión; se duplica en cada expulsión consecutiva
+PROXY_EJECT_MAX_SECONDS = 600
+PROXY_SCORES_PATH = "data/proxy_scores.json"
 USE_CUSTOM_PROXY = all([PROXY_HOST, PROXY_PORT, PROXY_USER, PROXY_PASS])
-USE_TOR =not USE_CUSTOM_PROXY
+# Con proxy autenticado o PROXY_LIST se usa la estrategia "proxy" y TOR queda de fallback.
+USE_TOR = not USE_CUSTOM_PROXY and not PROXY_LIST
 MAX_RETRIES = 3
-RETRY_DELAYS = [1, 3, 5]
+RETRY_BACKOFF_BASE = 1.0   # segundos; el reintento n espera uniforme(0, base·2^(n-1)) (full jitter)
+RETRY_BACKOFF_MAX = 10.0
+NON_RETRYABLE_CODES = [404]  # respuestas definitivas: no se reintentan ni pasan a otra estrategia
+# --- Circuit breaker por estrategia (o circuito TOR) + host ---
+BREAKER_FAILURE_THRESHOLD = 5  # fallos de red/5xx seguidos que abren el circuito
+BREAKER_RESET_TIMEOUT = 30     # segundos abierto antes de enviar una petición de sondeo
 REQUEST_TIMEOUT = 10
 MAX_THREADS = 50
-BLOCK_CODES = [202,403, 404, 429,500]
+# --- Modo multiproceso (--workers N): cada proceso descarga un shard de los IDs ---
+SCRAPER_WORKERS = int(os.getenv("SCRAPER_WORKERS", "1"))  # lo fija run_scraper para los procesos hijos
+SHARDS_DIR = "data/shards"                                # CSV y checkpoint de cada shard antes de fusionarse
+# --- Pipeline scrape → persistencia ---
+PIPELINE_PARSE_WORKERS = 4         # hilos de parseo (CPU)
+PIPELINE_QUEUE_SIZE = 100          # capacidad de cada cola entre etapas (backpressure)
+PIPELINE_SINK_BATCH_SIZE = 25      # películas por lote entregado a cada sink
+PIPELINE_SINK_FLUSH_INTERVAL = 2.0 # segundos máximos que un lote incompleto espera
+# --- Escritura CSV con buffer (archivos abiertos durante toda la ejecución) ---
+CSV_FLUSH_ROWS = 500           # filas acumuladas por archivo antes de volcar
+CSV_FLUSH_BYTES = 256 * 1024   # bytes acumulados por archivo antes de volcar
+CSV_FLUSH_INTERVAL = 5.0       # segundos máximos que una fila espera en memoria
+# --- Caché de identidad de actores (nombre → ID), una por persistencia ---
+ACTOR_CACHE_MAX_SIZE = 50_000
+# --- Pool de conexiones HTTP (keep-alive) por ruta de salida ---
+HTTP_POOL_SIZE = MAX_THREADS  # conexiones por host; igual a los hilos para que ninguno espere socket
+HTTP_POOL_HOSTS = 10          # hosts distintos cacheados por ruta (imdb, graphql, ipinfo...)
+# --- Caché HTTP en disco (desarrollo y re-ejecuciones) ---
+# "off": desactivada; "on": se consulta antes de la red y guarda las respuestas 200;
+# "replay": sin red, solo se sirve lo que ya está en caché (ignora el TTL).
+HTTP_CACHE_MODE = os.getenv("HTTP_CACHE_MODE", "off")
+HTTP_CACHE_DIR = "data/http_cache"
+HTTP_CACHE_TTL = 24 * 3600                 # segundos que una entrada se considera vigente
+HTTP_CACHE_MAX_BYTES = 500 * 1024 * 1024   # tamaño máximo en disco antes de expulsar las más antiguas
+# --- Motor async ---
+ASYNC_WORKER_THREADS = 8     # hilos para parseo y persistencia (no red)
+BLOCK_CODES = [202, 403, 429, 500]
+# Señales reales de bloqueo: solo estas provocan la rotación del circuito TOR.
+ROTATE_ON_CODES = [403, 429]
+CAPTCHA_MARKERS = ["captcha", "awswaf", "challenge.js"]  # buscadas en respuestas no exitosas (ej. 202 del WAF)
+SUCCESS_CODES = [200, 304]  # 304: respuesta a una petición condicional (contenido sin cambios)
+# --- Rate limiter global + control adaptativo de concurrencia (AIMD) ---
+# Límites de toda la ejecución: con --workers N cada proceso aplica 1/N (como el pool de PostgreSQL).
+RATE_LIMIT_INITIAL_RPS = 10.0 / SCRAPER_WORKERS   # peticiones/segundo al arrancar
+RATE_LIMIT_MIN_RPS = 0.5 / SCRAPER_WORKERS
+RATE_LIMIT_MAX_RPS = 50.0 / SCRAPER_WORKERS
+RATE_LIMIT_BURST = max(1, 10 // SCRAPER_WORKERS)  # ráfaga máxima del token bucket
+AIMD_INITIAL_CONCURRENCY = max(1, 10 // SCRAPER_WORKERS)  # peticiones en vuelo al arrancar
+AIMD_MIN_CONCURRENCY = 1
+AIMD_MAX_CONCURRENCY = max(1, MAX_THREADS // SCRAPER_WORKERS)  # techo de peticiones en vuelo (y de hilos de descarga)
+AIMD_RATE_STEP = 0.5 / SCRAPER_WORKERS            # incremento aditivo de la tasa por ventana de éxitos
+AIMD_DECREASE_FACTOR = 0.5      # reducción multiplicativa ante bloqueos/timeouts
+AIMD_COOLDOWN_SECONDS = 5       # mínimo entre dos reducciones consecutivas
+AIMD_BACKOFF_CODES = [202, 403, 429, 503]  # códigos que indican bloqueo o saturación
 URL_IPINFO="https://ipinfo.io/json"
+EGRESS_IDENTITY_NEGATIVE_TTL = 30  # segundos que se recuerda una consulta de IP fallida por ruta/circuito
 URL_IPHAZIP = "https://icanhazip.com/"
 # --- GraphQL Config ---
 GRAPHQL_URL = "https://caching.graphql.imdb.com/"
 GRAPHQL_HASH = "2db1d515844c69836ea8dc532d5bff27684fdce990c465ebf52d36d185a187b3"
+# --- Parser HTML de páginas de detalle ---
+HTML_PARSER_BACKEND = "auto"  # "auto" | "selectolax" | "lxml" | "html.parser"
+TITLE_EXTRACTION_STRATEGY = "json"  # "json" (__NEXT_DATA__/JSON-LD, fallback DOM) | "dom"
+# --- Detalle de títulos por lotes (GraphQL) ---
+# Desactivado por defecto: la consulta `titles(ids:)` de GRAPHQL_DETAIL_QUERY está escrita
+# a mano y no se ha verificado contra la API real. Con False, una página HTML por película.
+GRAPHQL_DETAILS_ENABLED = False
+GRAPHQL_DETAIL_URL = "https://api.graphql.imdb.com/"
+GRAPHQL_DETAIL_BATCH_SIZE = 25   # títulos por petición
+GRAPHQL_DETAIL_QUERY = """
+query TitleDetailsBatch($ids: [ID!]!, $castLimit: Int!) {
+  titles(ids: $ids) {
+    id
+    titleText { text }
+    releaseYear { year }
+    ratingsSummary { aggregateRating }
+    runtime { seconds }
+    metacritic { metascore { score } }
+    principalCredits(filter: { categories: ["cast"] }) {
+      credits(limit: $castLimit) { name { nameText { text } } }
+    }
+  }
+}
+"""
 # --- HTML Selectors ---
 SELECTORS = {
     "title": '[data-testid="hero__primary-text"]',
@@ -73,3 +165,10 @@ POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD", "@ndresruiz@123")
 POSTGRES_HOST = os.getenv("POSTGRES_HOST", "localhost")  # Cambia a "postgres" si usas docker-compose
 POSTGRES_PORT = os.getenv("POSTGRES_PORT", "5432")
 POSTGRES_MAX_CONNECTIONS = 10
+# Conexiones del pool: una por hilo de escritura, sin superar el límite del servidor
+# (repartido entre los procesos en modo --workers).
+POSTGRES_POOL_SIZE = max(1, min(MAX_THREADS, POSTGRES_MAX_CONNECTIONS // SCRAPER_WORKERS))
+# "bulk": cada lote del pipeline se guarda con funciones por conjunto (upsert_movies,
+# upsert_actors, upsert_movie_actors); "copy": cada lote entra por COPY FROM STDIN a
+# tablas de staging; "row": una película a la vez con save_movie_with_actors (una llamada).
+POSTGRES_WRITE_MODE = os.getenv("POSTGRES_WRITE_MODE", "bulk")
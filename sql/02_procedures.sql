@@ -11,8 +11,8 @@
 
 -- =============================================
 --  FUNCTION: upsert_movie
---  Descripción: Inserta o ignora una película basada en su imdb_id (clave única)
---               y siempre devuelve la fila completa (ya sea la nueva o la existente).
+--  Descripción: Inserta una película o, si su imdb_id (clave única) ya existe,
+--               actualiza sus datos. Siempre devuelve la fila completa resultante.
 -- =============================================
 CREATE OR REPLACE FUNCTION upsert_movie(
     p_imdb_id TEXT,
@@ -26,15 +26,15 @@ RETURNS SETOF movies AS
 $$
 BEGIN
     RETURN QUERY
-    WITH inserted AS (
-        INSERT INTO movies (imdb_id, title, year, rating, duration_minutes, metascore)
-        VALUES (p_imdb_id, p_title, p_year, p_rating, p_duration, p_metascore)
-        ON CONFLICT (imdb_id) DO NOTHING
-        RETURNING *
-    )
-    SELECT * FROM inserted
-    UNION ALL
-    SELECT * FROM movies WHERE imdb_id = p_imdb_id AND NOT EXISTS (SELECT 1 FROM inserted);
+    INSERT INTO movies (imdb_id, title, year, rating, duration_minutes, metascore)
+    VALUES (p_imdb_id, p_title, p_year, p_rating, p_duration, p_metascore)
+    ON CONFLICT (imdb_id) DO UPDATE SET
+        title = EXCLUDED.title,
+        year = EXCLUDED.year,
+        rating = EXCLUDED.rating,
+        duration_minutes = EXCLUDED.duration_minutes,
+        metascore = EXCLUDED.metascore
+    RETURNING *;
 END;
 $$ LANGUAGE plpgsql;
 
@@ -50,16 +50,13 @@ CREATE OR REPLACE FUNCTION upsert_actor(
 RETURNS SETOF actors AS
 $$
 BEGIN
+    -- Como en upsert_actors: DO UPDATE devuelve la fila aunque otra transacción la
+    -- haya confirmado después de la instantánea de esta sentencia.
     RETURN QUERY
-    WITH inserted AS (
-        INSERT INTO actors (name)
-        VALUES (p_name)
-        ON CONFLICT (name) DO NOTHING
-        RETURNING *
-    )
-    SELECT * FROM inserted
-    UNION ALL
-    SELECT * FROM actors WHERE name = p_name AND NOT EXISTS (SELECT 1 FROM inserted);
+    INSERT INTO actors AS a (name)
+    VALUES (p_name)
+    ON CONFLICT (name) DO UPDATE SET name = EXCLUDED.name
+    RETURNING a.*;
 END;
 $$ LANGUAGE plpgsql;
 
@@ -80,4 +77,150 @@ BEGIN
     VALUES (p_movie_id, p_actor_id)
     ON CONFLICT (movie_id, actor_id) DO NOTHING; 
 END;
-$$ LANGUAGE plpgsql;
\ No newline at end of file
+$$ LANGUAGE plpgsql;
+
+
+-- =============================================
+--  FUNCIONES POR LOTES (set-based)
+--  Reciben arrays paralelos (uno por columna) y resuelven N filas en una sola
+--  sentencia con unnest + INSERT ... ON CONFLICT, en lugar de una llamada por fila.
+-- =============================================
+
+
+-- =============================================
+--  FUNCTION: upsert_movies
+--  Descripción: Inserta las películas nuevas y actualiza las existentes (por imdb_id);
+--               devuelve id e imdb_id de todas las del lote, indicando si se insertaron
+--               ahora (inserted = FALSE: ya existía y se actualizó).
+-- =============================================
+CREATE OR REPLACE FUNCTION upsert_movies(
+    p_imdb_ids TEXT[],
+    p_titles TEXT[],
+    p_years INT[],
+    p_ratings FLOAT[],
+    p_durations INT[],
+    p_metascores INT[]
+)
+RETURNS TABLE (id INT, imdb_id VARCHAR, inserted BOOLEAN) AS
+$$
+    WITH input AS (
+        SELECT DISTINCT ON (t.imdb_id) t.*
+        FROM unnest(p_imdb_ids, p_titles, p_years, p_ratings, p_durations, p_metascores)
+             AS t(imdb_id, title, year, rating, duration_minutes, metascore)
+        ORDER BY t.imdb_id
+    ),
+    ups AS (
+        INSERT INTO movies AS m (imdb_id, title, year, rating, duration_minutes, metascore)
+        SELECT imdb_id, title, year, rating, duration_minutes, metascore FROM input
+        ON CONFLICT (imdb_id) DO UPDATE SET
+            title = EXCLUDED.title,
+            year = EXCLUDED.year,
+            rating = EXCLUDED.rating,
+            duration_minutes = EXCLUDED.duration_minutes,
+            metascore = EXCLUDED.metascore
+        -- xmax = 0 solo en filas recién insertadas (una fila actualizada lleva el xid del UPDATE).
+        RETURNING m.id, m.imdb_id, (m.xmax = 0)
+    )
+    SELECT * FROM ups;
+$$ LANGUAGE sql;
+
+
+-- =============================================
+--  FUNCTION: upsert_actors
+--  Descripción: Inserta los actores que no existan (por nombre) y devuelve
+--               la fila completa de todos los actores del lote.
+-- =============================================
+CREATE OR REPLACE FUNCTION upsert_actors(
+    p_names TEXT[]
+)
+RETURNS SETOF actors AS
+$$
+    WITH input AS (
+        SELECT DISTINCT name FROM unnest(p_names) AS name
+    ),
+    ins AS (
+        -- DO UPDATE (sin cambiar nada) en lugar de DO NOTHING: RETURNING devuelve también
+        -- los nombres que ya existían, incluidos los confirmados por otra transacción
+        -- después de tomar la instantánea, que un SELECT aparte no vería.
+        INSERT INTO actors AS a (name)
+        SELECT name FROM input
+        ON CONFLICT (name) DO UPDATE SET name = EXCLUDED.name
+        RETURNING a.*
+    )
+    SELECT * FROM ins;
+$$ LANGUAGE sql;
+
+
+-- =============================================
+--  FUNCTION: upsert_movie_actors
+--  Descripción: Inserta en bloque las relaciones película-actor que no existan.
+--               Devuelve cuántas relaciones nuevas se insertaron.
+-- =============================================
+CREATE OR REPLACE FUNCTION upsert_movie_actors(
+    p_movie_ids INT[],
+    p_actor_ids INT[]
+)
+RETURNS INT AS
+$$
+    WITH ins AS (
+        INSERT INTO movie_actor (movie_id, actor_id)
+        SELECT DISTINCT movie_id, actor_id
+        FROM unnest(p_movie_ids, p_actor_ids) AS t(movie_id, actor_id)
+        ON CONFLICT (movie_id, actor_id) DO NOTHING
+        RETURNING 1
+    )
+    SELECT count(*)::INT FROM ins;
+$$ LANGUAGE sql;
+
+
+-- =============================================
+--  FUNCTION: save_movie_with_actors
+--  Descripción: Guarda una película con sus actores y relaciones en una sola
+--               llamada (y por tanto en una sola transacción). Si la película ya
+--               existe se actualizan sus datos y su reparto pasa a ser exactamente
+--               el recibido; en ese caso devuelve inserted = FALSE.
+-- =============================================
+CREATE OR REPLACE FUNCTION save_movie_with_actors(
+    p_imdb_id TEXT,
+    p_title TEXT,
+    p_year INT,
+    p_rating FLOAT,
+    p_duration INT,
+    p_metascore INT,
+    p_actor_names TEXT[]
+)
+RETURNS TABLE (saved_movie_id INT, inserted BOOLEAN, actor_count INT) AS
+$$
+DECLARE
+    v_movie_id INT;
+    v_inserted BOOLEAN;
+    v_actor_count INT := 0;
+BEGIN
+    INSERT INTO movies AS m (imdb_id, title, year, rating, duration_minutes, metascore)
+    VALUES (p_imdb_id, p_title, p_year, p_rating, p_duration, p_metascore)
+    ON CONFLICT (imdb_id) DO UPDATE SET
+        title = EXCLUDED.title,
+        year = EXCLUDED.year,
+        rating = EXCLUDED.rating,
+        duration_minutes = EXCLUDED.duration_minutes,
+        metascore = EXCLUDED.metascore
+    RETURNING m.id, (m.xmax = 0) INTO v_movie_id, v_inserted;
+
+    IF NOT v_inserted THEN
+        -- Refresco: el reparto guardado se sustituye por el recibido.
+        DELETE FROM movie_actor WHERE movie_id = v_movie_id;
+    END IF;
+
+    INSERT INTO actors (name)
+    SELECT DISTINCT n FROM unnest(p_actor_names) AS n
+    ON CONFLICT (name) DO NOTHING;
+
+    -- Cada sentencia ve lo insertado por la anterior, incluidos actores que ya existían.
+    INSERT INTO movie_actor (movie_id, actor_id)
+    SELECT v_movie_id, a.id FROM actors a WHERE a.name = ANY (p_actor_names)
+    ON CONFLICT DO NOTHING;
+    GET DIAGNOSTICS v_actor_count = ROW_COUNT;
+
+    RETURN QUERY SELECT v_movie_id, v_inserted, v_actor_count;
+END;
+$$ LANGUAGE plpgsql;
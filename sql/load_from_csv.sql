@@ -5,13 +5,16 @@
 --  Fecha de creación: 2025-08-03
 --  Nota: Requiere permisos en el servidor y acceso a las rutas locales especificadas.
 --        Asegúrate de reemplazar '/PATH_CAMBIAR/to/*.csv' con la ruta absoluta correcta.
+--        Sin acceso al servidor, usar la carga desde el cliente (COPY FROM STDIN):
+--            python presentation/cli/load_csv_to_postgres.py
+--        que además fusiona con datos existentes y remapea los IDs.
 -- =============================================
 
 -- =============================================
 -- CARGAR PELÍCULAS
 -- Carga los datos de películas desde un archivo CSV con cabecera.
 -- =============================================
-COPY movies(id, title, year, rating, duration_minutes, metascore)
+COPY movies(id, imdb_id, title, year, rating, duration_minutes, metascore)
 FROM '/PATH_CAMBIAR/to/movies.csv' 
 DELIMITER ',' 
 CSV HEADER;
@@ -33,3 +36,11 @@ COPY movie_actor(movie_id, actor_id)
 FROM '/PATH_CAMBIAR/to/movie_actor.csv' 
 DELIMITER ',' 
 CSV HEADER;
+
+-- =============================================
+-- AJUSTAR SECUENCIAS
+-- Los IDs se cargaron explícitamente: se avanzan los SERIAL para que los
+-- siguientes INSERT no choquen con ellos.
+-- =============================================
+SELECT setval(pg_get_serial_sequence('movies', 'id'), COALESCE(MAX(id), 1)) FROM movies;
+SELECT setval(pg_get_serial_sequence('actors', 'id'), COALESCE(MAX(id), 1)) FROM actors;
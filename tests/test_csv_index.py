@@ -0,0 +1,28 @@
+from domain.models import Movie
+from infrastructure.persistence.csv.repositories.movie_csv_repository import MovieCsvRepository
+
+HEADER = "id,imdb_id,title,year,rating,duration_minutes,metascore\n"
+
+
+def test_uncompacted_update_uses_last_row(tmp_path):
+    # Estado tras morir el proceso antes de compactar: la versión nueva va al final.
+    path = tmp_path / "movies.csv"
+    path.write_text(
+        HEADER
+        + "1,tt0000001,Old Title,2001,7.0,100,\n"
+        + "2,tt0000002,Other,2002,6.0,90,\n"
+        + "1,tt0000001,New Title,2001,7.5,100,\n",
+        encoding="utf-8"
+    )
+    repository = MovieCsvRepository(str(path))
+
+    assert repository.find_by_imdb_id("tt0000001").title == "New Title"
+
+    repository.save(Movie(
+        id=None, imdb_id="tt0000001", title="Newest Title", year=2001, rating=8.0,
+        duration_minutes=100, metascore=None, actors=[]
+    ))
+
+    rows = path.read_text(encoding="utf-8").splitlines()[1:]
+    assert rows == ["1,tt0000001,Newest Title,2001,8.0,100,", "2,tt0000002,Other,2002,6.0,90,"]
+    assert repository.find_by_imdb_id("tt0000001").title == "Newest Title"
@@ -0,0 +1,29 @@
+from infrastructure.network import egress_identity_cache as module
+from infrastructure.network.egress_identity_cache import EgressIdentityCache
+
+FAILED = ("N/A", "N/A", "N/A")
+IDENTITY = ("1.2.3.4", "Madrid", "ES")
+
+
+def test_failed_lookup_is_cached_per_generation_until_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(module.time, "monotonic", lambda: now[0])
+    cache = EgressIdentityCache(negative_ttl=30)
+    calls = []
+
+    def failing_loader():
+        calls.append("lookup")
+        return FAILED
+
+    assert cache.get_or_load("tor:a", 1, failing_loader) == FAILED
+    assert cache.get_or_load("tor:a", 1, failing_loader) == FAILED
+    assert len(calls) == 1
+
+    # Otra generación (NEWNYM) u otra ruta consultan de nuevo.
+    cache.get_or_load("tor:a", 2, failing_loader)
+    cache.get_or_load("tor:b", 1, failing_loader)
+    assert len(calls) == 3
+
+    now[0] += 31
+    assert cache.get_or_load("tor:a", 2, lambda: IDENTITY) == IDENTITY
+    assert cache.get("tor:a", 2) == IDENTITY
@@ -0,0 +1,42 @@
+import pytest
+
+from infrastructure.network.proxy_provider import ProxyProvider
+from shared.config import config
+
+PROXY_A = {"http": "http://10.0.0.1:8080", "https": "http://10.0.0.1:8080"}
+PROXY_B = {"http": "http://10.0.0.2:8080", "https": "http://10.0.0.2:8080"}
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    monkeypatch.setattr(config, "USE_CUSTOM_PROXY", False)
+    monkeypatch.setattr(config, "USE_TOR", False)
+    return ProxyProvider(proxy_list=[PROXY_A, PROXY_B])
+
+
+def test_proxy_list_enables_proxy_strategy():
+    # Con PROXY_LIST la estrategia "proxy" entra en juego y TOR queda de fallback.
+    assert config.USE_TOR == (not config.USE_CUSTOM_PROXY and not config.PROXY_LIST)
+
+
+def test_failing_proxy_is_ejected_from_selection(provider):
+    for _ in range(config.PROXY_EJECT_AFTER_FAILURES):
+        provider.report_result(PROXY_A)  # error de red
+
+    assert {provider.get_proxy()["http"] for _ in range(50)} == {PROXY_B["http"]}
+    assert provider.current_proxy == PROXY_B
+
+
+def test_all_ejected_returns_first_to_come_back(provider):
+    for proxy in (PROXY_A, PROXY_B):
+        for _ in range(config.PROXY_EJECT_AFTER_FAILURES):
+            provider.report_result(proxy, status_code=403)
+
+    # Mejor un sondeo del que antes vuelve que la conexión directa.
+    assert provider.get_proxy() == PROXY_A
+
+
+def test_list_is_preferred_over_tor(provider, monkeypatch):
+    monkeypatch.setattr(config, "USE_TOR", True)
+
+    assert provider.get_proxy() in (PROXY_A, PROXY_B)
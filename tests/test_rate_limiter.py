@@ -0,0 +1,71 @@
+import asyncio
+import threading
+
+from infrastructure.network.rate_limiter import AdaptiveConcurrencyController, TokenBucketRateLimiter
+
+
+def _controller(limit: int = 1) -> AdaptiveConcurrencyController:
+    return AdaptiveConcurrencyController(
+        TokenBucketRateLimiter(rate=1000, burst=1000),
+        initial_concurrency=limit, min_concurrency=1, max_concurrency=limit
+    )
+
+
+def test_async_waiter_is_woken_by_a_thread_release():
+    controller = _controller()
+
+    async def main():
+        release = threading.Event()
+
+        def hold_slot():
+            with controller.slot():
+                release.wait()
+
+        holder = threading.Thread(target=hold_slot)
+        holder.start()
+        while controller.in_flight == 0:
+            await asyncio.sleep(0)
+
+        async def request():
+            async with controller.async_slot():
+                return controller.in_flight
+
+        task = asyncio.ensure_future(request())
+        await asyncio.sleep(0.01)
+        assert not task.done()
+
+        release.set()
+        assert await asyncio.wait_for(task, timeout=1) == 1
+        holder.join()
+
+    asyncio.run(main())
+    assert controller.in_flight == 0
+
+
+def test_cancelled_waiter_passes_the_slot_on():
+    controller = _controller()
+
+    async def main():
+        order = []
+
+        async def request(name, hold):
+            async with controller.async_slot():
+                order.append(name)
+                await hold.wait()
+
+        first_hold, other_hold = asyncio.Event(), asyncio.Event()
+        first = asyncio.ensure_future(request("first", first_hold))
+        await asyncio.sleep(0)
+        cancelled = asyncio.ensure_future(request("cancelled", other_hold))
+        waiting = asyncio.ensure_future(request("waiting", other_hold))
+        await asyncio.sleep(0)
+
+        first_hold.set()
+        await first
+        cancelled.cancel()  # despertada pero sin haber tomado aún el hueco
+        other_hold.set()
+        await asyncio.wait_for(waiting, timeout=1)
+        return order
+
+    assert asyncio.run(main()) == ["first", "waiting"]
+    assert controller.in_flight == 0
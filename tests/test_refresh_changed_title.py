@@ -0,0 +1,231 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from application.use_cases.save_movie_with_actors_csv_use_case import SaveMovieWithActorsCsvUseCase
+from application.use_cases.save_movie_with_actors_postgres_use_case import SaveMovieWithActorsPostgresUseCase
+from application.use_cases.composite_save_movie_with_actors_use_case import CompositeSaveMovieWithActorsUseCase
+from domain.interfaces.use_case_interface import UseCaseInterface
+from domain.models import Movie, Actor
+from infrastructure.persistence.csv.repositories.movie_csv_repository import MovieCsvRepository
+from infrastructure.persistence.csv.repositories.actor_csv_repository import ActorCsvRepository
+from infrastructure.persistence.csv.repositories.movie_actor_csv_repository import MovieActorCsvRepository
+from infrastructure.scraper import imdb_scraper
+from infrastructure.scraper.imdb_scraper import ImdbScraper
+from infrastructure.scraper.scrape_checkpoint import ScrapeCheckpoint
+from infrastructure.scraper.title_parsers import TitlePageParser
+from shared.config import config
+
+IMDB_ID = "tt9999901"
+
+
+class JsonTitleParser(TitlePageParser):
+    """La "página" de la prueba es el JSON de la película."""
+    name = "json-test"
+
+    def parse(self, imdb_id: str, html: str) -> Movie:
+        data = json.loads(html)
+        return Movie(
+            id=None, imdb_id=imdb_id, title=data["title"], year=2001, rating=data["rating"],
+            duration_minutes=120, metascore=None,
+            actors=[Actor(id=None, name=name) for name in data["actors"]]
+        )
+
+
+class FailingUseCase(UseCaseInterface):
+    """Sink que nunca consigue persistir."""
+    def execute(self, movie: Movie) -> bool:
+        return False
+
+
+class FakeImdb:
+    """Servidor falso: responde 304 si la petición trae el ETag vigente."""
+
+    def __init__(self):
+        self.page = None
+        self.requests = []
+
+    def publish(self, title: str, actors, etag: str) -> None:
+        text = json.dumps({"title": title, "rating": 8.1, "actors": actors})
+        self.page = SimpleNamespace(status_code=200, headers={"ETag": etag}, text=text, content=text.encode("utf-8"))
+
+    def make_request(self, **kwargs) -> SimpleNamespace:
+        headers = kwargs.get("headers") or {}
+        self.requests.append(headers)
+        if headers.get("If-None-Match") == self.page.headers["ETag"]:
+            return SimpleNamespace(status_code=304, headers={}, text="", content=b"")
+        return self.page
+
+
+def _csv_use_case(directory) -> SaveMovieWithActorsCsvUseCase:
+    return SaveMovieWithActorsCsvUseCase(
+        movie_repository=MovieCsvRepository(str(directory / "movies.csv")),
+        actor_repository=ActorCsvRepository(str(directory / "actors.csv")),
+        movie_actor_repository=MovieActorCsvRepository(str(directory / "movie_actor.csv"))
+    )
+
+
+class FakeGraphqlFetcher:
+    """Resuelve por "GraphQL" la película publicada en el servidor falso."""
+
+    def __init__(self, imdb: FakeImdb):
+        self.imdb = imdb
+        self.total_bytes_used = 0
+
+    def chunk(self, imdb_ids):
+        return [imdb_ids]
+
+    def fetch_batch(self, imdb_ids):
+        return {imdb_id: JsonTitleParser().parse(imdb_id, self.imdb.page.text) for imdb_id in imdb_ids}
+
+
+def _scrape(monkeypatch, checkpoint, sinks, imdb: FakeImdb, graphql_fetcher=None) -> ImdbScraper:
+    """Una ejecución incremental del scraper (motor por hilos) cuyo chart solo tiene IMDB_ID."""
+    monkeypatch.setattr(imdb_scraper, "make_request", imdb.make_request)
+    # Todo título guardado se considera caducado: cada ejecución lo refresca.
+    monkeypatch.setattr(config, "SCRAPE_REFRESH_MAX_AGE", -1)
+    use_case = CompositeSaveMovieWithActorsUseCase(sinks)
+    scraper = ImdbScraper(
+        use_case=use_case,
+        proxy_provider=None,
+        tor_rotator=None,
+        engine="requests",
+        title_parser=JsonTitleParser(),
+        checkpoint=checkpoint,
+        incremental=True,
+        sinks=sinks,
+        graphql_fetcher=graphql_fetcher
+    )
+    monkeypatch.setattr(scraper, "_get_combined_movie_ids", lambda: [IMDB_ID])
+    scraper.conditional_requests = True
+    try:
+        scraper.scrape()
+    finally:
+        use_case.close()
+    return scraper
+
+
+def _csv_titles(directory):
+    return [line.split(",")[2] for line in (directory / "movies.csv").read_text(encoding="utf-8").splitlines()[1:]]
+
+
+def test_changed_title_is_updated_in_csv(tmp_path, monkeypatch):
+    checkpoint = ScrapeCheckpoint(str(tmp_path / "checkpoint.json"))
+    use_case = _csv_use_case(tmp_path)
+    imdb = FakeImdb()
+
+    imdb.publish("Old Title", ["Actor A"], '"v1"')
+    _scrape(monkeypatch, checkpoint, [use_case], imdb)
+    imdb.publish("New Title", ["Actor B"], '"v2"')
+    _scrape(monkeypatch, checkpoint, [use_case], imdb)
+
+    assert _csv_titles(tmp_path) == ["New Title"]
+    assert use_case.movie_repo.find_by_imdb_id(IMDB_ID).title == "New Title"
+    relations = (tmp_path / "movie_actor.csv").read_text(encoding="utf-8").splitlines()[1:]
+    actor_b_id = use_case.actor_repo.find_by_name("Actor B").id
+    assert relations == [f"1,{actor_b_id}"]
+    assert checkpoint.get_title(IMDB_ID)["etag"] == '"v2"'
+
+
+def test_failed_sink_does_not_record_new_validators(tmp_path, monkeypatch):
+    checkpoint = ScrapeCheckpoint(str(tmp_path / "checkpoint.json"))
+    use_case = _csv_use_case(tmp_path)
+    imdb = FakeImdb()
+
+    imdb.publish("Old Title", ["Actor A"], '"v1"')
+    _scrape(monkeypatch, checkpoint, [use_case], imdb)
+    recorded = checkpoint.get_title(IMDB_ID)
+    imdb.publish("New Title", ["Actor A"], '"v2"')
+    _scrape(monkeypatch, checkpoint, [use_case, FailingUseCase()], imdb)
+
+    # El título no llegó a todos los sinks: la próxima ejecución debe volver a descargarlo.
+    assert checkpoint.get_title(IMDB_ID) == recorded
+
+
+def test_unchanged_refresh_is_answered_with_304(tmp_path, monkeypatch):
+    checkpoint = ScrapeCheckpoint(str(tmp_path / "checkpoint.json"))
+    use_case = _csv_use_case(tmp_path)
+    imdb = FakeImdb()
+    imdb.publish("Old Title", ["Actor A"], '"v1"')
+
+    _scrape(monkeypatch, checkpoint, [use_case], imdb)
+    _scrape(monkeypatch, checkpoint, [use_case], imdb)
+
+    assert imdb.requests == [{}, {"If-None-Match": '"v1"'}]
+    assert _csv_titles(tmp_path) == ["Old Title"]
+
+
+def test_cleared_csv_is_refilled(tmp_path, monkeypatch):
+    checkpoint = ScrapeCheckpoint(str(tmp_path / "checkpoint.json"))
+    imdb = FakeImdb()
+    imdb.publish("Old Title", ["Actor A"], '"v1"')
+    _scrape(monkeypatch, checkpoint, [_csv_use_case(tmp_path / "first")], imdb)
+
+    # CSV borrado: el título vuelve a faltar en un sink, así que se descarga sin
+    # validadores (el servidor respondería 304) y se escribe aunque su hash no cambió.
+    refilled = tmp_path / "cleared"
+    _scrape(monkeypatch, checkpoint, [_csv_use_case(refilled)], imdb)
+
+    assert imdb.requests[-1] == {}
+    assert _csv_titles(refilled) == ["Old Title"]
+
+
+def test_graphql_titles_skip_unchanged_refresh(tmp_path, monkeypatch):
+    checkpoint = ScrapeCheckpoint(str(tmp_path / "checkpoint.json"))
+    use_case = _csv_use_case(tmp_path)
+    imdb = FakeImdb()
+    imdb.publish("Old Title", ["Actor A"], '"v1"')
+    saved = []
+    execute_many = use_case.execute_many
+    monkeypatch.setattr(use_case, "execute_many", lambda movies: saved.extend(movies) or execute_many(movies))
+
+    _scrape(monkeypatch, checkpoint, [use_case], imdb, FakeGraphqlFetcher(imdb))
+    assert checkpoint.get_title(IMDB_ID)["content_hash"]
+    _scrape(monkeypatch, checkpoint, [use_case], imdb, FakeGraphqlFetcher(imdb))
+
+    assert [movie.title for movie in saved] == ["Old Title"]
+    assert imdb.requests == []
+
+
+@pytest.fixture
+def postgres_use_case():
+    from infrastructure.persistence.postgres.postgres_connection import connection_pool
+    from infrastructure.persistence.postgres.unit_of_work import PostgresUnitOfWork
+    if connection_pool is None:
+        pytest.skip("PostgreSQL no disponible")
+
+    def delete_test_movie():
+        with PostgresUnitOfWork() as uow:
+            with uow.conn.cursor() as cur:
+                cur.execute("DELETE FROM movie_actor WHERE movie_id IN (SELECT id FROM movies WHERE imdb_id = %s)", (IMDB_ID,))
+                cur.execute("DELETE FROM movies WHERE imdb_id = %s", (IMDB_ID,))
+
+    delete_test_movie()
+    yield SaveMovieWithActorsPostgresUseCase(unit_of_work_factory=PostgresUnitOfWork, bulk=True)
+    delete_test_movie()
+
+
+def test_changed_title_is_updated_in_postgres(tmp_path, monkeypatch, postgres_use_case):
+    from infrastructure.persistence.postgres.unit_of_work import PostgresUnitOfWork
+    checkpoint = ScrapeCheckpoint(str(tmp_path / "checkpoint.json"))
+    sinks = [_csv_use_case(tmp_path), postgres_use_case]
+
+    imdb = FakeImdb()
+
+    imdb.publish("Old Title", ["Actor A"], '"v1"')
+    _scrape(monkeypatch, checkpoint, sinks, imdb)
+    imdb.publish("New Title", ["Actor B"], '"v2"')
+    _scrape(monkeypatch, checkpoint, sinks, imdb)
+
+    with PostgresUnitOfWork() as uow:
+        movie = uow.movie_repository.find_by_imdb_id(IMDB_ID)
+        with uow.conn.cursor() as cur:
+            cur.execute(
+                "SELECT a.name FROM movie_actor ma JOIN actors a ON a.id = ma.actor_id WHERE ma.movie_id = %s",
+                (movie.id,)
+            )
+            cast = [row[0] for row in cur.fetchall()]
+    assert movie.title == "New Title"
+    assert cast == ["Actor B"]
+    assert _csv_titles(tmp_path) == ["New Title"]
@@ -0,0 +1,28 @@
+from infrastructure.persistence.csv.shard_merger import CsvShardMerger, shard_csv_paths
+from shared.config import config
+
+
+def _write(path, lines):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def test_kept_shard_uses_last_movie_row_and_its_cast(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "SHARDS_DIR", str(tmp_path))
+    paths = shard_csv_paths(0)
+    (tmp_path / "shard-0").mkdir()
+    # Shard conservado: tt0000001 se refrescó y el proceso murió antes de compactar.
+    _write(paths["movies"], [
+        "id,imdb_id,title,year,rating,duration_minutes,metascore",
+        "1,tt0000001,Old Title,2001,7.0,100,",
+        "2,tt0000002,Other,2002,6.0,90,",
+        "1,tt0000001,New Title,2001,7.5,100,",
+    ])
+    _write(paths["actors"], ["id,name", "1,Actor A", "2,Actor B", "3,Actor C"])
+    _write(paths["movie_actor"], ["movie_id,actor_id", "1,1", "1,2", "2,1", "1,3", "1,1"])
+
+    movies = CsvShardMerger(use_case=None).read_movies(0)
+
+    assert [(movie.imdb_id, movie.title) for movie in movies] == [("tt0000001", "New Title"), ("tt0000002", "Other")]
+    assert [actor.name for actor in movies[0].actors] == ["Actor C", "Actor A"]
+    assert [actor.name for actor in movies[1].actors] == ["Actor A"]